@@ -15,12 +15,14 @@
 import csv
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List
 
 from flask import Flask
 from ppr_api.exceptions import BusinessException
 from ppr_api.models import db, Registration, SearchRequest, TestSearch, TestSearchBatch, TestSearchResult
+from sqlalchemy import insert
 
 from search_tester import create_app
 from search_tester.utils.db_utils import QUERY_LEGACY_RESULTS_DATE, QUERY_LEGACY_RESULTS_DATE_TIME, QUERY_LEGACY_RESULTS_MOST_RECENT
@@ -31,53 +33,144 @@ from search_tester.utils.logging import setup_logging
 setup_logging(os.path.join(os.path.abspath(os.path.dirname(__file__)), 'logging.conf'))
 
 
-def add_legacy_results(search: TestSearch, result_list: List[dict], match_type: TestSearchResult.MatchType):
-    """Add the given legacy results for the match type to the TestSearch obj."""
-    for legacy_result, index in zip(result_list, range(len(result_list))):
-        # get registration from api
-        reg = None
-        try:
-            reg = Registration.query.filter(Registration.registration_num == legacy_result['doc_id']).one_or_none()
-        except Exception as err:
-            # ignore error (it's not in the db)
-            print(err)
-            reg = None
+def get_existing_registrations(legacy_searches: List[dict]) -> set:
+    """Get the legacy result registration numbers that are in the db with one query for all the searches."""
+    doc_ids = set()
+    for legacy_search in legacy_searches:
+        for legacy_result in legacy_search['exact_matches'] + legacy_search['similar_matches']:
+            doc_ids.add(legacy_result['doc_id'])
+    if not doc_ids:
+        return set()
+    try:
+        rows = db.session.query(Registration.registration_num) \
+            .filter(Registration.registration_num.in_(doc_ids)).all()
+        return {row[0] for row in rows}
+    except Exception as err:
+        # ignore error (treat as not in the db)
+        print(err)
+        db.session.rollback()
+        return set()
+
+
+def add_legacy_results(results: List[dict],
+                       result_list: List[dict],
+                       match_type: TestSearchResult.MatchType,
+                       existing: set):
+    """Add the given legacy results for the match type that exist in the db to the test search results."""
+    for index, legacy_result in enumerate(result_list):
         # skip results that aren't in the test db
-        if not reg:
+        if legacy_result['doc_id'] not in existing:
             continue
-        result = TestSearchResult()
-        result.doc_id = legacy_result['doc_id']
-        result.details = legacy_result['result']
-        result.match_type = match_type.value
-        result.source = TestSearchResult.Source.LEGACY.value
-        result.index = index
-        search.results.append(result)
-
-def add_api_results(search: TestSearch, results: List[dict]):
-    """Add the given api results to the TestSearch obj."""
+        results.append({
+            'doc_id': legacy_result['doc_id'],
+            'details': legacy_result['result'],
+            'match_type': match_type.value,
+            'source': TestSearchResult.Source.LEGACY.value,
+            'index': index
+        })
+
+def add_api_results(results: List[dict], api_results: List[dict], search_type: str):
+    """Add the given api results to the test search results."""
     exact_index = 0
     similar_index = 0
-    for api_result in results:
-        result = TestSearchResult()
-        result.doc_id = api_result['baseRegistrationNumber']
-        result.source = TestSearchResult.Source.API.value
+    for api_result in api_results:
+        result = {
+            'doc_id': api_result['baseRegistrationNumber'],
+            'source': TestSearchResult.Source.API.value
+        }
         if TestSearchResult.MatchType[api_result['matchType']] == TestSearchResult.MatchType.EXACT:
-            result.match_type = TestSearchResult.MatchType.EXACT.value
-            result.index = exact_index
+            result['match_type'] = TestSearchResult.MatchType.EXACT.value
+            result['index'] = exact_index
             exact_index += 1
         else:
-            result.match_type = TestSearchResult.MatchType.SIMILAR.value
-            result.index = similar_index
+            result['match_type'] = TestSearchResult.MatchType.SIMILAR.value
+            result['index'] = similar_index
             similar_index += 1
         if search_type == SearchRequest.SearchTypes.BUSINESS_DEBTOR.value:
-            result.details = api_result['debtor']['businessName']
+            result['details'] = api_result['debtor']['businessName']
         elif search_type == SearchRequest.SearchTypes.INDIVIDUAL_DEBTOR.value:
-            result.details = f'{api_result["debtor"]["personName"]["last"]} {api_result["debtor"]["personName"]["first"]} {api_result["debtor"]["personName"].get("middle", "")}' 
+            result['details'] = f'{api_result["debtor"]["personName"]["last"]} {api_result["debtor"]["personName"]["first"]} {api_result["debtor"]["personName"].get("middle", "")}' 
         elif search_type == SearchRequest.SearchTypes.REGISTRATION_NUM.value:
-            result.details = api_result['baseRegistrationNumber']
+            result['details'] = api_result['baseRegistrationNumber']
         else:
-            result.details = api_result['vehicleCollateral']
-        search.results.append(result)
+            result['details'] = api_result['vehicleCollateral']
+        results.append(result)
+
+def run_search(search_type: str, legacy_search: dict, existing: set) -> dict:
+    """Run the ppr-api search for the legacy search criteria and return the test search with its results."""
+    results = []
+    # add legacy results exact
+    add_legacy_results(results, legacy_search['exact_matches'], TestSearchResult.MatchType.EXACT, existing)
+    # add legacy results similar
+    add_legacy_results(results, legacy_search['similar_matches'], TestSearchResult.MatchType.SIMILAR, existing)
+    criteria_value = legacy_search['criteria']
+
+    ### get ppr-api search results
+    # prep search
+    criteria = { 'value': legacy_search['criteria'] }
+    if search_type == SearchRequest.SearchTypes.INDIVIDUAL_DEBTOR.value:
+        # remove dbl spaces
+        legacy_search['criteria'] = re.sub(' +', ' ', legacy_search['criteria'])
+        name = legacy_search['criteria'].split(' ')
+        criteria = { 'debtorName': { 'first': name[1], 'last': name[0] }}
+        if len(name) > 2:
+            criteria['debtorName']['second'] = name[2]
+    elif search_type == SearchRequest.SearchTypes.BUSINESS_DEBTOR.value:
+        criteria = { 'debtorName': { 'business': legacy_search['criteria'] }}
+
+    request_json = { 'criteria': criteria, 'type': TO_API_SEARCH_TYPE[search_type] }
+    query = SearchRequest.create_from_json(request_json, '0', 'search-tester')
+    # run search on api fn
+    start = datetime.utcnow()
+    query.search()
+    end  = datetime.utcnow()
+    interval = end - start
+    # save results
+    add_api_results(results, query.search_response or [], search_type)
+    return {
+        'criteria': str(criteria_value),
+        'run_time': interval.total_seconds(),
+        'results': results
+    }
+
+def run_search_chunk(app: Flask, search_type: str, legacy_searches: List[dict]) -> List[dict]:
+    """Run a chunk of legacy searches in a separate app context, so each worker has its own db session."""
+    with app.app_context():
+        try:
+            existing = get_existing_registrations(legacy_searches)
+            return [run_search(search_type, legacy_search, existing) for legacy_search in legacy_searches]
+        finally:
+            db.session.remove()
+
+def run_searches(app: Flask, executor: ThreadPoolExecutor, search_type: str, legacy_searches: List[dict]) -> List[dict]:
+    """Run the legacy searches in chunks, concurrently if there is a worker pool, keeping the legacy search order."""
+    chunk_size = app.config['SEARCH_CHUNK_SIZE']
+    chunks = [legacy_searches[i:i + chunk_size] for i in range(0, len(legacy_searches), chunk_size)]
+    searches = []
+    if executor:
+        for chunk_searches in executor.map(lambda chunk: run_search_chunk(app, search_type, chunk), chunks):
+            searches.extend(chunk_searches)
+    else:
+        for chunk in chunks:
+            searches.extend(run_search_chunk(app, search_type, chunk))
+    return searches
+
+def save_batch(batch: TestSearchBatch, searches: List[dict]):
+    """Save the batch and its searches, then insert all the search results with one bulk insert."""
+    for search in searches:
+        test_search = TestSearch()
+        test_search.search_criteria = search['criteria']
+        test_search.run_time = search['run_time']
+        batch.searches.append(test_search)
+    db.session.add(batch)
+    db.session.flush()
+    results = []
+    for test_search, search in zip(batch.searches, searches):
+        for result in search['results']:
+            results.append({**result, 'search_id': test_search.id})
+    if results:
+        db.session.execute(insert(TestSearchResult), results)
+    db.session.commit()
 
 def parse_results(batch_searches, rows, lower):
     """Return batch_searches with all parsed rows information."""
@@ -160,6 +253,8 @@ if __name__ == '__main__':
             else:
                 batch_searches = get_batch_searches_table(app, batch_searches)
 
+            workers = app.config['SEARCH_WORKERS']
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
             for search_type in batch_searches:
                 try:
                     if not batch_searches[search_type]:
@@ -173,53 +268,20 @@ if __name__ == '__main__':
                     batch.sim_val_first_name = app.config['SIMILARITY_QUOTIENT_FIRST_NAME']
                     batch.sim_val_last_name = app.config['SIMILARITY_QUOTIENT_LAST_NAME']
                     batch.searches = []
-                    # populate searches
-                    for time in batch_searches[search_type]:
-                        legacy_search = batch_searches[search_type][time]
-                        search = TestSearch()
-                        search.search_criteria = str(legacy_search['criteria'])
-                        search.results = []
-                        # add legacy results exact
-                        add_legacy_results(search, legacy_search['exact_matches'], TestSearchResult.MatchType.EXACT)
-                        # add legacy results similar
-                        add_legacy_results(search, legacy_search['similar_matches'], TestSearchResult.MatchType.SIMILAR)
-                    
-                        ### get ppr-api search results
-                        # prep search
-                        criteria = { 'value': legacy_search['criteria'] }
-                        if search_type == SearchRequest.SearchTypes.INDIVIDUAL_DEBTOR.value:
-                            # remove dbl spaces
-                            legacy_search['criteria'] = re.sub(' +', ' ', legacy_search['criteria'])
-                            name = legacy_search['criteria'].split(' ')
-                            criteria = { 'debtorName': { 'first': name[1], 'last': name[0] }}
-                            if len(name) > 2:
-                                criteria['debtorName']['second'] = name[2]
-                        elif search_type == SearchRequest.SearchTypes.BUSINESS_DEBTOR.value:
-                            criteria = { 'debtorName': { 'business': legacy_search['criteria'] }}
-
-                        request_json = { 'criteria': criteria, 'type': TO_API_SEARCH_TYPE[search_type] }
-                        query = SearchRequest.create_from_json(request_json, '0', 'search-tester')
-                        # run search on api fn
-                        start = datetime.utcnow()
-                        query.search()
-                        end  = datetime.utcnow()
-                        interval = end - start
-                        search.run_time = interval.total_seconds()
-                        # save results
-                        results = query.search_response or []
-                        add_api_results(search, results)
-                        # add search to batch
-                        batch.searches.append(search)
+                    # run searches
+                    searches = run_searches(app, executor, search_type, list(batch_searches[search_type].values()))
                     # save batch to db
-                    batch.save()
+                    save_batch(batch, searches)
                     completed += 1
-                    
+
                 except Exception as err:
                     app.logger.error(err.with_traceback(None))
                     app.logger.debug('Error occurred, rolling back db...')
                     db.session.rollback()
                     app.logger.debug(f'Rollback successful. Skipping batch for {search_type}')
                     skipped += 1
+            if executor:
+                executor.shutdown()
 
         app.logger.debug(f'Job completed.')
         app.logger.debug(f'Completed {completed} batches.')
@@ -67,6 +67,10 @@ class _Config():  # pylint: disable=too-few-public-methods
     FILE_NAME = os.getenv('FILE_NAME', 'SEARCH_RESULTS.csv')
     SEARCH_DATE = os.getenv('SEARCH_DATE', None)
     SEARCH_TIME = os.getenv('SEARCH_TIME', None)
+    # Searches in a batch run in chunks: each chunk has one registration lookup and, with more than 1 worker, runs
+    # concurrently with its own db connection. DATABASE_MAX_POOL_SIZE must be at least SEARCH_WORKERS + 1.
+    SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', '1'))
+    SEARCH_CHUNK_SIZE = int(os.getenv('SEARCH_CHUNK_SIZE', '50'))
 
     SIMILARITY_QUOTIENT_BUSINESS_NAME = os.getenv('SIMILARITY_QUOTIENT_BUSINESS_NAME', '0.8')
     SIMILARITY_QUOTIENT_FIRST_NAME = os.getenv('SIMILARITY_QUOTIENT_FIRST_NAME', '0.23')
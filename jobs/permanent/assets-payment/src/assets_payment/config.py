@@ -64,3 +64,8 @@ class Config(BaseConfig):
     MHR_EXPIRY_STAFF_HOURS = os.getenv("MHR_EXPIRY_STAFF_HOURS", "")
     PPR_EXPIRY_CLIENT_HOURS = os.getenv("PPR_EXPIRY_CLIENT_HOURS", "")
     PPR_EXPIRY_STAFF_HOURS = os.getenv("PPR_EXPIRY_STAFF_HOURS", "")
+
+    # Expired payment cancellation: concurrent pay api calls with per invoice retry.
+    PAY_CANCEL_WORKERS: int = int(os.getenv("PAY_CANCEL_WORKERS", "5"))
+    PAY_CANCEL_RETRIES: int = int(os.getenv("PAY_CANCEL_RETRIES", "3"))
+    PAY_CANCEL_RETRY_BACKOFF: float = float(os.getenv("PAY_CANCEL_RETRY_BACKOFF", "1.0"))
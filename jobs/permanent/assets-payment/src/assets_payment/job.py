@@ -15,11 +15,14 @@
 import copy
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from http import HTTPStatus
 from typing import Final
 
 import psycopg2
+import psycopg2.extras
 
 from assets_payment.config import Config
 from assets_payment.services.notify import Notify
@@ -120,13 +123,13 @@ SELECT id, mhr_number
 UPDATE_MHR_REVIEW = """
 UPDATE mhr_review_registrations
    SET status_type = 'PAY_CANCELLED'
- WHERE status_type = 'PAY_PENDING'
-   AND create_ts < (now() at time zone 'utc') - interval '{expire_hours} hours'
+ WHERE id = ANY(%s)
+   AND status_type = 'PAY_PENDING'
 """
 MHR_RESTORE_STATUS = """
 UPDATE mhr_registrations SET status_type = CAST(mhr_drafts.draft ->> 'status' AS mhr_registration_status_type)
   FROM mhr_drafts
- WHERE mhr_drafts.id IN ({draft_ids})
+ WHERE mhr_drafts.id = ANY(%s)
    AND mhr_drafts.mhr_number IS NOT NULL
    AND mhr_drafts.draft ->> 'status' IS NOT NULL
    AND mhr_drafts.mhr_number = mhr_registrations.mhr_number
@@ -139,7 +142,7 @@ UPDATE mhr_drafts
        draft_number = case when left(draft_number, 2) = 'PR'
                            then substr(draft_number, 3)
                            else substr(draft_number, 2) end
- WHERE id IN ({draft_ids})
+ WHERE id = ANY(%s)
    AND LEFT(draft_number, 1) = 'P'
 """
 PPR_EXPIRED_QUERY = """
@@ -162,7 +165,7 @@ SELECT id, user_id, registration_number
 PPR_RESTORE_STATUS = """
 UPDATE registrations SET ver_bypassed = 'Y'
   FROM drafts
- WHERE drafts.id IN ({draft_ids})
+ WHERE drafts.id = ANY(%s)
    AND drafts.registration_number IS NOT NULL
    AND drafts.registration_number = registrations.registration_number
    AND registrations.registration_type_cl IN ('CROWNLIEN', 'MISCLIEN', 'PPSALIEN')
@@ -171,19 +174,24 @@ UPDATE registrations SET ver_bypassed = 'Y'
 PPR_UPDATE_DRAFT = """
 UPDATE drafts
    SET user_id = draft->>'username', document_number = SUBSTR(document_number, 2)
- WHERE id IN ({draft_ids})
+ WHERE id = ANY(%s)
    AND LEFT(document_number, 1) = 'P'
 """
 INSERT_EVENT: Final = """
 INSERT INTO event_tracking(id, key_id, event_ts, event_tracking_type, status, message)
-  VALUES(nextval('event_tracking_id_seq'), {job_id}, CURRENT_TIMESTAMP  at time zone 'utc', '{tracking_type}',
-         {job_status}, '{job_message}')
+  VALUES %s
 """
+INSERT_EVENT_TEMPLATE: Final = (
+    "(nextval('event_tracking_id_seq'), %s, CURRENT_TIMESTAMP  at time zone 'utc', %s, %s, %s)"
+)
 INSERT_REVIEW_STEP: Final = """
 INSERT INTO mhr_review_steps
-     VALUES(nextval('mhr_review_step_id_seq'), CURRENT_TIMESTAMP  at time zone 'utc',
-            null, null, 'Current status=PAY_PENDING, new status=PAY_CANCELLED',
-            'System Expired Job', {review_id}, 'PAY_CANCELLED')
+SELECT nextval('mhr_review_step_id_seq'), CURRENT_TIMESTAMP  at time zone 'utc',
+       null, null, 'Current status=PAY_PENDING, new status=PAY_CANCELLED',
+       'System Expired Job', r.id, 'PAY_CANCELLED'
+  FROM mhr_review_registrations r
+ WHERE r.id = ANY(%s)
+   AND r.status_type = 'PAY_PENDING'
 """
 
 
@@ -196,13 +204,21 @@ def track_event(  # pylint: disable=too-many-positional-arguments,too-many-argum
     message: str,
 ):
     """Capture the job run in the event tracking table."""
+    track_events(db_conn, db_cursor, tracking_type, [(job_id, status, message)])
+
+
+def track_events(
+    db_conn: psycopg2.extensions.connection,
+    db_cursor: psycopg2.extensions.cursor,
+    tracking_type: str,
+    events: list,
+):
+    """Capture a list of (key_id, status, message) events in the event tracking table in a single insert."""
     try:
-        if not db_conn or not db_cursor:
+        if not db_conn or not db_cursor or not events:
             return
-        sql_statement = INSERT_EVENT.format(
-            job_id=job_id, tracking_type=tracking_type, job_status=status, job_message=message[0:7999]
-        )
-        db_cursor.execute(sql_statement)
+        values = [(key_id, tracking_type, int(status), message[0:7999]) for key_id, status, message in events]
+        psycopg2.extras.execute_values(db_cursor, INSERT_EVENT, values, template=INSERT_EVENT_TEMPLATE, page_size=500)
         db_conn.commit()
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
@@ -210,8 +226,37 @@ def track_event(  # pylint: disable=too-many-positional-arguments,too-many-argum
         logger.error(error_message)
 
 
+def delete_pending_payment(pay_client: SBCPaymentClient, config: Config, invoice_id: int) -> int:
+    """Cancel a pending payment, retrying pay api connection and server errors with a backoff."""
+    retries: int = max(config.PAY_CANCEL_RETRIES, 1)
+    pay_status: int = HTTPStatus.INTERNAL_SERVER_ERROR
+    for attempt in range(1, retries + 1):
+        try:
+            pay_status = pay_client.delete_pending_payment(invoice_id)
+            logger.info(f"Invoice {invoice_id} delete pending payment attempt {attempt} status={pay_status}")
+            if pay_status < HTTPStatus.INTERNAL_SERVER_ERROR:
+                return pay_status
+        except Exception as err:  # noqa: B902; retry then report as a server error.
+            pay_status = HTTPStatus.INTERNAL_SERVER_ERROR
+            logger.error(f"Invoice {invoice_id} delete pending payment attempt {attempt} failed: {err}")
+        if attempt < retries:
+            time.sleep(config.PAY_CANCEL_RETRY_BACKOFF * 2 ** (attempt - 1))
+    return int(pay_status)
+
+
+def cancel_payments(pay_client: SBCPaymentClient, config: Config, invoice_ids: list) -> list:
+    """Cancel the pending payments with a bounded worker pool: the statuses are returned in invoice_ids order."""
+    if not invoice_ids:
+        return []
+    workers: int = max(min(config.PAY_CANCEL_WORKERS, len(invoice_ids)), 1)
+    logger.info(f"Cancelling {len(invoice_ids)} pending payments with {workers} workers.")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        statuses = executor.map(lambda invoice_id: delete_pending_payment(pay_client, config, invoice_id), invoice_ids)
+        return list(statuses)
+
+
 def restore_mhr_status(
-    db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, mhr_numbers: str, draft_ids: str
+    db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, mhr_numbers: list, draft_ids: list
 ):
     """Revert MHR home registrations locked due to a payment pending status to the previous active status."""
     try:
@@ -220,17 +265,16 @@ def restore_mhr_status(
         if not mhr_numbers or not draft_ids:
             logger.info("restore_mhr_status no mhr_numbers to update: step skipped.")
             return
-        sql_statement = MHR_RESTORE_STATUS.format(draft_ids=draft_ids)
-        db_cursor.execute(sql_statement)
+        db_cursor.execute(MHR_RESTORE_STATUS, (draft_ids,))
         db_conn.commit()
-        logger.info(f"Restore MHR home status updated for draft ID's {draft_ids} mhr numbers {mhr_numbers}")
+        logger.info(f"Restore MHR home status updated {db_cursor.rowcount} for {len(draft_ids)} draft ID's")
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
         error_message = f"Error attempting restore mhr base registration status {err}"
         logger.error(error_message)
 
 
-def restore_mhr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, draft_ids: str):
+def restore_mhr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, draft_ids: list):
     """Revert MHR drafts in a payment pending state to the regular draft state."""
     try:
         if not db_conn or not db_cursor:
@@ -238,10 +282,9 @@ def restore_mhr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycop
         if not draft_ids:
             logger.info("restore_mhr_draft no drafts to update: step skipped.")
             return
-        sql_statement = MHR_UPDATE_DRAFT.format(draft_ids=draft_ids)
-        db_cursor.execute(sql_statement)
+        db_cursor.execute(MHR_UPDATE_DRAFT, (draft_ids,))
         db_conn.commit()
-        logger.info(f"Restore MHR draft state updated for draft ID's {draft_ids}")
+        logger.info(f"Restore MHR draft state updated {db_cursor.rowcount} for {len(draft_ids)} draft ID's")
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
         error_message = f"Error attempting restore mhr draft state {err}"
@@ -256,20 +299,16 @@ def update_mhr_review_reg(
         if not db_conn or not db_cursor:
             return
         logger.info("Updating staff review registrations.")
-        review_ids: str = ""
-        review_id: int
         sql_statement = MHR_REVIEW_REG_QUERY.format(expire_hours=config.MHR_EXPIRY_CLIENT_HOURS)
         db_cursor.execute(sql_statement)
-        rows = db_cursor.fetchall()
-        for row in rows:
-            review_id: int = int(row[0])
-            review_ids += str(review_id) + ","
-            logger.info(f"Inserting into mhr_review_steps reivew ID={review_id}")
-            db_cursor.execute(INSERT_REVIEW_STEP.format(review_id=review_id))
-
-        db_cursor.execute(UPDATE_MHR_REVIEW.format(expire_hours=config.MHR_EXPIRY_CLIENT_HOURS))
+        review_ids: list = [int(row[0]) for row in db_cursor.fetchall()]
+        if not review_ids:
+            logger.info("update_mhr_review_reg no review registrations to update: step skipped.")
+            return
+        db_cursor.execute(INSERT_REVIEW_STEP, (review_ids,))
+        db_cursor.execute(UPDATE_MHR_REVIEW, (review_ids,))
         db_conn.commit()
-        logger.info(f"mhr_review_registrations status type updated for ID's {review_ids}")
+        logger.info(f"mhr_review_registrations status type updated for ID's {','.join(map(str, review_ids))}")
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
         error_message = f"Error attempting update mhr review registrations status {err}"
@@ -277,7 +316,7 @@ def update_mhr_review_reg(
 
 
 def restore_ppr_status(
-    db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, reg_numbers: str, draft_ids: str
+    db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, reg_numbers: list, draft_ids: list
 ):
     """Unlock PPR base registrations locked due to a payment pending status."""
     try:
@@ -286,17 +325,16 @@ def restore_ppr_status(
         if not reg_numbers or not draft_ids:
             logger.info("restore_ppr_status no reg_numbers to update: step skipped.")
             return
-        sql_statement = PPR_RESTORE_STATUS.format(draft_ids=draft_ids)
-        db_cursor.execute(sql_statement)
+        db_cursor.execute(PPR_RESTORE_STATUS, (draft_ids,))
         db_conn.commit()
-        logger.info(f"Restore PPR home status updated for draft ID's {draft_ids} base reg numbers {reg_numbers}")
+        logger.info(f"Restore PPR base registration status updated {db_cursor.rowcount} for {len(draft_ids)} drafts")
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
         error_message = f"Error attempting restore PPR base registration status {err}"
         logger.error(error_message)
 
 
-def restore_ppr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, draft_ids: str):
+def restore_ppr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycopg2.extensions.cursor, draft_ids: list):
     """Revert PPR drafts in a payment pending state to the regular draft state."""
     try:
         if not db_conn or not db_cursor:
@@ -304,10 +342,9 @@ def restore_ppr_draft(db_conn: psycopg2.extensions.connection, db_cursor: psycop
         if not draft_ids:
             logger.info("restore_ppr_draft no drafts to update: step skipped.")
             return
-        sql_statement = PPR_UPDATE_DRAFT.format(draft_ids=draft_ids)
-        db_cursor.execute(sql_statement)
+        db_cursor.execute(PPR_UPDATE_DRAFT, (draft_ids,))
         db_conn.commit()
-        logger.info(f"Restore PPR draft state updated for draft ID's {draft_ids}")
+        logger.info(f"Restore PPR draft state updated {db_cursor.rowcount} for {len(draft_ids)} draft ID's")
     except (psycopg2.Error, Exception) as err:
         db_conn.rollback()
         error_message = f"Error attempting restore PPR draft state {err}"
@@ -340,7 +377,36 @@ def run_status_query(
     return status_data
 
 
-def cancel_ppr_expired(  # pylint: disable=too-many-locals
+def cancel_expired(  # pylint: disable=too-many-positional-arguments,too-many-arguments
+    db_conn: psycopg2.extensions.connection,
+    db_cursor: psycopg2.extensions.cursor,
+    config: Config,
+    pay_client: SBCPaymentClient,
+    tracking_type: str,
+    rows: list,
+) -> dict:
+    """Cancel the expired draft (draft id, invoice id, registration number) rows payments and track the results."""
+    draft_ids: list = [int(row[0]) for row in rows]
+    invoice_ids: list = [int(row[1]) for row in rows]
+    reg_numbers: list = [str(row[2]) for row in rows if row[2]]
+    pay_statuses: list = cancel_payments(pay_client, config, invoice_ids)
+    events: list = []
+    error_draft_ids: list = []
+    for draft_id, invoice_id, pay_status in zip(draft_ids, invoice_ids, pay_statuses):
+        if pay_status >= 300:
+            error_draft_ids.append(draft_id)
+        event_msg: str = TRACKING_MESSAGE_EXPIRED.format(draft_id=draft_id, invoice_id=invoice_id)
+        events.append((invoice_id, pay_status, event_msg))
+    track_events(db_conn, db_cursor, tracking_type, events)
+    return {
+        "draft_ids": draft_ids,
+        "invoice_ids": invoice_ids,
+        "reg_numbers": reg_numbers,
+        "error_draft_ids": error_draft_ids,
+    }
+
+
+def cancel_ppr_expired(
     db_conn: psycopg2.extensions.connection,
     db_cursor: psycopg2.extensions.cursor,
     config: Config,
@@ -352,61 +418,35 @@ def cancel_ppr_expired(  # pylint: disable=too-many-locals
     if not status_data.get("ppr_expired") or status_data.get("ppr_expired") < 1:
         logger.info("No expired PPR pending payments to cancel")
         return cancel_count
-    draft_ids: str = ""
-    invoice_ids: str = ""
-    error_draft_ids: str = ""
-    reg_numbers: str = ""
     try:
         if not db_conn or not db_cursor:
             return cancel_count
         sql_statement = PPR_EXPIRED_QUERY.format(expire_hours=config.PPR_EXPIRY_CLIENT_HOURS)
         db_cursor.execute(sql_statement)
         rows = db_cursor.fetchall()
-        for row in rows:
-            cancel_count += 1
-            draft_id: int = int(row[0])
-            invoice_id: str = int(row[1])
-            reg_number: str = str(row[2]) if row[2] else ""
-            if invoice_ids:
-                invoice_ids += ","
-            invoice_ids += str(invoice_id)
-            if draft_ids:
-                draft_ids += ","
-            draft_ids += str(draft_id)
-            if reg_number:
-                if reg_numbers:
-                    reg_numbers += ","
-                reg_numbers += reg_number
-            logger.info(f"Cancelling payment invoice id={invoice_id}, draft id={draft_id} base reg={reg_number}")
-            pay_status: int = pay_client.delete_pending_payment(invoice_id)
-            logger.info(f"Invoice {invoice_id} delete pending payment status={pay_status}")
-            if pay_status >= 300:
-                if error_draft_ids:
-                    error_draft_ids += ","
-                error_draft_ids += str(draft_id)
-            event_msg: str = TRACKING_MESSAGE_EXPIRED.format(draft_id=draft_id, invoice_id=invoice_id)
-            track_event(db_conn, db_cursor, int(invoice_id), PPR_TRACKING_TYPE, pay_status, event_msg)
+        cancel_count = len(rows)
+        results: dict = cancel_expired(db_conn, db_cursor, config, pay_client, PPR_TRACKING_TYPE, rows)
         status_data["ppr_cancel_count"] = cancel_count
-        status_data["ppr_invoice_ids"] = invoice_ids
-        status_data["ppr_draft_ids"] = draft_ids
-        status_data["ppr_reg_numbers"] = reg_numbers
-        status_data["ppr_error_ids"] = error_draft_ids
-        restore_ppr_status(db_conn, db_cursor, reg_numbers, draft_ids)
-        restore_ppr_draft(db_conn, db_cursor, draft_ids)
+        status_data["ppr_invoice_ids"] = ",".join(map(str, results["invoice_ids"]))
+        status_data["ppr_draft_ids"] = ",".join(map(str, results["draft_ids"]))
+        status_data["ppr_reg_numbers"] = ",".join(results["reg_numbers"])
+        status_data["ppr_error_ids"] = ",".join(map(str, results["error_draft_ids"]))
+        restore_ppr_status(db_conn, db_cursor, results["reg_numbers"], results["draft_ids"])
+        restore_ppr_draft(db_conn, db_cursor, results["draft_ids"])
     except (psycopg2.Error, Exception) as err:
         error_message = f"Error attempting to cancel PPR expired payments: {err}"
         logger.error(error_message)
     return cancel_count
 
 
-def cancel_mhr_expired(  # pylint: disable=too-many-locals
+def cancel_mhr_expired(
     db_conn: psycopg2.extensions.connection,
     db_cursor: psycopg2.extensions.cursor,
     config: Config,
     status_data: dict,
     pay_client: SBCPaymentClient,
 ) -> dict:
-    """Revert draft status and delete payment for expired ppr pending payment registrations."""
+    """Revert draft status and delete payment for expired mhr pending payment registrations."""
     cancel_count: int = 0
     if status_data.get("mhr_review_expired", 0) > 0:
         update_mhr_review_reg(db_conn, db_cursor, config)
@@ -415,47 +455,21 @@ def cancel_mhr_expired(  # pylint: disable=too-many-locals
     if not status_data.get("mhr_expired") or status_data.get("mhr_expired") < 1:
         logger.info("No expired MHR pending payments to cancel")
         return cancel_count
-    draft_ids: str = ""
-    invoice_ids: str = ""
-    error_draft_ids: str = ""
-    mhr_numbers: str = ""
     try:
         if not db_conn or not db_cursor:
             return cancel_count
         sql_statement = MHR_EXPIRED_QUERY.format(expire_hours=config.MHR_EXPIRY_CLIENT_HOURS)
         db_cursor.execute(sql_statement)
         rows = db_cursor.fetchall()
-        for row in rows:
-            cancel_count += 1
-            draft_id: int = int(row[0])
-            invoice_id: str = int(row[1])
-            mhr_number: str = str(row[2]) if row[2] else ""
-            if invoice_ids:
-                invoice_ids += ","
-            invoice_ids += str(invoice_id)
-            if draft_ids:
-                draft_ids += ","
-            draft_ids += str(draft_id)
-            if mhr_number:
-                if mhr_numbers:
-                    mhr_numbers += ","
-                mhr_numbers += mhr_number
-            logger.info(f"Cancelling payment invoice id={invoice_id}, draft id={draft_id} mhr={mhr_number}")
-            pay_status: int = pay_client.delete_pending_payment(invoice_id)
-            logger.info(f"Invoice {invoice_id} delete pending payment status={pay_status}")
-            if pay_status >= 300:
-                if error_draft_ids:
-                    error_draft_ids += ","
-                error_draft_ids += str(draft_id)
-            event_msg: str = TRACKING_MESSAGE_EXPIRED.format(draft_id=draft_id, invoice_id=invoice_id)
-            track_event(db_conn, db_cursor, int(invoice_id), MHR_TRACKING_TYPE, pay_status, event_msg)
+        cancel_count = len(rows)
+        results: dict = cancel_expired(db_conn, db_cursor, config, pay_client, MHR_TRACKING_TYPE, rows)
         status_data["mhr_cancel_count"] = cancel_count
-        status_data["mhr_invoice_ids"] = invoice_ids
-        status_data["mhr_draft_ids"] = draft_ids
-        status_data["mhr_numbers"] = mhr_numbers
-        status_data["mhr_error_ids"] = error_draft_ids
-        restore_mhr_status(db_conn, db_cursor, mhr_numbers, draft_ids)
-        restore_mhr_draft(db_conn, db_cursor, draft_ids)
+        status_data["mhr_invoice_ids"] = ",".join(map(str, results["invoice_ids"]))
+        status_data["mhr_draft_ids"] = ",".join(map(str, results["draft_ids"]))
+        status_data["mhr_numbers"] = ",".join(results["reg_numbers"])
+        status_data["mhr_error_ids"] = ",".join(map(str, results["error_draft_ids"]))
+        restore_mhr_status(db_conn, db_cursor, results["reg_numbers"], results["draft_ids"])
+        restore_mhr_draft(db_conn, db_cursor, results["draft_ids"])
     except (psycopg2.Error, Exception) as err:
         error_message = f"Error attempting to cancel MHR expired payments: {err}"
         logger.error(error_message)
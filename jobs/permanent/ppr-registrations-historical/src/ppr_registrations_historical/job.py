@@ -72,6 +72,11 @@ DELETE
                     WHERE r.registration_number = uer.registration_number
                       AND r.account_id LIKE '%_HIS')
 """
+DELETE_SEARCHABLE_HISTORICAL = """
+DELETE
+  FROM searchable_financing_statements
+ WHERE search_until_ts < (now() at time zone 'utc')
+"""
 INSERT_EVENT: Final = """
 INSERT INTO event_tracking(id, key_id, event_ts, event_tracking_type, status, message)
   VALUES(nextval('event_tracking_id_seq'), {job_id}, CURRENT_TIMESTAMP  at time zone 'utc', 'REG_HIST_JOB',
@@ -131,6 +136,13 @@ def job(config):
         db_cursor.execute(DELETE_EXTRA_HISTORICAL)
         db_conn.commit()
 
+        # Remove financing statements that can no longer be returned by a search.
+        job_message += '\n5. Delete searchable financing statements now historical.'
+        logging.info('Starting step 5: delete searchable financing statements that are now historical:')
+        logging.info(DELETE_SEARCHABLE_HISTORICAL)
+        db_cursor.execute(DELETE_SEARCHABLE_HISTORICAL)
+        db_conn.commit()
+
         logging.info('Run completed without error.')
         track_event(db_conn, db_cursor, HTTPStatus.OK, job_message)
     except (psycopg2.Error, Exception) as err:
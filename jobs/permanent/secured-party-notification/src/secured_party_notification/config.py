@@ -33,6 +33,10 @@ class Config(BaseConfig):
     NOTIFY_API_VERSION = os.getenv("NOTIFY_API_VERSION", "")
     REPORT_API_URL = os.getenv("REPORT_API_URL", "")
     REPORT_API_AUDIENCE = os.getenv("REPORT_API_AUDIENCE", REPORT_API_URL)
+    # Report service client connection pool size and retry policy.
+    REPORT_SVC_POOL_SIZE = os.getenv("REPORT_SVC_POOL_SIZE", "10")
+    REPORT_SVC_RETRIES = os.getenv("REPORT_SVC_RETRIES", "4")
+    REPORT_SVC_BACKOFF = os.getenv("REPORT_SVC_BACKOFF", "1.0")
 
     AUTH_SVC_URL = f"{AUTH_API_URL + AUTH_API_VERSION}"
     NOTIFY_SVC_URL = f"{NOTIFY_API_URL + NOTIFY_API_VERSION}"
@@ -69,6 +73,17 @@ class Config(BaseConfig):
     GCP_CS_SA_SCOPES = os.getenv("GCP_CS_SA_SCOPES", "https://www.googleapis.com/auth/cloud-platform")
     # Storage of mail verification reports
     GCP_CS_BUCKET_ID_MAIL = os.getenv("GCP_CS_BUCKET_ID_MAIL", "")
+    # Storage client connection pool size. Set GCP_CS_LOCAL_PATH to use a local directory instead of cloud storage.
+    GCP_CS_POOL_SIZE: int = int(os.getenv("GCP_CS_POOL_SIZE", "10"))
+    GCP_CS_LOCAL_PATH = os.getenv("GCP_CS_LOCAL_PATH", "")
+    # Resumable upload chunk size in bytes for streamed uploads: must be a multiple of 256 KB.
+    GCP_CS_UPLOAD_CHUNK_SIZE: int = int(os.getenv("GCP_CS_UPLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+
+    # Delivery zip file assembly: concurrent report downloads with at most NOTIFY_PREFETCH_QUEUE_SIZE reports held in
+    # memory. The zip file is built in memory up to NOTIFY_ZIP_SPOOL_MAX_SIZE bytes, then on disk.
+    NOTIFY_PREFETCH_WORKERS: int = int(os.getenv("NOTIFY_PREFETCH_WORKERS", "8"))
+    NOTIFY_PREFETCH_QUEUE_SIZE: int = int(os.getenv("NOTIFY_PREFETCH_QUEUE_SIZE", "16"))
+    NOTIFY_ZIP_SPOOL_MAX_SIZE: int = int(os.getenv("NOTIFY_ZIP_SPOOL_MAX_SIZE", str(32 * 1024 * 1024)))
 
     # Document delivery configuration
     GOOGLE_STORAGE_SERVICE_ACCOUNT = os.getenv("GOOGLE_STORAGE_SERVICE_ACCOUNT", "")
@@ -13,10 +13,12 @@
 # limitations under the License.
 """This module executes all the job steps."""
 import copy
-import io
 import json
 import sys
+import tempfile
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime as _datetime
 
@@ -332,9 +334,41 @@ def get_mail_report_data(db_cursor: psycopg2.extensions.cursor, config: Config):
     return db_cursor.fetchall()
 
 
-def batch_reports(status_data: dict, rows) -> dict:
+def fetch_report(row):
+    """Fetch the mail report for the query row from document storage: None if the row has no storage path."""
+    return GoogleStorageService.get_document(str(row[5])) if row[5] else None
+
+
+def prefetch_reports(rows, config: Config):
+    """
+    Fetch the mail reports concurrently ahead of the zip file writer.
+
+    At most NOTIFY_PREFETCH_QUEUE_SIZE reports are requested but not yet consumed, so memory use does not grow with
+    the batch size.
+
+    Args:
+        rows: Database query rows - record set from the mail_reports tables.
+        config: Job configuration containing environment variables.
+
+    Yields:
+        (row, future) tuples in row order, where the future result is the report data.
+    """
+    queue_size: int = max(config.NOTIFY_PREFETCH_QUEUE_SIZE, 1)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(config.NOTIFY_PREFETCH_WORKERS, 1)) as executor:
+        for row in rows:
+            pending.append((row, executor.submit(fetch_report, row)))
+            if len(pending) >= queue_size:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def batch_reports(status_data: dict, rows, config: Config = Config) -> dict:
     """
     Build the document delivery ZIP file from individual reports in document storage.
+    Reports are downloaded concurrently and written to a spooled temporary zip file: in memory up to
+    NOTIFY_ZIP_SPOOL_MAX_SIZE bytes, then on disk. The zip file is streamed to doc storage as a resumable upload.
     Save the zip file to doc storage along with the count file.
     Capture the status of the individual reports as a csv row. Save the csv file to doc storage
     and make available to the notfication service as a download link in status_data as csv_file_url.
@@ -342,6 +376,7 @@ def batch_reports(status_data: dict, rows) -> dict:
     Args:
         status_data: Dictionary to store job status information.
         rows: Database query rows - record set from the mail_reports tables.
+        config: Job configuration containing environment variables.
 
     Returns:
         Updated status_data with zip file counts zip_file_count and zip_file_error_count
@@ -349,29 +384,28 @@ def batch_reports(status_data: dict, rows) -> dict:
     count: int = 0
     zip_error_count: int = 0  # Report data exists in doc storage but error adding to zip file.
     csv_data = []
-    report_data = None
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_data:
-        for row in rows:
-            try:
+    with tempfile.SpooledTemporaryFile(max_size=config.NOTIFY_ZIP_SPOOL_MAX_SIZE) as zip_file:
+        with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_DEFLATED) as zip_data:
+            for row, report_future in prefetch_reports(rows, config):
                 report_id = int(row[7])
-                if row[5]:
-                    storage_name = str(row[5])
-                    report_data = GoogleStorageService.get_document(storage_name)
-                    zip_data.writestr(storage_name[11:], report_data)
-                    csv_data.append(get_csv_data(row, 201))
-                    count += 1
-                else:
-                    logger.warning(f"No mail report found for id={report_id}, status={int(row[6])}")
-                    csv_data.append(get_csv_data(row, None))
-            except Exception as report_err:
-                logger.error(f"Notification report failed for mail_reports id={report_id}: {report_err}")
-                zip_error_count += 1
-                csv_data.append(get_csv_data(row, 500))
-    if count > 0:
-        GoogleStorageService.save_document(
-            status_data.get("delivery_zip_file_name"), zip_buffer.getvalue(), CONTENT_TYPE_ZIP
-        )
+                try:
+                    report_data = report_future.result()
+                    if report_data is not None:
+                        zip_data.writestr(str(row[5])[11:], report_data)
+                        csv_data.append(get_csv_data(row, 201))
+                        count += 1
+                    else:
+                        logger.warning(f"No mail report found for id={report_id}, status={int(row[6])}")
+                        csv_data.append(get_csv_data(row, None))
+                except Exception as report_err:
+                    logger.error(f"Notification report failed for mail_reports id={report_id}: {report_err}")
+                    zip_error_count += 1
+                    csv_data.append(get_csv_data(row, 500))
+                report_data = None
+        if count > 0:
+            GoogleStorageService.save_document_file(
+                status_data.get("delivery_zip_file_name"), zip_file, CONTENT_TYPE_ZIP, config.GCP_CS_UPLOAD_CHUNK_SIZE
+            )
     GoogleStorageService.save_document(
         status_data.get("delivery_count_file_name"), str(count) + "\n", CONTENT_TYPE_TEXT
     )
@@ -404,7 +438,6 @@ def job(config: Config):
                as this query excludes records with an existing job id. 
 
     TO DO:
-        Use a GCP ephemeral disk to build the zip file.
         Use existing document delivery job tracking framework. Replace or in addition to status_data.
         Conditionally add BCMail+ delivery via SFTP only if sftp env vars exist (PROD only).
 
@@ -431,7 +464,7 @@ def job(config: Config):
             notify_client.send_status(status_data)
             return
         rows = get_mail_report_data(db_cursor, config)
-        status_data = batch_reports(status_data, rows)
+        status_data = batch_reports(status_data, rows, config)
         set_job_id(db_conn, db_cursor, config, status_data.get("batch_job_id"))
         logger.info("Run completed: sending email.")
         notify_client.send_status(status_data)
@@ -14,9 +14,12 @@
 """This class is a wrapper for document storage API calls."""
 import datetime
 
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
 from secured_party_notification.config import Config
+from secured_party_notification.services.document_storage.local_storage import LocalStorageClient
 from secured_party_notification.services.gcp_auth.auth_service import GoogleAuthService
 from secured_party_notification.services.utils.exceptions import StorageException
 from secured_party_notification.utils.logging import logger
@@ -42,8 +45,20 @@ class GoogleStorageService:  # pylint: disable=too-few-public-methods
     def init_app(config: Config):
         """Set up the service"""
         bucket_id = config.GCP_CS_BUCKET_ID_MAIL
-        credentials = GoogleAuthService.get_credentials()
-        storage_client = storage.Client(credentials=credentials)
+        if config.GCP_CS_LOCAL_PATH:
+            logger.info(f"Using local document storage path={config.GCP_CS_LOCAL_PATH}.")
+            credentials = None
+            storage_client = LocalStorageClient(config.GCP_CS_LOCAL_PATH)
+        else:
+            credentials = GoogleAuthService.get_credentials()
+            # Refresh the access token in the background before it expires instead of blocking a request.
+            credentials.with_non_blocking_refresh()
+            http = AuthorizedSession(credentials)
+            http.mount(
+                "https://",
+                HTTPAdapter(pool_connections=config.GCP_CS_POOL_SIZE, pool_maxsize=config.GCP_CS_POOL_SIZE),
+            )
+            storage_client = storage.Client(credentials=credentials, _http=http)
         GoogleStorageService.GCP_BUCKET = storage_client.bucket(bucket_id)
         GoogleStorageService.GCP_BUCKET_ID_MAIL = bucket_id
         GoogleStorageService.GCP_CREDENTIALS = credentials
@@ -85,6 +100,21 @@ class GoogleStorageService:  # pylint: disable=too-few-public-methods
             logger.error(f"save_document failed for doc name={name}: {err}")
             raise StorageException(f"POST document failed for doc name={name}.") from err
 
+    @classmethod
+    def save_document_file(cls, name: str, file_obj, content_type: str, chunk_size: int = None):
+        """Save or replace the named document in cloud storage, streaming the file contents as a resumable upload."""
+        try:
+            logger.info(f"Saving document name={name} from file.")
+            blob = GoogleStorageService.GCP_BUCKET.blob(name)
+            if chunk_size:
+                blob.chunk_size = chunk_size
+            file_obj.seek(0)
+            blob.upload_from_file(file_obj, content_type=content_type)
+            return blob.time_created
+        except Exception as err:  # pylint: disable=broad-except # noqa F841;
+            logger.error(f"save_document_file failed for doc name={name}: {err}")
+            raise StorageException(f"POST document failed for doc name={name}.") from err
+
     @classmethod
     def save_document_link(cls, name: str, raw_data, available_days: int = 1, content_type: str = None):
         """Save a document to a cloud storage bucket with the binary data as the file contents. Return a link."""
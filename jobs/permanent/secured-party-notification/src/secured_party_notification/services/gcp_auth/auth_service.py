@@ -14,7 +14,10 @@
 """This maintains access tokens for API calls."""
 import base64
 import json
+import threading
+import time
 
+import google.auth.jwt
 import google.auth.transport.requests
 import google.oauth2.id_token
 from google.oauth2 import service_account
@@ -22,6 +25,11 @@ from google.oauth2 import service_account
 from secured_party_notification.config import Config
 from secured_party_notification.utils.logging import logger
 
+# Refresh a cached report service ID token this many seconds before it expires.
+TOKEN_REFRESH_SECONDS = 300
+# Google ID token lifetime if the token expiry cannot be read.
+TOKEN_DEFAULT_LIFETIME = 3600
+
 
 class GoogleAuthService:  # pylint: disable=too-few-public-methods
     """Google Auth Service implementation.
@@ -35,6 +43,9 @@ class GoogleAuthService:  # pylint: disable=too-few-public-methods
     gcp_sa_scopes = None
     service_account_info = None
     credentials = None
+    # Report service ID tokens by audience: (token, expiry timestamp).
+    report_api_tokens = {}
+    report_api_token_lock = threading.Lock()
     report_api_audience = None
     # Use service account env var if available.
     if gcp_auth_key:
@@ -68,10 +79,20 @@ class GoogleAuthService:  # pylint: disable=too-few-public-methods
         """Generate an OAuth access token with IAM configured auth mhr api container to report api container."""
         if not cls.report_api_audience:
             return None
-        auth_req = google.auth.transport.requests.Request()
-        token = google.oauth2.id_token.fetch_id_token(auth_req, cls.report_api_audience)
-        logger.info("Call successful: obtained report api token.")
-        return token
+        return cls.get_id_token(cls.report_api_audience)
+
+    @classmethod
+    def get_id_token(cls, audience: str):
+        """Get a cached ID token for the audience, fetching a new token if not cached or about to expire."""
+        with cls.report_api_token_lock:
+            cached = cls.report_api_tokens.get(audience)
+            if cached and cached[1] - TOKEN_REFRESH_SECONDS > time.time():
+                return cached[0]
+            auth_req = google.auth.transport.requests.Request()
+            token = google.oauth2.id_token.fetch_id_token(auth_req, audience)
+            cls.report_api_tokens[audience] = (token, get_token_expiry(token))
+            logger.info(f"Call successful: obtained ID token for {audience}.")
+            return token
 
     @classmethod
     def get_credentials(cls):
@@ -82,3 +103,14 @@ class GoogleAuthService:  # pylint: disable=too-few-public-methods
             )
         logger.info("Call successful: obtained credentials.")
         return cls.credentials
+
+
+def get_token_expiry(token: str) -> float:
+    """Get the token expiry timestamp from the token claims, without verifying the token."""
+    try:
+        claims = google.auth.jwt.decode(token, verify=False)
+        if claims.get("exp"):
+            return float(claims["exp"])
+    except Exception as err:  # noqa: B902; use the default token lifetime
+        logger.info(f"Could not read the ID token expiry, using the default: {err}")
+    return time.time() + TOKEN_DEFAULT_LIFETIME
@@ -11,34 +11,29 @@
 """Merge individual secured party notification reports into a single batch report."""
 from http import HTTPStatus
 
-import requests
-
 from secured_party_notification.config import Config
 from secured_party_notification.services.gcp_auth.auth_service import GoogleAuthService
+from secured_party_notification.services.report.report_client import ReportClient
 from secured_party_notification.utils.logging import logger
 
 MERGE_URI = "/forms/pdfengines/merge"
-RS_TIMEOUT = 1800.0
 
 
 class Report:  # pylint: disable=too-few-public-methods
     """Service to create report outputs."""
 
-    GCP_TOKEN = None
-    HEADER_AUTH = None
     MERGE_URL = None
 
     @staticmethod
     def init_app(config: Config):
         """Set up the service"""
-        Report.GCP_TOKEN = GoogleAuthService.get_report_api_token()
-        Report.HEADER_AUTH = "Bearer {}".format(Report.GCP_TOKEN)
         Report.MERGE_URL = config.REPORT_API_URL + MERGE_URI
+        ReportClient.init_app(config)
 
     @staticmethod
     def get_headers() -> dict:
-        """Build the report service request headers."""
-        headers = {"Authorization": Report.HEADER_AUTH}
+        """Build the report service request headers: the report service token is cached until close to expiry."""
+        headers = {"Authorization": "Bearer {}".format(GoogleAuthService.get_report_api_token())}
         return headers
 
     @staticmethod
@@ -54,7 +49,7 @@ class Report:  # pylint: disable=too-few-public-methods
             filename = "file" + str(count) + ".pdf"
             files[filename] = pdf
         headers = Report.get_headers()
-        response = requests.post(url=Report.MERGE_URL, headers=headers, files=files, timeout=RS_TIMEOUT)
+        response = ReportClient.post(url=Report.MERGE_URL, headers=headers, files=files)
         logger.debug(f"Batch merge reports response status: {response.status_code}.")
         if response.status_code != HTTPStatus.OK:
             content = response.content.decode("ascii")
@@ -0,0 +1,133 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Report html benchmark: time the html generation for a large search report.
+
+Run from the mhr-api directory:
+
+    poetry run python benchmarks/report_html_benchmark.py --statements 1000 --iterations 5
+
+The search report has the statements count of copies of a unit test search result home registration. The report
+html is generated twice, as a search report is: once for the TOC page numbers and once for the final render. The html
+generation is timed compiling the template on every render (the previous behaviour) and with the shared report
+template environment.
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from jinja2 import Template
+
+from mhr_api import create_app
+from mhr_api.reports.v2 import report_utils
+from mhr_api.reports.v2.report import Report
+from mhr_api.reports.v2.report_utils import ReportTypes
+
+SEARCH_DATAFILE = "tests/unit/reports/data/search-detail-mhr-example.json"
+RENDERS_PER_REPORT = 2
+
+
+def build_search_data(statements: int) -> dict:
+    """Build search report data with the statements count of uniquely numbered home registrations."""
+    with open(SEARCH_DATAFILE, "r", encoding="UTF-8") as data_file:
+        search_data = json.load(data_file)
+    detail = search_data["details"][0]
+    select = search_data["selected"][0]
+    search_data["details"] = []
+    search_data["selected"] = []
+    for index in range(statements):
+        mhr_num: str = f"{index + 1:06d}"
+        reg_detail = copy.deepcopy(detail)
+        reg_detail["mhrNumber"] = mhr_num
+        reg_select = copy.deepcopy(select)
+        reg_select["mhrNumber"] = mhr_num
+        search_data["details"].append(reg_detail)
+        search_data["selected"].append(reg_select)
+    search_data["totalResultsSize"] = statements
+    return search_data
+
+
+def build_report_request(search_data: dict) -> dict:
+    """Build the report service request data (template and template data) for the search report."""
+    report = Report(search_data, "BENCHMARK", ReportTypes.SEARCH_DETAIL_REPORT, "Benchmark Account")
+    return report._setup_report_data()  # pylint: disable=protected-access
+
+
+def render_compiled_each_time(request_data: dict) -> str:
+    """Generate the html the previous way, compiling the template source for the render."""
+    return Template(request_data["template"], autoescape=True).render(request_data["templateVars"])
+
+
+def time_renders(request_data: dict, render, iterations: int) -> list:
+    """Return the elapsed seconds of each iteration of generating the report html RENDERS_PER_REPORT times."""
+    elapsed = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        for _ in range(RENDERS_PER_REPORT):
+            render(request_data)
+        elapsed.append(time.perf_counter() - start_time)
+    return elapsed
+
+
+def summarize(elapsed: list) -> dict:
+    """Summarize the iteration times in milliseconds."""
+    return {
+        "firstMs": round(elapsed[0] * 1000, 1),
+        "minMs": round(min(elapsed) * 1000, 1),
+        "meanMs": round(sum(elapsed) / len(elapsed) * 1000, 1),
+    }
+
+
+def run(args) -> dict:
+    """Run the benchmark, returning the summary by render mode."""
+    request_data = build_report_request(build_search_data(args.statements))
+    html_length: int = len(render_compiled_each_time(request_data))
+    # Start the shared environment cold: the first iteration includes compiling the template or loading the bytecode.
+    report_utils.TemplateEnvironment.environment = None
+    report_utils.TemplateEnvironment.names.clear()
+    report_utils.TemplateEnvironment.sources.clear()
+    summary = {
+        "statements": args.statements,
+        "renders": RENDERS_PER_REPORT,
+        "htmlLength": html_length,
+        "compileEachRender": summarize(time_renders(request_data, render_compiled_each_time, args.iterations)),
+        "sharedEnvironment": summarize(time_renders(request_data, report_utils.get_html_from_data, args.iterations)),
+    }
+    summary["meanSpeedup"] = round(
+        summary["compileEachRender"]["meanMs"] / max(summary["sharedEnvironment"]["meanMs"], 0.1), 1
+    )
+    return summary
+
+
+def main() -> int:
+    """Parse the command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="MHR search report html generation benchmark.")
+    parser.add_argument("--config", default="development", help="App configuration name.")
+    parser.add_argument("--statements", type=int, default=1000, help="Number of search result registrations.")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed passes over the report renders.")
+    parser.add_argument("--output", help="Write the summary json to this file.")
+    args = parser.parse_args()
+    app = create_app(args.config)
+    with app.app_context():
+        summary = run(args)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
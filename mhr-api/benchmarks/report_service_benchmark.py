@@ -0,0 +1,165 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Report pipeline benchmark: time MHR report generation end to end against the local report service stand-in.
+
+Run from the mhr-api directory:
+
+    poetry run python benchmarks/report_service_benchmark.py --iterations 5 --latency 0.2 --page-latency 0.01
+
+Each scenario generates a report with Report.get_pdf, the way the API resources do: the report data setup, the html
+generation, the report service requests, and the pdf processing (TOC page numbers and merging). By default the
+report service is the ppr-api benchmarks/report_service_stub.py server started in process: set --report-url to use a
+stand-in (or a report service) that is already running. The report service request count and time are reported for
+each scenario, so the time spent in the API is the total time less the report service time.
+
+Scenarios:
+- registration: a manufactured home registration report.
+- registrationStaff: a staff registration cover letter and registration report merged by the report service.
+- search: a search report for a unit test search result.
+- largeSearch: a search report with the statements count of home registrations.
+"""
+import argparse
+import copy
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from http import HTTPStatus
+
+import PyPDF2
+from report_html_benchmark import build_search_data, summarize
+
+from mhr_api import create_app
+from mhr_api.reports.v2.report import Report
+from mhr_api.reports.v2.report_client import ReportClient
+from mhr_api.reports.v2.report_utils import ReportTypes
+
+REPORT_DATA_DIR = "tests/unit/reports/data/"
+REPORT_SERVICE_STUB = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "ppr-api", "benchmarks", "report_service_stub.py"
+)
+SCENARIOS = {
+    "registration": ("registration-test-example.json", ReportTypes.MHR_REGISTRATION),
+    "registrationStaff": ("registration-test-example.json", ReportTypes.MHR_REGISTRATION_STAFF),
+    "search": ("search-detail-mhr-example.json", ReportTypes.SEARCH_DETAIL_REPORT),
+    "largeSearch": (None, ReportTypes.SEARCH_DETAIL_REPORT),
+}
+
+
+def load_report_service_stub():
+    """Load the report service stand-in module shared with the ppr-api benchmarks."""
+    spec = importlib.util.spec_from_file_location("report_service_stub", REPORT_SERVICE_STUB)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_report_data(scenario: str, statements: int) -> dict:
+    """Get the report data for the scenario."""
+    data_file, _ = SCENARIOS[scenario]
+    if not data_file:
+        return build_search_data(statements)
+    with open(REPORT_DATA_DIR + data_file, "r", encoding="UTF-8") as report_file:
+        return json.load(report_file)
+
+
+def get_pdf_info(content) -> dict:
+    """Get the generated report size and page count."""
+    pdf_data: bytes = content.read() if hasattr(content, "read") else content
+    return {"bytes": len(pdf_data), "pages": len(PyPDF2.PdfReader(io.BytesIO(pdf_data)).pages)}
+
+
+def run_scenario(scenario: str, args, stub) -> dict:
+    """Generate the scenario report for each iteration, returning the timing and report service summary."""
+    report_data = get_report_data(scenario, args.statements)
+    _, report_type = SCENARIOS[scenario]
+    elapsed = []
+    info = {}
+    metrics_start = ReportClient.get_metrics()
+    if stub:
+        stub.get_stats(True)
+    for iteration in range(args.iterations):
+        report = Report(copy.deepcopy(report_data), "ppr_staff", report_type, "Benchmark Account")
+        start_time = time.perf_counter()
+        content, status_code, _ = report.get_pdf()
+        elapsed.append(time.perf_counter() - start_time)
+        if status_code != HTTPStatus.OK:
+            raise RuntimeError(f"{scenario} report failed status={status_code}: {content}")
+        if iteration == 0:
+            info = get_pdf_info(content)
+    metrics = ReportClient.get_metrics()
+    requests = metrics["requests"] - metrics_start["requests"]
+    service_seconds: float = metrics["totalSeconds"] - metrics_start["totalSeconds"]
+    summary = summarize(elapsed)
+    summary.update(info)
+    summary["reportServiceRequests"] = requests // args.iterations
+    summary["reportServiceMeanMs"] = round(service_seconds / args.iterations * 1000, 1)
+    summary["apiMeanMs"] = round(summary["meanMs"] - summary["reportServiceMeanMs"], 1)
+    if stub:
+        summary["endpoints"] = stub.get_stats(True)
+    return summary
+
+
+def run(args, stub) -> dict:
+    """Run the benchmark, returning the summary by scenario."""
+    summary = {
+        "iterations": args.iterations,
+        "statements": args.statements,
+        "latency": args.latency,
+        "pageLatency": args.page_latency,
+    }
+    for scenario in args.scenarios:
+        summary[scenario] = run_scenario(scenario, args, stub)
+    return summary
+
+
+def main() -> int:
+    """Parse the command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="MHR report generation benchmark against a local report service.")
+    parser.add_argument("--config", default="development", help="App configuration name.")
+    parser.add_argument("--iterations", type=int, default=5, help="Reports generated per scenario.")
+    parser.add_argument("--statements", type=int, default=1000, help="Number of large search report registrations.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in seconds to delay every response.")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Stand-in extra seconds delay per pdf page.")
+    parser.add_argument("--report-url", help="Use this running report service instead of starting the stand-in.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="Write the summary json to this file.")
+    args = parser.parse_args()
+    stub = None
+    report_url = args.report_url
+    if not report_url:
+        stub = load_report_service_stub().ReportServiceStub(0, args.latency, args.page_latency)
+        stub.start()
+        report_url = stub.url
+    app = create_app(args.config)
+    app.config["REPORT_SVC_URL"] = report_url
+    app.config["REPORT_API_AUDIENCE"] = ""
+    try:
+        with app.app_context():
+            summary = run(args, stub)
+    finally:
+        if stub:
+            stub.shutdown()
+            stub.server_close()
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Search benchmark: seed a synthetic corpus in a local database and report search latency percentiles.
+
+Run from the mhr-api directory with the .env database settings pointing at a local Postgres instance:
+
+    poetry run python benchmarks/search_benchmark.py seed --size 100000
+    poetry run python benchmarks/search_benchmark.py run --iterations 5 --output baseline.json
+    poetry run python benchmarks/search_benchmark.py run --baseline baseline.json --tolerance 0.2
+    poetry run python benchmarks/search_benchmark.py clean
+
+Every search type is replayed with a criteria mix drawn from the corpus plus a share of criteria with no match.
+The search queries and result building are timed without the search response cache or saving the search, and the
+rows read by each search are taken from the transaction table statistics. With --baseline the run exits with a
+non-zero status if the p95 latency of any search type is more than the tolerance above the baseline, so it can be
+used as a regression gate for search query changes.
+"""
+import argparse
+import hashlib
+import json
+import math
+import sys
+import time
+
+from sqlalchemy.sql import text
+
+from mhr_api import create_app
+from mhr_api.models import SearchRequest, db, search_utils
+from mhr_api.models import utils as model_utils
+
+# flake8: noqa Q000,E122,E131
+# Disable Q000: Allow query strings to be in double quotation marks that contain single quotation marks.
+# Disable E122: allow query strings to be more human readable.
+# Disable E131: allow query strings to be more human readable.
+
+# Synthetic corpus ids start above the unit test data ids.
+CORPUS_ID_START = 500000000
+CORPUS_ACCOUNT_ID = "BENCHMARK"
+# Corpus MHR numbers are CORPUS_MHR_START + the corpus index.
+CORPUS_MHR_START = 500000
+# Criteria are taken from the corpus in steps of a prime so every search type samples the whole corpus.
+CRITERIA_STEP = 7919
+# Every NO_MATCH_INTERVAL criteria value does not match anything in the corpus.
+NO_MATCH_INTERVAL = 10
+LAST_NAMES = [
+    "ANDERSON",
+    "BROWN",
+    "CHAN",
+    "CLARK",
+    "DHILLON",
+    "GILL",
+    "JOHNSON",
+    "LEE",
+    "MACDONALD",
+    "MARTIN",
+    "NGUYEN",
+    "PATEL",
+    "ROBINSON",
+    "SANDHU",
+    "SMITH",
+    "TAYLOR",
+    "THOMPSON",
+    "WILSON",
+    "WONG",
+    "YOUNG",
+]
+FIRST_NAMES = [
+    "ALEX",
+    "AMANDA",
+    "BRIAN",
+    "CHRISTINE",
+    "DAVID",
+    "EMILY",
+    "GURPREET",
+    "JAMES",
+    "JENNIFER",
+    "JOHN",
+    "KAREN",
+    "MICHAEL",
+    "NANCY",
+    "PAUL",
+    "ROBERT",
+    "SARAH",
+    "STEVEN",
+    "SUSAN",
+    "THOMAS",
+    "WEI",
+]
+BUSINESS_WORDS = [
+    "ALPINE",
+    "BAYVIEW",
+    "CASCADE",
+    "COASTAL",
+    "EVERGREEN",
+    "FRASER",
+    "GLACIER",
+    "HARBOUR",
+    "ISLAND",
+    "KOOTENAY",
+    "LAKESIDE",
+    "MOUNTAIN",
+    "NORTHERN",
+    "OKANAGAN",
+    "PACIFIC",
+    "RIVERSIDE",
+    "SKEENA",
+    "SUMMIT",
+    "VALLEY",
+    "WESTCOAST",
+]
+DESIGNATIONS = ["LTD", "INC", "CORP", "LIMITED"]
+CITIES = ["ABBOTSFORD", "KAMLOOPS", "KELOWNA", "NANAIMO", "PENTICTON", "PRINCE GEORGE", "SURREY", "VERNON"]
+
+INSERT_DRAFT = """
+INSERT INTO mhr_drafts(id, draft_number, account_id, registration_type, create_ts, draft, mhr_number, update_ts,
+                       user_id)
+  VALUES(:start_id, 'BENCH', :account_id, 'MHREG', now() at time zone 'utc', '{}', null, null, 'BENCHMARK')
+"""
+# One in 10 homes is exempt and one in 10 is historical.
+INSERT_REGISTRATIONS = """
+INSERT INTO mhr_registrations(id, mhr_number, account_id, registration_type, registration_ts, status_type, draft_id,
+                              pay_invoice_id, pay_path, user_id, client_reference_id)
+SELECT :start_id + n, (:mhr_start + n)::text, :account_id, 'MHREG', (now() at time zone 'utc') - n * interval '1 minute',
+       CASE WHEN n % 10 = 8 THEN 'EXEMPT' WHEN n % 10 = 9 THEN 'HISTORICAL' ELSE 'ACTIVE' END, :start_id, null, null,
+       'BENCHMARK', 'BENCHMARK'
+  FROM generate_series(0, :size - 1) AS n
+"""
+INSERT_ADDRESSES = """
+INSERT INTO addresses(id, street, street_additional, city, region, postal_code, country)
+SELECT :start_id + n, n || ' BENCHMARK RD.', null, (CAST(:cities AS VARCHAR[]))[1 + n % :city_count], 'BC',
+       'V8R 3A5', 'CA'
+  FROM generate_series(0, :size - 1) AS n
+"""
+INSERT_LOCATIONS = """
+INSERT INTO mhr_locations(id, location_type, status_type, registration_id, change_registration_id, address_id,
+                          leave_province, park_name, park_pad)
+SELECT :start_id + n, 'MH_PARK', 'ACTIVE', :start_id + n, :start_id + n, :start_id + n, 'N', 'BENCHMARK PARK',
+       (n % 200)::text
+  FROM generate_series(0, :size - 1) AS n
+"""
+INSERT_DESCRIPTIONS = """
+INSERT INTO mhr_descriptions(id, status_type, registration_id, number_of_sections, year_made, manufacturer_name,
+                             make, model, change_registration_id)
+SELECT :start_id + n, 'ACTIVE', :start_id + n, 1, 1970 + n % 55, 'MANUFACTURER ' || n % 40, 'MAKE ' || n % 50,
+       'MODEL ' || n % 20, :start_id + n
+  FROM generate_series(0, :size - 1) AS n
+"""
+INSERT_SECTIONS = """
+INSERT INTO mhr_sections(id, registration_id, status_type, compressed_key, serial_number, length_feet, width_feet,
+                         change_registration_id)
+SELECT :start_id + n, :start_id + n, 'ACTIVE', mhr_serial_compressed_key(serial_number), serial_number, 60, 14,
+       :start_id + n
+  FROM (SELECT n, UPPER(SUBSTR(md5('BENCH' || n), 1, 12)) AS serial_number
+          FROM generate_series(0, :size - 1) AS n) AS serials
+"""
+INSERT_OWNER_GROUPS = """
+INSERT INTO mhr_owner_groups(id, sequence_number, registration_id, status_type, tenancy_type, tenancy_specified,
+                             change_registration_id, group_sequence_number)
+SELECT :start_id + n, 1, :start_id + n, 'ACTIVE', 'SOLE', 'Y', :start_id + n, 1
+  FROM generate_series(0, :size - 1) AS n
+"""
+# Even index homes are owned by a business, odd index homes by an individual.
+INSERT_OWNERS = """
+INSERT INTO mhr_parties(id, party_type, status_type, registration_id, change_registration_id, first_name,
+                        middle_name, last_name, business_name, compressed_name, address_id, owner_group_id)
+SELECT :start_id + n, CASE WHEN n % 2 = 0 THEN 'OWNER_BUS' ELSE 'OWNER_IND' END, 'ACTIVE', :start_id + n,
+       :start_id + n, CASE WHEN n % 2 = 1 THEN first_name END, null, CASE WHEN n % 2 = 1 THEN last_name END,
+       CASE WHEN n % 2 = 0 THEN business_name END,
+       CASE WHEN n % 2 = 0 THEN mhr_name_compressed_key(business_name)
+            ELSE mhr_name_compressed_key(last_name || ' ' || first_name) END,
+       :start_id + n, :start_id + n
+  FROM (SELECT n,
+               (CAST(:business_words AS VARCHAR[]))[1 + n % :word_count] || ' ' ||
+               (CAST(:business_words AS VARCHAR[]))[1 + (n / :word_count) % :word_count] || ' ' ||
+               (CAST(:designations AS VARCHAR[]))[1 + n % :designation_count] AS business_name,
+               (CAST(:first_names AS VARCHAR[]))[1 + (n / :last_count) % :first_count] AS first_name,
+               (CAST(:last_names AS VARCHAR[]))[1 + n % :last_count] AS last_name
+          FROM generate_series(0, :size - 1) AS n) AS names
+"""
+CORPUS_INSERT = {
+    "draft": INSERT_DRAFT,
+    "registrations": INSERT_REGISTRATIONS,
+    "addresses": INSERT_ADDRESSES,
+    "locations": INSERT_LOCATIONS,
+    "descriptions": INSERT_DESCRIPTIONS,
+    "sections": INSERT_SECTIONS,
+    "owner groups": INSERT_OWNER_GROUPS,
+    "owners": INSERT_OWNERS,
+}
+CORPUS_SIZE_QUERY = """
+SELECT COUNT(id)
+  FROM mhr_registrations
+ WHERE id >= :start_id
+"""
+CORPUS_DELETE = [
+    "DELETE FROM mhr_parties WHERE registration_id >= :start_id",
+    "DELETE FROM mhr_owner_groups WHERE registration_id >= :start_id",
+    "DELETE FROM mhr_sections WHERE registration_id >= :start_id",
+    "DELETE FROM mhr_descriptions WHERE registration_id >= :start_id",
+    "DELETE FROM mhr_locations WHERE registration_id >= :start_id",
+    "DELETE FROM mhr_registrations WHERE id >= :start_id",
+    "DELETE FROM addresses WHERE id >= :start_id",
+    "DELETE FROM mhr_drafts WHERE id = :start_id",
+]
+CORPUS_TABLES = [
+    "mhr_registrations",
+    "addresses",
+    "mhr_locations",
+    "mhr_descriptions",
+    "mhr_sections",
+    "mhr_owner_groups",
+    "mhr_parties",
+]
+# Rows read so far in the current transaction by sequential and index scans.
+ROWS_SCANNED_QUERY = """
+SELECT COALESCE(SUM(seq_tup_read + COALESCE(idx_tup_fetch, 0)), 0)
+  FROM pg_stat_xact_user_tables
+"""
+NO_MATCH_CRITERIA = {
+    SearchRequest.SearchTypes.MANUFACTURED_HOME_NUM.value: "099999",
+    SearchRequest.SearchTypes.SERIAL_NUM.value: "ZZ99ZZ99ZZ99",
+    SearchRequest.SearchTypes.ORGANIZATION_NAME.value: "QUIXOTIC ZEPHYR HOLDINGS LTD",
+    SearchRequest.SearchTypes.OWNER_NAME.value: "XAVIER|QUIMBY",
+}
+TO_API_SEARCH_TYPE = {value: key for key, value in model_utils.TO_DB_SEARCH_TYPE.items()}
+
+
+def business_name(index: int) -> str:
+    """Return the corpus owner business name for the corpus index (same as INSERT_OWNERS)."""
+    word_count: int = len(BUSINESS_WORDS)
+    return " ".join(
+        [
+            BUSINESS_WORDS[index % word_count],
+            BUSINESS_WORDS[(index // word_count) % word_count],
+            DESIGNATIONS[index % len(DESIGNATIONS)],
+        ]
+    )
+
+
+def individual_name(index: int):
+    """Return the corpus owner individual first and last name for the corpus index."""
+    last_count: int = len(LAST_NAMES)
+    return FIRST_NAMES[(index // last_count) % len(FIRST_NAMES)], LAST_NAMES[index % last_count]
+
+
+def serial_number(index: int) -> str:
+    """Return the corpus section serial number for the corpus index (same as INSERT_SECTIONS)."""
+    return hashlib.md5(f"BENCH{index}".encode()).hexdigest()[0:12].upper()  # noqa: S324 not used for security
+
+
+def build_criteria(search_type: str, index: int, no_match: bool) -> dict:
+    """Build the search request criteria json for the search type from the corpus index."""
+    value: str = NO_MATCH_CRITERIA[search_type] if no_match else None
+    if search_type == SearchRequest.SearchTypes.MANUFACTURED_HOME_NUM.value:
+        value = value or str(CORPUS_MHR_START + index)
+    elif search_type == SearchRequest.SearchTypes.SERIAL_NUM.value:
+        value = value or serial_number(index)
+    elif search_type == SearchRequest.SearchTypes.ORGANIZATION_NAME.value:
+        value = value or business_name(index - index % 2)
+    else:
+        first_name, last_name = value.split("|") if value else individual_name(index - index % 2 + 1)
+        return {"ownerName": {"first": first_name, "last": last_name}}
+    return {"value": value}
+
+
+def build_criteria_mix(corpus_size: int, criteria_count: int) -> list:
+    """Build the search request json for every search type, sampling the corpus."""
+    searches = []
+    for search_type in SearchRequest.SearchTypes:
+        for count in range(criteria_count):
+            index: int = (count * CRITERIA_STEP) % (corpus_size - 1)
+            criteria = build_criteria(search_type.value, index, count % NO_MATCH_INTERVAL == NO_MATCH_INTERVAL - 1)
+            searches.append({"type": TO_API_SEARCH_TYPE[search_type.value], "criteria": criteria})
+    return searches
+
+
+def percentile(values: list, pct: float) -> float:
+    """Return the nearest rank percentile of the sorted values."""
+    if not values:
+        return 0
+    rank: int = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[rank]
+
+
+def seed(size: int):
+    """Create a synthetic corpus of size homes with a location, description, section and owner."""
+    params = {
+        "start_id": CORPUS_ID_START,
+        "mhr_start": CORPUS_MHR_START,
+        "size": size,
+        "account_id": CORPUS_ACCOUNT_ID,
+        "business_words": BUSINESS_WORDS,
+        "word_count": len(BUSINESS_WORDS),
+        "designations": DESIGNATIONS,
+        "designation_count": len(DESIGNATIONS),
+        "first_names": FIRST_NAMES,
+        "first_count": len(FIRST_NAMES),
+        "last_names": LAST_NAMES,
+        "last_count": len(LAST_NAMES),
+        "cities": CITIES,
+        "city_count": len(CITIES),
+    }
+    clean()
+    for name, statement in CORPUS_INSERT.items():
+        start = time.perf_counter()
+        db.session.execute(text(statement), params)
+        print(f"Inserted {name} in {time.perf_counter() - start:.1f}s")
+    db.session.commit()
+    for table in CORPUS_TABLES:
+        db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
+    print(f"Seeded {size} homes.")
+
+
+def clean():
+    """Delete the synthetic corpus."""
+    for statement in CORPUS_DELETE:
+        db.session.execute(text(statement), {"start_id": CORPUS_ID_START})
+    db.session.commit()
+
+
+def run_search(request_json: dict) -> dict:
+    """Run one search without the search response cache or saving it and return the measurements."""
+    query: SearchRequest = SearchRequest.create_from_json(request_json, CORPUS_ACCOUNT_ID, "benchmark")
+    if query.search_type == SearchRequest.SearchTypes.MANUFACTURED_HOME_NUM:
+        search_utils.format_mhr_number(query.request_json)
+    try:
+        scanned_start: int = db.session.execute(text(ROWS_SCANNED_QUERY)).scalar()
+        start = time.perf_counter()
+        query.execute_search_type()
+        elapsed: float = (time.perf_counter() - start) * 1000
+        scanned_end: int = db.session.execute(text(ROWS_SCANNED_QUERY)).scalar()
+    finally:
+        db.session.rollback()
+    return {
+        "type": query.search_type,
+        "ms": elapsed,
+        "rowsScanned": int(scanned_end - scanned_start),
+        "resultsSize": query.returned_results_size or 0,
+        "jsonSize": model_utils.json_size(query.search_response) if query.search_response else 0,
+    }
+
+
+def summarize(measurements: list) -> dict:
+    """Summarize the measurements by search type."""
+    summary = {}
+    for search_type in SearchRequest.SearchTypes:
+        type_results = [result for result in measurements if result["type"] == search_type.value]
+        if not type_results:
+            continue
+        times = sorted(result["ms"] for result in type_results)
+        count: int = len(type_results)
+        summary[search_type.value] = {
+            "searches": count,
+            "p50": round(percentile(times, 50), 2),
+            "p95": round(percentile(times, 95), 2),
+            "p99": round(percentile(times, 99), 2),
+            "mean": round(sum(times) / count, 2),
+            "rowsScanned": round(sum(result["rowsScanned"] for result in type_results) / count),
+            "resultsSize": round(sum(result["resultsSize"] for result in type_results) / count, 1),
+            "maxResultsSize": max(result["resultsSize"] for result in type_results),
+            "jsonSize": round(sum(result["jsonSize"] for result in type_results) / count),
+        }
+    return summary
+
+
+def print_summary(summary: dict):
+    """Print the summary as a table, latency in milliseconds."""
+    print(f"{'type':<5}{'searches':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}{'rows':>10}{'results':>9}")
+    for search_type, result in summary.items():
+        print(
+            f"{search_type:<5}{result['searches']:>9}{result['p50']:>10}{result['p95']:>10}{result['p99']:>10}"
+            + f"{result['mean']:>10}{result['rowsScanned']:>10}{result['resultsSize']:>9}"
+        )
+
+
+def check_baseline(summary: dict, baseline: dict, tolerance: float) -> list:
+    """Return the search types with a p95 latency more than the tolerance above the baseline."""
+    regressions = []
+    for search_type, result in summary.items():
+        if search_type in baseline and result["p95"] > baseline[search_type]["p95"] * (1 + tolerance):
+            regressions.append(f"{search_type} p95 {result['p95']}ms baseline {baseline[search_type]['p95']}ms")
+    return regressions
+
+
+def run(args) -> int:
+    """Replay the criteria mix and report the latency percentiles, returning the process exit status."""
+    corpus_size: int = db.session.execute(text(CORPUS_SIZE_QUERY), {"start_id": CORPUS_ID_START}).scalar()
+    db.session.rollback()
+    if not corpus_size or corpus_size < 2:
+        print("No benchmark corpus: run the seed command first.")
+        return 1
+    searches = build_criteria_mix(corpus_size, args.criteria)
+    for _ in range(args.warmup):
+        for request_json in searches:
+            run_search(request_json)
+    measurements = []
+    for _ in range(args.iterations):
+        for request_json in searches:
+            measurements.append(run_search(request_json))
+    summary = summarize(measurements)
+    print(f"Corpus size {corpus_size}, {len(searches)} searches x {args.iterations} iterations (ms):")
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"corpusSize": corpus_size, "searchTypes": summary}, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = check_baseline(summary, baseline.get("searchTypes", {}), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+def main() -> int:
+    """Parse the command line and run the benchmark command in an app context."""
+    parser = argparse.ArgumentParser(description="MHR search benchmark.")
+    parser.add_argument("--config", default="development", help="App configuration name.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    seed_parser = commands.add_parser("seed", help="Create the synthetic corpus, replacing any existing one.")
+    seed_parser.add_argument("--size", type=int, default=100000, help="Number of homes (at most 499999).")
+    commands.add_parser("clean", help="Delete the synthetic corpus.")
+    run_parser = commands.add_parser("run", help="Replay the criteria mix against the corpus.")
+    run_parser.add_argument("--criteria", type=int, default=50, help="Criteria per search type.")
+    run_parser.add_argument("--iterations", type=int, default=3, help="Timed passes over the criteria mix.")
+    run_parser.add_argument("--warmup", type=int, default=1, help="Untimed passes over the criteria mix.")
+    run_parser.add_argument("--output", help="Write the summary json to this file.")
+    run_parser.add_argument("--baseline", help="Compare with a summary json written by a previous run.")
+    run_parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 increase over the baseline.")
+    args = parser.parse_args()
+
+    app = create_app(args.config)
+    with app.app_context():
+        if args.command == "seed":
+            seed(args.size)
+        elif args.command == "clean":
+            clean()
+        else:
+            return run(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,10 +27,13 @@ from mhr_api import errorhandlers, models
 from mhr_api.config import config
 from mhr_api.metadata import APP_RUNNING_ENVIRONMENT, APP_VERSION
 from mhr_api.models import db
+from mhr_api.reports.v2.report import init_template_cache
+from mhr_api.reports.v2.report_client import ReportClient
 from mhr_api.resources import endpoints
 from mhr_api.schemas import rsbc_schemas
 from mhr_api.services import auth_service, queue_service, storage_service
 from mhr_api.translations import babel
+from mhr_api.utils import query_profile
 from mhr_api.utils.auth import jwt
 from mhr_api.utils.logging import logger, setup_logging
 
@@ -63,6 +66,9 @@ def create_app(service_environment=APP_RUNNING_ENVIRONMENT, **kwargs):
     storage_service.init_app(app)
     endpoints.init_app(app)
     queue_service.init_app(app)
+    init_template_cache(app)
+    ReportClient.init_app(app)
+    query_profile.init_app(app)
 
     setup_jwt_manager(app, jwt)
 
@@ -88,6 +88,14 @@ class Config:  # pylint: disable=too-few-public-methods
     PAYMENT_SVC_URL = f"{PAY_API_URL + PAY_API_VERSION}"
     REPORT_SVC_URL = f"{REPORT_API_URL}"
     REPORT_TEMPLATE_PATH = os.getenv("REPORT_TEMPLATE_PATH", "report-templates")
+    # Report service client connection pool size and retry policy.
+    REPORT_SVC_POOL_SIZE: int = int(os.getenv("REPORT_SVC_POOL_SIZE", "10"))
+    REPORT_SVC_RETRIES: int = int(os.getenv("REPORT_SVC_RETRIES", "4"))
+    REPORT_SVC_BACKOFF: float = float(os.getenv("REPORT_SVC_BACKOFF", "1.0"))
+    # Set to true to reload a cached report template when a template file is modified.
+    REPORT_TEMPLATE_RELOAD: bool = os.getenv("REPORT_TEMPLATE_RELOAD", "false").lower() == "true"
+    # Compiled report template bytecode cache directory: the system temp directory if not set.
+    REPORT_TEMPLATE_BYTECODE_CACHE_DIR = os.getenv("REPORT_TEMPLATE_BYTECODE_CACHE_DIR", "")
 
     LD_SDK_KEY = os.getenv("LD_SDK_KEY", None)
     SECRET_KEY = "a secret"
@@ -143,6 +151,20 @@ class Config:  # pylint: disable=too-few-public-methods
     ACCOUNT_REGISTRATIONS_MAX_RESULTS = os.getenv("ACCOUNT_REGISTRATIONS_MAX_RESULTS", "100")
     ACCOUNT_DRAFTS_MAX_RESULTS = os.getenv("ACCOUNT_DRAFTS_MAX_RESULTS", "1000")
     ACCOUNT_SEARCH_MAX_RESULTS = os.getenv("ACCOUNT_SEARCH_MAX_RESULTS", "1000")
+    # Search response cache for identical search criteria: cleared when a registration change is committed.
+    SEARCH_CACHE_ENABLED: bool = os.getenv("SEARCH_CACHE_ENABLED", "false").lower() == "true"
+    SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "120"))
+    SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "500"))
+    # Auth api authorization response cache: entries are keyed on a hash of the token and the account id.
+    AUTH_CACHE_ENABLED: bool = os.getenv("AUTH_CACHE_ENABLED", "true").lower() == "true"
+    AUTH_CACHE_TTL: int = int(os.getenv("AUTH_CACHE_TTL", "60"))
+    AUTH_CACHE_MAX_SIZE: int = int(os.getenv("AUTH_CACHE_MAX_SIZE", "1000"))
+    # Per request DB query profiling for a sample of requests: logs the statement count, total time and the slowest
+    # statements with the endpoint. DB_QUERY_PROFILE_HEADER also adds a Server-Timing response header.
+    DB_QUERY_PROFILE_ENABLED: bool = os.getenv("DB_QUERY_PROFILE_ENABLED", "false").lower() == "true"
+    DB_QUERY_PROFILE_SAMPLE_RATE: float = float(os.getenv("DB_QUERY_PROFILE_SAMPLE_RATE", "0.1"))
+    DB_QUERY_PROFILE_SLOWEST: int = int(os.getenv("DB_QUERY_PROFILE_SLOWEST", "3"))
+    DB_QUERY_PROFILE_HEADER: bool = os.getenv("DB_QUERY_PROFILE_HEADER", "false").lower() == "true"
 
     # Search results report number of financing statements threshold for async requests.
     SEARCH_PDF_ASYNC_THRESHOLD: int = int(os.getenv("SEARCH_PDF_ASYNC_THRESHOLD", "75"))
@@ -156,6 +178,9 @@ class Config:  # pylint: disable=too-few-public-methods
     # Google APIs and cloud storage
     GOOGLE_DEFAULT_SA = os.getenv("GOOGLE_DEFAULT_SA")
     GCP_CS_SA_SCOPES = os.getenv("GCP_CS_SA_SCOPES", "https://www.googleapis.com/auth/cloud-platform")
+    # Storage client connection pool size. Set GCP_CS_LOCAL_PATH to use a local directory instead of cloud storage.
+    GCP_CS_POOL_SIZE: int = int(os.getenv("GCP_CS_POOL_SIZE", "10"))
+    GCP_CS_LOCAL_PATH = os.getenv("GCP_CS_LOCAL_PATH", "")
     # Storage of search reports
     GCP_CS_BUCKET_ID = os.getenv("GCP_CS_BUCKET_ID", "mhr_search_result_report_dev")
     # Storage of registration verification reports
@@ -169,6 +194,11 @@ class Config:  # pylint: disable=too-few-public-methods
     GCP_PS_PROJECT_ID = os.getenv("DEPLOYMENT_PROJECT", "eogruh-dev")
     GCP_PS_SEARCH_REPORT_TOPIC = os.getenv("GCP_PS_SEARCH_REPORT_TOPIC", "mhr-search-report")
     GCP_PS_REGISTRATION_REPORT_TOPIC = os.getenv("GCP_PS_REGISTRATION_REPORT_TOPIC", "mhr-registration-report")
+    # Publish without waiting for the result: failures are recorded as event tracking records by a callback.
+    GCP_PS_PUBLISH_ASYNC: bool = os.getenv("GCP_PS_PUBLISH_ASYNC", "true").lower() == "true"
+    GCP_PS_BATCH_MAX_MESSAGES: int = int(os.getenv("GCP_PS_BATCH_MAX_MESSAGES", "100"))
+    GCP_PS_BATCH_MAX_LATENCY: float = float(os.getenv("GCP_PS_BATCH_MAX_LATENCY", "0.01"))
+    GCP_PS_FLUSH_TIMEOUT: int = int(os.getenv("GCP_PS_FLUSH_TIMEOUT", "10"))
 
     GATEWAY_URL = os.getenv("GATEWAY_URL", "https://test.api.connect.gov.bc.ca")
     GATEWAY_LTSA_URL = os.getenv("GATEWAY_LTSA_URL", "https://test.api.connect.gov.bc.ca/ltsa-dev/api/v1")
@@ -208,6 +238,7 @@ class DevConfig(Config):  # pylint: disable=too-few-public-methods
     DEVELOPMENT = True
     TESTING = False
     DEBUG = True
+    REPORT_TEMPLATE_RELOAD = True
 
 
 class TestConfig(Config):  # pylint: disable=too-few-public-methods
@@ -225,6 +256,7 @@ class UnitTestingConfig(Config):  # pylint: disable=too-few-public-methods
 
     DEBUG = True
     TESTING = True
+    AUTH_CACHE_ENABLED = False
 
     # POSTGRESQL
     DB_USER = os.getenv("DATABASE_TEST_USERNAME", "")
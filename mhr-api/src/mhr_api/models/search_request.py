@@ -122,7 +122,9 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
         """Execute a search by mhr number query."""
         result = search_utils.search_by_mhr_number(self.request_json)
         row = None
+        columns: dict = {}
         try:
+            columns = search_utils.get_result_columns(result)
             row = result.first()
         except Exception as db_exception:  # noqa: B902; return nicer error
             logger.error("DB search_by_mhr_number exception: " + str(db_exception))
@@ -130,7 +132,7 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
 
         result_json = []
         if row is not None:
-            result_json.append(search_utils.build_search_result_mhr(row))
+            result_json.append(search_utils.build_search_result_mhr(row, columns))
             self.returned_results_size = 1
             self.total_results_size = 1
             self.search_response = result_json
@@ -141,75 +143,62 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
     def search_by_serial_number(self):
         """Execute a search query for a serial number search type."""
         result = search_utils.search_by_serial_number(self.request_json)
-        rows = None
-        try:
-            rows = result.fetchall()
-        except Exception as db_exception:  # noqa: B902; return nicer error
-            logger.error("DB search_by_serial_number exception: " + str(db_exception))
-            raise DatabaseException(db_exception) from db_exception
-
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                match = search_utils.build_search_result_serial(row)
-                SearchRequest.update_result_matches(results_json, match, SearchRequest.SearchTypes.SERIAL_NUM)
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.set_search_response(
+            result, search_utils.build_search_result_serial, SearchRequest.SearchTypes.SERIAL_NUM, "serial_number"
+        )
 
     def search_by_organization_name(self):
         """Execute a owner organization/business name search query."""
         result = search_utils.search_by_owner_business(self.request_json)
-        rows = None
-        try:
-            rows = result.fetchall()
-        except Exception as db_exception:  # noqa: B902; return nicer error
-            logger.error("DB search_by_owner_business exception: " + str(db_exception))
-            raise DatabaseException(db_exception) from db_exception
-
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                match = search_utils.build_search_result_owner_bus(row)
-                SearchRequest.update_result_matches(results_json, match, SearchRequest.SearchTypes.ORGANIZATION_NAME)
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.set_search_response(
+            result,
+            search_utils.build_search_result_owner_bus,
+            SearchRequest.SearchTypes.ORGANIZATION_NAME,
+            "owner_business",
+        )
 
     def search_by_owner_name(self):
         """Execute a owner individual name search query."""
         result = search_utils.search_by_owner_individual(self.request_json)
-        rows = None
+        self.set_search_response(
+            result, search_utils.build_search_result_owner_ind, SearchRequest.SearchTypes.OWNER_NAME, "owner_individual"
+        )
+
+    def set_search_response(self, result, build_result, search_type: str, search_name: str):
+        """Build the search results json and result counts by streaming the search query result rows."""
+        results_json = []
         try:
-            rows = result.fetchall()
+            columns: dict = search_utils.get_result_columns(result)
+            for row in search_utils.stream_search_rows(result):
+                SearchRequest.update_result_matches(results_json, build_result(row, columns), search_type)
         except Exception as db_exception:  # noqa: B902; return nicer error
-            logger.error("DB search_by_owner_individual exception: " + str(db_exception))
+            logger.error(f"DB search_by_{search_name} exception: " + str(db_exception))
             raise DatabaseException(db_exception) from db_exception
-
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                match = search_utils.build_search_result_owner_ind(row)
-                SearchRequest.update_result_matches(results_json, match, SearchRequest.SearchTypes.OWNER_NAME)
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.returned_results_size = len(results_json)
+        self.total_results_size = self.returned_results_size
+        self.search_response = results_json
 
     def search(self):
-        """Execute a search with the previously set search type and criteria."""
+        """Execute a search with the previously set search type and criteria.
+
+        Identical search criteria may be answered from the search response cache. The search request is always saved.
+        """
         if self.search_type == self.SearchTypes.MANUFACTURED_HOME_NUM:
             # Format before searching
             search_utils.format_mhr_number(self.request_json)
+        cache_key: str = search_utils.search_cache_key(self.search_type, self.request_json)
+        cached = search_utils.get_cached_search(cache_key)
+        if cached is not None:
+            self.search_response, self.returned_results_size, self.total_results_size = cached
+        else:
+            self.execute_search_type()
+            search_utils.set_cached_search(
+                cache_key, self.search_response, self.returned_results_size, self.total_results_size
+            )
+        self.save()
 
+    def execute_search_type(self):
+        """Execute the search query for the search type and set the search response and result counts."""
         if self.search_type == self.SearchTypes.MANUFACTURED_HOME_NUM:
             self.search_by_mhr_number()
         elif self.search_type == self.SearchTypes.SERIAL_NUM:
@@ -220,7 +209,6 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
             self.search_by_owner_name()
         else:
             raise DatabaseException("SearchRequest.search PosgreSQL not yet implemented.")
-        self.save()
 
     @classmethod
     def update_result_matches(cls, results, result, search_type: str) -> bool:
@@ -15,7 +15,6 @@
 
 from __future__ import annotations
 
-import json
 from http import HTTPStatus
 
 from flask import current_app
@@ -140,7 +139,9 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
         if pay_params.get("callbackURL"):
             self.callback_url = pay_params.get("callbackURL")
         else:
-            results_length = len(json.dumps(detail_response["details"]))
+            results_length = model_utils.json_size(
+                detail_response["details"], current_app.config.get("MAX_SIZE_SEARCH_RT")
+            )
             logger.debug(f"Search id= {self.search_id} results size={results_length}.")
             if results_length > current_app.config.get("MAX_SIZE_SEARCH_RT"):
                 logger.info(f"Search id={self.search_id} size exceeds RT max, setting up async report.")
@@ -150,15 +151,11 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
     def build_details(self, staff: bool = False):
         """Generate the search selection details."""
         new_results = []
+        added_mhr_nums = set()
         for select in self.search_select:
             if "selected" not in select or select["selected"]:
                 mhr_num = select["mhrNumber"]
-                found = False
-                if new_results:  # Check for duplicates.
-                    for match in new_results:
-                        if match["mhrNumber"] == mhr_num:
-                            found = True
-                if not found:  # No duplicates.
+                if mhr_num not in added_mhr_nums:  # No duplicates.
                     # Load registration details here.
                     mh_id = select.get("mhId", None)
                     logger.debug(f"find_by_id for mhr num {mhr_num} start id={mh_id}")
@@ -171,6 +168,7 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
                         ppr_registrations = SearchResult.search_ppr_by_mhr_number(mhr_num)
                         result["pprRegistrations"] = ppr_registrations
                     new_results.append(result)
+                    added_mhr_nums.add(result["mhrNumber"])
         return new_results
 
     def set_search_selection(self, update_select):  # pylint: disable=too-many-branches
@@ -180,25 +178,27 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
         # Remove duplicates
         reg_list = list(dict.fromkeys(reg_list))
         # Update lien info flag
+        lien_info = {
+            match["mhrNumber"]: match.get("includeLienInfo")
+            for match in update_select
+            if match.get("includeLienInfo", False)
+        }
+        # Index the original matches by MHR number, keeping the original order.
+        results_by_mhr_num = {}
         for result in original_results:
-            for match in update_select:
-                if result["mhrNumber"] == match["mhrNumber"]:
-                    if match.get("includeLienInfo", False):
-                        result["includeLienInfo"] = match.get("includeLienInfo")
+            if result["mhrNumber"] in lien_info:
+                result["includeLienInfo"] = lien_info[result["mhrNumber"]]
+            results_by_mhr_num.setdefault(result["mhrNumber"], []).append(result)
 
         final_selection = []
         for reg_num in reg_list:
             # logger.info(f'reg_num={reg_num}')
-            result = None
-            for original in original_results:
-                if original["mhrNumber"] == reg_num:
-                    if not result:
-                        result = original
-                        result["extraMatches"] = []
-                    else:  # Combine matches
-                        result["extraMatches"].append(original)
-            if result:
-                if not result.get("extraMatches"):
+            matches = results_by_mhr_num.get(reg_num)
+            if matches:
+                result = matches[0]
+                if len(matches) > 1:  # Combine matches
+                    result["extraMatches"] = matches[1:]
+                elif "extraMatches" in result:
                     del result["extraMatches"]
                 final_selection.append(result)
 
@@ -372,13 +372,9 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
             # Check selection MHR numbers are all in the initial search matches.
             original_results = search_result.search.search_response
             if original_results:
+                original_mhr_nums = {result.get("mhrNumber") for result in original_results}
                 for match in select_json:
-                    exists: bool = False
-                    for result in original_results:
-                        if match.get("mhrNumber") == result.get("mhrNumber"):
-                            exists = True
-                            break
-                    if not exists:
+                    if match.get("mhrNumber") not in original_mhr_nums:
                         error_msg = model_utils.ERR_SEARCH_INVALID.format(code=ResourceErrorCodes.VALIDATION_ERR.value)
                         logger.info(
                             f"Search {search_id} invalid mhr number in search selection: " + match.get("mhrNumber")
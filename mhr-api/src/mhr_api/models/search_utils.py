@@ -19,13 +19,19 @@ Search constants and helper functions.
 # Disable Q000: Allow query strings to be in double quotation marks that contain single quotation marks.
 # Disable E122: allow query strings to be more human readable.
 # Disable E131: allow query strings to be more human readable.
+import copy
+import json
 import re
 
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 
 from mhr_api.exceptions import DatabaseException
 from mhr_api.models import utils as model_utils
 from mhr_api.models.type_tables import MhrOwnerStatusTypes
+from mhr_api.utils.cache import TTLCache
 from mhr_api.utils.logging import logger
 
 from .db import db
@@ -39,6 +45,22 @@ ACCOUNT_SEARCH_HISTORY_MAX_SIZE = 1000
 # Maximum number or results returned by search.
 SEARCH_RESULTS_MAX_SIZE = 5000
 
+# Number of rows fetched from a search query cursor at a time when building the search results json.
+SEARCH_RESULTS_CHUNK_SIZE = 500
+
+# Search response cache: a committed change to any of these tables may change a search response.
+SEARCH_CACHE_TABLES = (
+    "mhr_registrations",
+    "mhr_parties",
+    "mhr_owner_groups",
+    "mhr_descriptions",
+    "mhr_sections",
+    "mhr_locations",
+    "mhr_notes",
+)
+SEARCH_CACHE_CHANGED_KEY = "search_cache_changed"
+_search_cache: TTLCache = None
+
 # Result set size limit clause
 RESULTS_SIZE_LIMIT_CLAUSE = "FETCH FIRST :max_results_size ROWS ONLY"
 
@@ -173,13 +195,104 @@ def format_mhr_number(request_json):
     request_json["criteria"]["value"] = mhr_num
 
 
+def get_search_cache() -> TTLCache:
+    """Return the process search response cache, creating it from the app configuration on first use."""
+    global _search_cache  # pylint: disable=global-statement
+    if _search_cache is None:
+        _search_cache = TTLCache(
+            current_app.config.get("SEARCH_CACHE_MAX_SIZE", 500), current_app.config.get("SEARCH_CACHE_TTL", 120)
+        )
+    return _search_cache
+
+
+def search_cache_key(search_type: str, request_json: dict) -> str:
+    """Return the search response cache key for the search criteria, or None if search caching is disabled.
+
+    Criteria values are trimmed as the search queries do. Owner name and serial number criteria are also converted to
+    upper case, as the compressed key search queries do, except for a case sensitive wildcard serial number search.
+    Serial number searches include the wildcard search flag.
+    """
+    if not current_app.config.get("SEARCH_CACHE_ENABLED"):
+        return None
+    wildcard: bool = bool(request_json.get("wildcardSearch"))
+    to_upper: bool = search_type in ("MI", "MO") or (search_type == "MS" and not wildcard)
+
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(val) for key, val in value.items()}
+        if isinstance(value, str):
+            return value.strip().upper() if to_upper else value.strip()
+        return value
+
+    key = {"type": search_type, "criteria": normalize(request_json.get("criteria", {})), "wildcardSearch": wildcard}
+    return json.dumps(key, sort_keys=True)
+
+
+def get_cached_search(cache_key: str):
+    """Return a copy of the cached (search_response, returned_results_size, total_results_size) or None."""
+    if not cache_key:
+        return None
+    cached = get_search_cache().get(cache_key)
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def set_cached_search(cache_key: str, search_response, returned_results_size: int, total_results_size: int):
+    """Cache a copy of the search response and result counts for the search criteria."""
+    if cache_key:
+        get_search_cache().set(cache_key, copy.deepcopy((search_response, returned_results_size, total_results_size)))
+
+
+@event.listens_for(Session, "after_flush")
+def _search_cache_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    """Flag the session if the flush changed a table the search responses are built from."""
+    if _search_cache is None or session.info.get(SEARCH_CACHE_CHANGED_KEY):
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if getattr(instance, "__tablename__", None) in SEARCH_CACHE_TABLES:
+            session.info[SEARCH_CACHE_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _search_cache_after_commit(session):
+    """Clear the search response cache when a committed change may alter a search response."""
+    if session.info.pop(SEARCH_CACHE_CHANGED_KEY, None) and _search_cache is not None:
+        _search_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _search_cache_after_rollback(session):
+    """Rolled back changes do not alter search responses."""
+    session.info.pop(SEARCH_CACHE_CHANGED_KEY, None)
+
+
+def execute_search_query(query, query_params: dict):
+    """Execute a search query with a server side cursor so the result rows can be streamed in chunks."""
+    return db.session.execute(query, query_params, execution_options={"stream_results": True})
+
+
+def get_result_columns(result) -> dict:
+    """Map the search query result column names to row positions.
+
+    The mapping is built once per query result from the result keys and used by the result builders for the rows of
+    every partition, so columns are read by name without a mapping object per row.
+    """
+    return {name: index for index, name in enumerate(result.keys())}
+
+
+def stream_search_rows(result):
+    """Yield the rows of a search query result, fetching SEARCH_RESULTS_CHUNK_SIZE rows at a time."""
+    for rows in result.partitions(SEARCH_RESULTS_CHUNK_SIZE):
+        yield from rows
+
+
 def search_by_mhr_number(request_json):
     """Execute a search by mhr number query."""
     mhr_num: str = request_json["criteria"]["value"]
     logger.info(f"search_by_mhr_number search value={mhr_num}.")
     try:
         query = text(SEARCH_MHR_NUMBER_QUERY)
-        result = db.session.execute(query, {"query_value": mhr_num.strip()})
+        result = execute_search_query(query, {"query_value": mhr_num.strip()})
         return result
     except Exception as db_exception:  # noqa: B902; return nicer error
         logger.error("Search_by_mhr_number exception: " + str(db_exception))
@@ -194,7 +307,7 @@ def search_by_serial_number(request_json):
         query_text: str = SEARCH_SERIAL_QUERY if not request_json.get("wildcardSearch") else SEARCH_SERIAL_WILD_QUERY
         # logger.info(query_text)
         query = text(query_text)
-        result = db.session.execute(query, {"query_value": serial_num.strip()})
+        result = execute_search_query(query, {"query_value": serial_num.strip()})
         return result
     except Exception as db_exception:  # noqa: B902; return nicer error
         logger.error("Search_by_serial_number exception: " + str(db_exception))
@@ -207,7 +320,7 @@ def search_by_owner_business(request_json):
     logger.info(f"search_by_owner_business search value={bus_name}.")
     try:
         query = text(SEARCH_OWNER_BUS_QUERY)
-        result = db.session.execute(query, {"query_value": bus_name.strip()})
+        result = execute_search_query(query, {"query_value": bus_name.strip()})
         return result
     except Exception as db_exception:  # noqa: B902; return nicer error
         logger.error("Search_by_owner_business exception: " + str(db_exception))
@@ -225,125 +338,76 @@ def search_by_owner_individual(request_json):
     logger.info(f"search_by_owner_individual search value={name}.")
     try:
         query = text(SEARCH_OWNER_IND_QUERY)
-        result = db.session.execute(query, {"query_value": name.strip()})
+        result = execute_search_query(query, {"query_value": name.strip()})
         return result
     except Exception as db_exception:  # noqa: B902; return nicer error
         logger.error("Search_by_owner_individual exception: " + str(db_exception))
         raise DatabaseException(db_exception) from db_exception
 
 
-def build_search_result_mhr(row):
-    """Build a single search summary json from a DB row for a mhr number search."""
-    timestamp = row[2]
-    year: int = int(row[5]) if row[5] is not None else 0
-    result_json = {
-        "mhrNumber": str(row[0]),
-        "status": str(row[1]),
-        "createDateTime": model_utils.format_local_ts(timestamp),
-        "homeLocation": str(row[3]).strip(),
-        "serialNumber": str(row[4]).strip(),
+def build_search_result_base(row, columns: dict) -> dict:
+    """Build the search summary json properties common to all search types from a DB row."""
+    year = row[columns["year_made"]]
+    make = row[columns["make"]]
+    model = row[columns["model"]]
+    return {
+        "mhrNumber": str(row[columns["mhr_number"]]),
+        "status": str(row[columns["status_type"]]),
+        "createDateTime": model_utils.format_local_ts(row[columns["registration_ts"]]),
+        "homeLocation": str(row[columns["city"]]).strip(),
+        "serialNumber": str(row[columns["serial_number"]]).strip(),
         "baseInformation": {
-            "year": year,
-            "make": str(row[6]).strip() if row[6] is not None else "",
-            "model": str(row[7]).strip() if row[7] is not None else "",
+            "year": int(year) if year is not None else 0,
+            "make": str(make).strip() if make is not None else "",
+            "model": str(model).strip() if model is not None else "",
         },
         "activeCount": 0,
         "exemptCount": 0,
         "historicalCount": 0,
-        "mhId": int(row[8]),
-        "manufacturerName": str(row[10]),
-        "civicAddress": str(row[11]).replace("|", "\n"),
+        "mhId": int(row[columns["id"]]),
+        "manufacturerName": str(row[columns["manufacturer_name"]]),
+        "civicAddress": str(row[columns["civic_address"]]).replace("|", "\n"),
     }
-    return set_owner_info(result_json, row)
 
 
-def build_search_result_serial(row):
+def build_search_result_mhr(row, columns: dict):
+    """Build a single search summary json from a DB row for a mhr number search."""
+    result_json = build_search_result_base(row, columns)
+    return set_owner_info(result_json, row[columns["owner_info"]])
+
+
+def build_search_result_serial(row, columns: dict):
     """Build a single search summary json from a DB row for a serial number search."""
-    timestamp = row[2]
-    year: int = int(row[5]) if row[5] is not None else 0
-    result_json = {
-        "mhrNumber": str(row[0]),
-        "status": str(row[1]),
-        "createDateTime": model_utils.format_local_ts(timestamp),
-        "homeLocation": str(row[3]).strip(),
-        "serialNumber": str(row[4]).strip(),
-        "baseInformation": {
-            "year": year,
-            "make": str(row[6]).strip() if row[6] is not None else "",
-            "model": str(row[7]).strip() if row[7] is not None else "",
-        },
-        "activeCount": 1,
-        "exemptCount": 0,
-        "historicalCount": 0,
-        "mhId": int(row[8]),
-        "manufacturerName": str(row[10]),
-        "civicAddress": str(row[11]).replace("|", "\n"),
-    }
-    return set_owner_info(result_json, row)
+    result_json = build_search_result_base(row, columns)
+    result_json["activeCount"] = 1
+    return set_owner_info(result_json, row[columns["owner_info"]])
 
 
-def build_search_result_owner_bus(row):
+def build_search_result_owner_bus(row, columns: dict):
     """Build a single search summary json from a DB row for a owner business name search."""
-    timestamp = row[2]
-    year: int = int(row[5]) if row[5] is not None else 0
-    result_json = {
-        "mhrNumber": str(row[0]),
-        "status": str(row[1]),
-        "createDateTime": model_utils.format_local_ts(timestamp),
-        "homeLocation": str(row[3]).strip(),
-        "serialNumber": str(row[4]).strip(),
-        "baseInformation": {
-            "year": year,
-            "make": str(row[6]).strip() if row[6] is not None else "",
-            "model": str(row[7]).strip() if row[7] is not None else "",
-        },
-        "activeCount": 0,
-        "exemptCount": 0,
-        "historicalCount": 0,
-        "mhId": int(row[8]),
-        "organizationName": str(row[9]),
-        "manufacturerName": str(row[11]),
-        "civicAddress": str(row[12]).replace("|", "\n"),
-    }
-    owner_status: str = str(row[10])
+    result_json = build_search_result_base(row, columns)
+    result_json["organizationName"] = str(row[columns["business_name"]])
+    owner_status: str = str(row[columns["owner_status_type"]])
     result_json["ownerStatus"] = owner_status
     return set_owner_status(result_json, owner_status)
 
 
-def build_search_result_owner_ind(row):
+def build_search_result_owner_ind(row, columns: dict):
     """Build a single search summary json from a DB row for a owner individual name search."""
-    timestamp = row[2]
-    year: int = int(row[5]) if row[5] is not None else 0
-    result_json = {
-        "mhrNumber": str(row[0]),
-        "status": str(row[1]),
-        "createDateTime": model_utils.format_local_ts(timestamp),
-        "homeLocation": str(row[3]).strip(),
-        "serialNumber": str(row[4]).strip(),
-        "baseInformation": {
-            "year": year,
-            "make": str(row[6]).strip() if row[6] is not None else "",
-            "model": str(row[7]).strip() if row[7] is not None else "",
-        },
-        "activeCount": 0,
-        "exemptCount": 0,
-        "historicalCount": 0,
-        "mhId": int(row[8]),
-        "manufacturerName": str(row[13]),
-        "civicAddress": str(row[14]).replace("|", "\n"),
-    }
-    owner_status: str = str(row[9])
-    owner_name = {"last": str(row[10]), "first": str(row[11])}
-    if row[12] is not None:
-        owner_name["middle"] = str(row[12])
+    result_json = build_search_result_base(row, columns)
+    owner_status: str = str(row[columns["owner_status_type"]])
+    owner_name = {"last": str(row[columns["last_name"]]), "first": str(row[columns["first_name"]])}
+    middle_name = row[columns["middle_name"]]
+    if middle_name is not None:
+        owner_name["middle"] = str(middle_name)
     result_json["ownerName"] = owner_name
     result_json["ownerStatus"] = owner_status
     return set_owner_status(result_json, owner_status)
 
 
-def set_owner_info(result_json: dict, row) -> dict:
-    """Set the conditional owner status count and name for the result."""
-    owner_info = str(row[9]).split("|") if row[9] is not None else []
+def set_owner_info(result_json: dict, owner_info_value) -> dict:
+    """Set the conditional owner status count and name for the result from the row owner info column value."""
+    owner_info = str(owner_info_value).split("|") if owner_info_value is not None else []
     owner_status: str = owner_info[0] if owner_info else ""
     result_json["ownerStatus"] = owner_status
     if owner_info:
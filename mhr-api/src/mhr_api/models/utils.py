@@ -16,6 +16,7 @@
 Common constants used across models and utilities for mapping type codes
 between the API and the database in both directions.
 """
+import json
 import re
 from datetime import date  # noqa: F401 pylint: disable=unused-import
 from datetime import datetime as _datetime
@@ -889,3 +890,26 @@ def get_search_serial_number_key(serial_num: str) -> str:
     key = re.sub("[A-Z]", "0", key)
     start_pos: int = len(key) - 6
     return key[start_pos:]
+
+
+def json_size(data, max_size: int = None) -> int:
+    """Get the length of the data serialized by json.dumps, without building the full JSON string.
+
+    Dictionary values and list items are measured one at a time, with list items serialized individually. If max_size
+    is set, stop when the running length exceeds it: the returned length is then greater than max_size but may be less
+    than the full length.
+    """
+    if isinstance(data, (dict, list)) and data:
+        size: int = 2 + 2 * (len(data) - 1)  # Brackets and ", " separators.
+        items = data.items() if isinstance(data, dict) else ((None, item) for item in data)
+        for key, value in items:
+            if key is not None:
+                size += len(json.dumps(str(key))) + 2  # Key and ": " separator.
+            if key is not None and isinstance(value, (dict, list)):
+                size += json_size(value, None if max_size is None else max_size - size)
+            else:
+                size += len(json.dumps(value))
+            if max_size is not None and size > max_size:
+                return size
+        return size
+    return len(json.dumps(data))
@@ -16,7 +16,6 @@ from pathlib import Path
 
 import markupsafe
 import pycountry
-import requests
 from flask import current_app, jsonify
 
 from mhr_api.exceptions import ResourceErrorCodes
@@ -24,6 +23,7 @@ from mhr_api.models import utils as model_utils
 from mhr_api.models.type_tables import MhrDocumentTypes, MhrRegistrationTypes, MhrTenancyTypes
 from mhr_api.reports import ppr_report_utils
 from mhr_api.reports.v2 import report_utils
+from mhr_api.reports.v2.report_client import ReportClient
 from mhr_api.reports.v2.report_utils import ReportTypes
 from mhr_api.services.gcp_auth.auth_service import GoogleAuthService
 from mhr_api.utils.logging import logger
@@ -73,7 +73,7 @@ class Report:  # pylint: disable=too-few-public-methods
         meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data, self._report_key)
         headers = Report.get_headers()
-        response = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.debug(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response.status_code
@@ -100,7 +100,7 @@ class Report:  # pylint: disable=too-few-public-methods
         meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data, self._report_key)
         headers = Report.get_headers()
-        response_reg = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response_reg = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.debug(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response_reg.status_code
@@ -123,7 +123,7 @@ class Report:  # pylint: disable=too-few-public-methods
         )
         files = report_utils.get_report_files(data_final, self._report_key)
         logger.info("Search report regenerating with TOC page numbers set.")
-        response = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.info("Search report regeneration with TOC page numbers completed.")
         if response.status_code != HTTPStatus.OK:
             content = ResourceErrorCodes.REPORT_ERR + ": " + response.content.decode("ascii")
@@ -142,7 +142,7 @@ class Report:  # pylint: disable=too-few-public-methods
         meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data, self._report_key, False)
         headers = Report.get_headers()
-        response_cover = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response_cover = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.debug(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response_cover.status_code
@@ -177,7 +177,7 @@ class Report:  # pylint: disable=too-few-public-methods
         meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data, self._report_key, False)
         headers = Report.get_headers()
-        response_cover = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response_cover = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.debug(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response_cover.status_code
@@ -232,7 +232,7 @@ class Report:  # pylint: disable=too-few-public-methods
         )
         meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data, self._report_key, False)
-        response_reg = requests.post(url=url, headers=headers, data=meta_data, files=files, timeout=1800.0)
+        response_reg = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.debug(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response_reg.status_code
@@ -275,7 +275,7 @@ class Report:  # pylint: disable=too-few-public-methods
             files[filename] = pdf
         headers = Report.get_headers()
         url = current_app.config.get("REPORT_SVC_URL") + MERGE_URI
-        response = requests.post(url=url, headers=headers, files=files, timeout=1800.0)
+        response = ReportClient.post(url=url, headers=headers, files=files)
         logger.debug("Batch merge reports response status: {0}.".format(response.status_code))
         if response.status_code != HTTPStatus.OK:
             content = ResourceErrorCodes.REPORT_ERR + ": " + response.content.decode("ascii")
@@ -326,17 +326,24 @@ class Report:  # pylint: disable=too-few-public-methods
         return report_id
 
     def _get_template(self):
-        """Load from the local file system the template matching the report type."""
+        """Get from the template cache the template matching the report type."""
         try:
             template_path = current_app.config.get("REPORT_TEMPLATE_PATH")
-            template_code = Path(f"{template_path}/{self._get_template_filename()}").read_text(encoding="UTF-8")
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            template_code = report_utils.TemplateCache.get_template(
+                template_path, self._get_template_filename(), Report._load_template
+            )
         except Exception as err:  # noqa: B902; just logging
             logger.error(err)
             raise err
         return template_code
 
+    @staticmethod
+    def _load_template(template_path: str, file_name: str):
+        """Load from the local file system the template matching the file name."""
+        template_code = Path(f"{template_path}/{file_name}").read_text(encoding="UTF-8")
+        # substitute template parts
+        return Report._substitute_template_parts(template_code)
+
     @staticmethod
     def _substitute_template_parts(template_code):
         """Substitute template parts in main template.
@@ -1042,3 +1049,17 @@ class ReportMeta:  # pylint: disable=too-few-public-methods
             "metaSubject": "",
         },
     }
+
+
+def init_template_cache(app):
+    """Load the report templates into the template cache at app startup."""
+    with app.app_context():
+        template_path = app.config.get("REPORT_TEMPLATE_PATH")
+        for report_meta in ReportMeta.reports.values():
+            file_name: str = "{}.html".format(report_meta["fileName"])
+            if not Path(f"{template_path}/{file_name}").exists():
+                continue
+            try:
+                report_utils.TemplateCache.get_template(template_path, file_name, Report._load_template)
+            except Exception as err:  # noqa: B902; just logging
+                logger.error(f"Error loading report template {file_name}: " + str(err))
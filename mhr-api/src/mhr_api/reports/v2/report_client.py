@@ -0,0 +1,109 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+"""Shared report service HTTP client.
+
+Report service requests share a connection pool with keep-alive connections and a single retry policy, and record
+request latency and retry metrics.
+"""
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from mhr_api.utils.logging import logger
+
+RS_TIMEOUT = 1800.0
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class ReportClient:
+    """Report service client: one pooled session per process, configured from the app config in init_app."""
+
+    pool_size: int = 10
+    retries: int = 4
+    backoff_factor: float = 1.0
+    _session: requests.Session = None
+    _lock = threading.Lock()
+    _metrics: dict = {"requests": 0, "errors": 0, "retries": 0, "totalSeconds": 0.0, "maxSeconds": 0.0}
+
+    @staticmethod
+    def init_app(app):
+        """Set up the client connection pool size and retry policy."""
+        ReportClient.pool_size = int(app.config.get("REPORT_SVC_POOL_SIZE", ReportClient.pool_size))
+        ReportClient.retries = int(app.config.get("REPORT_SVC_RETRIES", ReportClient.retries))
+        ReportClient.backoff_factor = float(app.config.get("REPORT_SVC_BACKOFF", ReportClient.backoff_factor))
+        ReportClient._session = None
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Get the shared session, creating it on first use.
+
+        Report requests are POST requests: the retry policy allows retrying POST requests on a connection failure
+        or a bad gateway/unavailable response, as the report service is stateless. Read timeouts and read errors
+        are not retried: the report service may still be rendering the report.
+        """
+        with cls._lock:
+            if cls._session is None:
+                retry_strategy = Retry(
+                    total=cls.retries,
+                    read=0,
+                    backoff_factor=cls.backoff_factor,
+                    status_forcelist=RETRY_STATUS_CODES,
+                    allowed_methods=None,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=cls.pool_size, pool_maxsize=cls.pool_size, max_retries=retry_strategy
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                cls._session = session
+            return cls._session
+
+    @classmethod
+    def post(cls, url: str, headers: dict = None, data=None, files=None, timeout: float = RS_TIMEOUT):
+        """Post a report service request, recording the request latency and number of retries."""
+        start_time = time.perf_counter()
+        try:
+            response = cls.get_session().post(url=url, headers=headers, data=data, files=files, timeout=timeout)
+        except Exception:  # noqa: B902; record the error and re-raise
+            cls._record(time.perf_counter() - start_time, 0, True)
+            raise
+        elapsed: float = time.perf_counter() - start_time
+        retry_count: int = 0
+        retries = getattr(response.raw, "retries", None)
+        if retries and retries.history:
+            retry_count = len(retries.history)
+        cls._record(elapsed, retry_count, response.status_code >= 400)
+        logger.info(f"Report service {url} status={response.status_code} time={elapsed:.3f}s retries={retry_count}")
+        return response
+
+    @classmethod
+    def _record(cls, elapsed: float, retry_count: int, error: bool):
+        """Add a request to the client metrics."""
+        with cls._lock:
+            cls._metrics["requests"] += 1
+            cls._metrics["retries"] += retry_count
+            cls._metrics["totalSeconds"] += elapsed
+            cls._metrics["maxSeconds"] = max(cls._metrics["maxSeconds"], elapsed)
+            if error:
+                cls._metrics["errors"] += 1
+
+    @classmethod
+    def get_metrics(cls) -> dict:
+        """Get the report service request count, error count, retry count, and latency metrics."""
+        with cls._lock:
+            metrics = dict(cls._metrics)
+        metrics["averageSeconds"] = metrics["totalSeconds"] / metrics["requests"] if metrics["requests"] else 0.0
+        return metrics
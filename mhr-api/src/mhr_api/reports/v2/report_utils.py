@@ -10,13 +10,14 @@
 # specific language governing permissions and limitations under the License.
 """Helper/utility functions for report generation."""
 import copy
+import hashlib
 import io
 from pathlib import Path
 
 import pycountry
 import PyPDF2
 from flask import current_app
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template
 
 from mhr_api.models.type_tables import MhrDocumentTypes
 from mhr_api.utils.base import BaseEnum
@@ -67,6 +68,81 @@ class ReportTypes(BaseEnum):
     SEARCH_BODY_REPORT = "searchBody"
 
 
+class TemplateCache:  # pylint: disable=too-few-public-methods
+    """Process level cache of report templates with the template parts substituted.
+
+    Templates are keyed by the template path and report template file name. When REPORT_TEMPLATE_RELOAD is set
+    (development) a template is loaded again if a template file has been modified since it was cached.
+    """
+
+    templates: dict = {}
+
+    @classmethod
+    def get_template(cls, template_path: str, file_name: str, load_template) -> str:
+        """Get a cached template, using the load_template function to load it if not cached or modified."""
+        key: str = f"{template_path}/{file_name}"
+        modified: float = None
+        if current_app.config.get("REPORT_TEMPLATE_RELOAD"):
+            modified = get_template_modified(template_path, file_name)
+        cached = cls.templates.get(key)
+        if cached and cached[0] == modified:
+            return cached[1]
+        template_code: str = load_template(template_path, file_name)
+        cls.templates[key] = (modified, template_code)
+        logger.info(f"Loaded report template {key} into the template cache.")
+        return template_code
+
+
+def get_template_modified(template_path: str, file_name: str) -> float:
+    """Get the most recent modification time of a report template and the template parts."""
+    modified: float = Path(f"{template_path}/{file_name}").stat().st_mtime
+    for part_path in Path(f"{template_path}/template-parts").rglob("*.html"):
+        modified = max(modified, part_path.stat().st_mtime)
+    return modified
+
+
+class TemplateEnvironment:
+    """Process level Jinja environment that compiles each report template source once.
+
+    Template sources from the template cache are loaded by a name that is a digest of the source, so a template
+    reloaded because it was modified is compiled again. Compiled templates are kept in the environment cache, and the
+    template bytecode is cached in REPORT_TEMPLATE_BYTECODE_CACHE_DIR (the system temp directory if not set) so a new
+    process skips compiling.
+    """
+
+    environment: Environment = None
+    names: dict = {}
+    sources: dict = {}
+
+    @classmethod
+    def get_environment(cls) -> Environment:
+        """Get the shared environment, creating it on first use."""
+        if not cls.environment:
+            bytecode_cache = None
+            cache_dir: str = current_app.config.get("REPORT_TEMPLATE_BYTECODE_CACHE_DIR")
+            try:
+                bytecode_cache = FileSystemBytecodeCache(cache_dir or None)
+            except Exception as err:  # noqa: B902; just logging
+                logger.error(f"Report template bytecode cache unavailable dir={cache_dir}: " + str(err))
+            cls.environment = Environment(
+                loader=FunctionLoader(cls.sources.get),
+                bytecode_cache=bytecode_cache,
+                autoescape=True,
+                auto_reload=False,
+            )
+        return cls.environment
+
+    @classmethod
+    def get_template(cls, source: str) -> Template:
+        """Get the compiled template for the template source, compiling it if not cached."""
+        name: str = cls.names.get(source)
+        if not name:
+            name = hashlib.sha256(source.encode("UTF-8")).hexdigest()
+            cls.sources[name] = source
+            cls.names[source] = name
+        return cls.get_environment().get_template(name)
+
+
 class Config:  # pylint: disable=too-few-public-methods
     """Configuration that loads report template static data."""
 
@@ -364,11 +440,27 @@ def get_report_files(  # pylint: disable=too-many-branches
 
 def get_html_from_data(request_data) -> str:
     """Get html by merging the template with the report data."""
-    template_ = Template(request_data["template"], autoescape=True)
+    template_ = TemplateEnvironment.get_template(request_data["template"])
     html_output = template_.render(request_data["templateVars"])
     return html_output
 
 
+def get_destination_pages(pdf_reader) -> dict:
+    """Get the page index of every named destination in the pdf in one pass.
+
+    The report service creates a named destination for each report link target, so the registration anchors linked
+    from the search report TOC map registration numbers to pages without extracting the page text.
+    """
+    try:
+        return {
+            str(name).lstrip("/"): pdf_reader.get_destination_page_number(destination)
+            for name, destination in pdf_reader.named_destinations.items()
+        }
+    except Exception as err:  # noqa: B902; fall back to page text extraction
+        logger.warning(f"Report pdf named destinations unavailable: {err}")
+    return {}
+
+
 def update_toc_page_numbers(json_data, reg_pdf_data):
     """Try and update toc page numbers from the registration pdf."""
     if json_data["totalResultsSize"] > 0:
@@ -377,9 +469,18 @@ def update_toc_page_numbers(json_data, reg_pdf_data):
         json_data["totalPageCount"] = pagecount
         page_index = 0
         logger.info(f" TOC totalPageCount={pagecount}")
+        dest_pages: dict = get_destination_pages(bodypdf)
+        text_count: int = 0
         for select in json_data["selected"]:
             if not select.get("duplicate", False):
                 reg_text = REG_PAGE_PREFIX + select["mhrNumber"]
+                dest_index: int = dest_pages.get(select["mhrNumber"], -1)
+                if dest_index >= 0:
+                    page_index = dest_index + 1
+                    select["pageNumber"] = dest_index + 1
+                    continue
+                # Not a named destination: fall back to scanning the page text.
+                text_count += 1
                 # logger.info(f'start page index={page_index} reg_text={reg_text}')
                 for i in range(page_index, pagecount):
                     page = bodypdf.pages[i]
@@ -389,6 +490,7 @@ def update_toc_page_numbers(json_data, reg_pdf_data):
                         page_index = i + 1
                         select["pageNumber"] = i + 1
                         break
+        logger.info(f"TOC page numbers set: {text_count} found by page text.")
     return json_data
 
 
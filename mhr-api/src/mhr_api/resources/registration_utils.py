@@ -525,7 +525,7 @@ def enqueue_registration_report(
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_registration_report(payload)
-        logger.info(f"Enqueue registration report successful for id={registration.id}.")
+        logger.info(f"Registration report queued for id={registration.id}.")
         if (
             json_data.get("usergroup") == STAFF_ROLE or registration.account_id == STAFF_ROLE
         ) and current_app.config.get("DOC_CREATE_REC_TOPIC"):
@@ -655,7 +655,7 @@ def get_registration_report(  # pylint: disable=too-many-return-statements,too-m
             return raw_data, response_status, headers
 
         # Edge case: too large to generate in real time.
-        results_length = len(json.dumps(report_data))
+        results_length = model_utils.json_size(report_data, current_app.config.get("MAX_SIZE_SEARCH_RT"))
         if results_length > current_app.config.get("MAX_SIZE_SEARCH_RT"):
             logger.info(f"Registration {registration_id} queued, size too large: {results_length}.")
             enqueue_registration_report(registration, report_data, report_type)
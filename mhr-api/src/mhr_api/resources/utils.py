@@ -15,13 +15,14 @@
 from enum import Enum
 from http import HTTPStatus
 
-from flask import current_app, jsonify, request
+from flask import Response, current_app, jsonify, request, stream_with_context
 
 from mhr_api.exceptions import ResourceErrorCodes
 from mhr_api.models import registration_utils as reg_utils
 from mhr_api.models import utils as model_utils
 from mhr_api.models.registration_utils import AccountRegistrationParams
 from mhr_api.services.authz import is_bcol_help, is_reg_staff_account, is_sbc_office_account, user_orgs
+from mhr_api.services.document_storage.storage_service import GoogleStorageService
 from mhr_api.services.payment.exceptions import SBCPaymentException
 from mhr_api.utils import admin_validator, manufacturer_validator, note_validator, registration_validator
 from mhr_api.utils.logging import logger
@@ -99,6 +100,39 @@ def is_pdf(req):
     return accept and accept.upper() == "APPLICATION/PDF"
 
 
+def get_byte_range(req, size: int):
+    """Get the inclusive start, end byte range and response status of a request for a document of size bytes.
+
+    A missing or multiple range request header is the whole document. An unsatisfiable range is (None, None, 416).
+    """
+    byte_range = req.range
+    if not byte_range or byte_range.units != "bytes" or len(byte_range.ranges) != 1:
+        return 0, size - 1, HTTPStatus.OK
+    satisfiable = byte_range.range_for_length(size)
+    if not satisfiable:
+        return None, None, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    return satisfiable[0], satisfiable[1] - 1, HTTPStatus.PARTIAL_CONTENT
+
+
+def stored_pdf_response(req, doc_name: str, doc_type: str = None):
+    """Stream a PDF document from storage to the response, honouring a single byte range request header."""
+    size: int = GoogleStorageService.get_document_size(doc_name, doc_type)
+    start, end, status = get_byte_range(req, size)
+    if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        return Response(status=status, headers={"Content-Range": f"bytes */{size}"})
+    logger.info(f"Streaming {doc_name} size={size} bytes {start}-{end}.")
+    resp = Response(
+        stream_with_context(GoogleStorageService.stream_document(doc_name, doc_type, start, end)),
+        status=status,
+        mimetype="application/pdf",
+    )
+    resp.headers["Accept-Ranges"] = "bytes"
+    resp.headers["Content-Length"] = str(end - start + 1)
+    if status == HTTPStatus.PARTIAL_CONTENT:
+        resp.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return resp
+
+
 def get_apikey(req):
     """Get gateway api key from request headers or parameter."""
     key = req.headers.get("x-apikey")
@@ -168,7 +168,7 @@ def enqueue_search_report(search_id: str):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_search_report(payload)
-        logger.info(f"Enqueue search report successful for id={search_id}.")
+        logger.info(f"Search report queued for id={search_id}.")
     except Exception as err:  # noqa: B902; do not alter app processing
         logger.error(f"Enqueue search report failed for id={search_id}: " + str(err))
         EventTracking.create(
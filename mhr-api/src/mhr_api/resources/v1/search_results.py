@@ -218,8 +218,7 @@ def get_search_results(search_id: str):  # pylint: disable=too-many-branches
             # If the request is for a report, fetch binary data from doc storage.
             doc_name = search_detail.doc_storage_url
             logger.info(f"Fetching search report {doc_name} from doc storage.")
-            raw_data = GoogleStorageService.get_document(doc_name)
-            return raw_data, HTTPStatus.OK, {"Content-Type": "application/pdf"}
+            return resource_utils.stored_pdf_response(request, doc_name)
 
         response_data = search_detail.json
         response_data["reportAvailable"] = search_detail.doc_storage_url is not None
@@ -393,7 +392,7 @@ def enqueue_search_report(search_id: str):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_search_report(payload)
-        logger.info(f"Enqueue search report successful for id={search_id}.")
+        logger.info(f"Search report queued for id={search_id}.")
     except Exception as err:  # noqa: B902; do not alter app processing
         logger.error(f"Enqueue search report failed for id={search_id}: " + str(err))
         EventTracking.create(
@@ -13,10 +13,14 @@
 # limitations under the License.
 """This class is a wrapper for document storage API calls."""
 import datetime
+import threading
 
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
 from mhr_api.services.abstract_storage_service import DocumentTypes, StorageService
+from mhr_api.services.document_storage.local_storage import LocalStorageClient
 from mhr_api.services.gcp_auth.auth_service import GoogleAuthService
 from mhr_api.services.utils.exceptions import StorageException
 from mhr_api.utils.logging import logger
@@ -25,6 +29,7 @@ HTTP_DELETE = "delete"
 HTTP_GET = "get"
 HTTP_POST = "post"
 CONTENT_TYPE_PDF = "application/pdf"
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-methods
@@ -38,6 +43,12 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
     GCP_BUCKET_ID_REGISTRATION = None
     GCP_BUCKET_ID_BATCH = None
     GCP_BUCKET_ID_TERMS = None
+    # Process wide storage client and bucket handles, created on first use.
+    STORAGE_CLIENT = None
+    STORAGE_BUCKETS = {}
+    STORAGE_LOCAL_PATH = None
+    STORAGE_POOL_SIZE = 10
+    STORAGE_LOCK = threading.Lock()
 
     @staticmethod
     def init_app(app):
@@ -46,6 +57,10 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
         GoogleStorageService.GCP_BUCKET_ID_REGISTRATION = app.config.get("GCP_CS_BUCKET_ID_REGISTRATION")
         GoogleStorageService.GCP_BUCKET_ID_BATCH = app.config.get("GCP_CS_BUCKET_ID_BATCH")
         GoogleStorageService.GCP_BUCKET_ID_TERMS = app.config.get("GCP_CS_BUCKET_ID_TERMS")
+        GoogleStorageService.STORAGE_LOCAL_PATH = app.config.get("GCP_CS_LOCAL_PATH")
+        GoogleStorageService.STORAGE_POOL_SIZE = app.config.get("GCP_CS_POOL_SIZE", 10)
+        GoogleStorageService.STORAGE_CLIENT = None
+        GoogleStorageService.STORAGE_BUCKETS = {}
 
     @classmethod
     def get_document(cls, name: str, doc_type: str = None):
@@ -60,6 +75,40 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
             logger.error(str(err))
             raise StorageException(f"GET document failed for doc type={doc_type}, name={name}.") from err
 
+    @classmethod
+    def get_document_size(cls, name: str, doc_type: str = None) -> int:
+        """Fetch the size in bytes of the uniquely named document in cloud storage."""
+        try:
+            logger.info(f"Fetching size doc type={doc_type}, name={name}.")
+            blob = cls.__get_bucket(doc_type).get_blob(name)
+            if blob is None:
+                raise StorageException(f"GET document failed: no doc type={doc_type}, name={name}.")
+            return blob.size
+        except StorageException as storage_err:
+            raise storage_err
+        except Exception as err:  # pylint: disable=broad-except # noqa F841;
+            logger.error(f"get_document_size failed for doc type={doc_type}, name={name}.")
+            logger.error(str(err))
+            raise StorageException(f"GET document failed for doc type={doc_type}, name={name}.") from err
+
+    @classmethod
+    def stream_document(cls, name: str, doc_type: str = None, start: int = 0, end: int = None):
+        """Generate the uniquely named document binary data in chunks, limited to the inclusive byte range.
+
+        Only one chunk at a time is held in memory, regardless of the document size.
+        """
+        blob = cls.__get_bucket(doc_type).blob(name)
+        with blob.open("rb", chunk_size=STREAM_CHUNK_SIZE) as reader:
+            reader.seek(start)
+            remaining: int = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                buf = reader.read(STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining))
+                if not buf:
+                    break
+                if remaining is not None:
+                    remaining -= len(buf)
+                yield buf
+
     @classmethod
     def get_document_link(cls, name: str, doc_type: str = None, available_days: int = 1):
         """Fetch the uniquely named document from cloud storage as a time-limited download link."""
@@ -126,13 +175,43 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
             return cls.GCP_BUCKET_ID_TERMS
         return cls.GCP_BUCKET_ID
 
+    @classmethod
+    def get_client(cls):
+        """Get the process wide storage client, creating it on first use.
+
+        The client shares a connection pool across requests and refreshes its credentials in the background before
+        they expire. If GCP_CS_LOCAL_PATH is set the client is a local filesystem stand-in.
+        """
+        with cls.STORAGE_LOCK:
+            if cls.STORAGE_CLIENT is None:
+                if cls.STORAGE_LOCAL_PATH:
+                    logger.info(f"Using local document storage path={cls.STORAGE_LOCAL_PATH}.")
+                    cls.STORAGE_CLIENT = LocalStorageClient(cls.STORAGE_LOCAL_PATH)
+                else:
+                    credentials = GoogleAuthService.get_credentials()
+                    credentials.with_non_blocking_refresh()
+                    http = AuthorizedSession(credentials)
+                    http.mount(
+                        "https://",
+                        HTTPAdapter(pool_connections=cls.STORAGE_POOL_SIZE, pool_maxsize=cls.STORAGE_POOL_SIZE),
+                    )
+                    cls.STORAGE_CLIENT = storage.Client(credentials=credentials, _http=http)
+            return cls.STORAGE_CLIENT
+
+    @classmethod
+    def __get_bucket(cls, doc_type: str = None):
+        """Get the cached Cloud Storage bucket handle for the document type."""
+        bucket_id = cls.__get_bucket_id(doc_type)
+        bucket = cls.STORAGE_BUCKETS.get(bucket_id)
+        if bucket is None:
+            bucket = cls.get_client().bucket(bucket_id)
+            cls.STORAGE_BUCKETS[bucket_id] = bucket
+        return bucket
+
     @classmethod
     def __call_cs_api(cls, method: str, name: str, data=None, doc_type: str = None):
         """Call the Cloud Storage API."""
-        credentials = GoogleAuthService.get_credentials()
-        storage_client = storage.Client(credentials=credentials)
-        bucket = storage_client.bucket(cls.__get_bucket_id(doc_type))
-        blob = bucket.blob(name)
+        blob = cls.__get_bucket(doc_type).blob(name)
         if method == HTTP_POST:
             blob.upload_from_string(data=data, content_type=CONTENT_TYPE_PDF)
             return blob.time_created
@@ -147,10 +226,7 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
     @classmethod
     def __call_cs_api_link(cls, name: str, data=None, doc_type: str = None, available_days: int = 1):
         """Call the Cloud Storage API, returning a time-limited download link."""
-        credentials = GoogleAuthService.get_credentials()
-        storage_client = storage.Client(credentials=credentials)
-        bucket = storage_client.bucket(cls.__get_bucket_id(doc_type))
-        blob = bucket.blob(name)
+        blob = cls.__get_bucket(doc_type).blob(name)
         if data:
             blob.upload_from_string(data=data, content_type=CONTENT_TYPE_PDF)
         url = blob.generate_signed_url(
@@ -12,7 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This class enqueues messages for the PPR API asynchronous events."""
+import atexit
 import json
+import threading
+from concurrent import futures
+from http import HTTPStatus
 
 from google.cloud import pubsub_v1
 
@@ -27,6 +31,12 @@ class GoogleQueueService:
     """
 
     publisher = None
+    app = None
+    # Async mode: publish returns without waiting for the result, which is handled by a completion callback.
+    publish_async = False
+    flush_timeout = 10
+    pending = set()
+    pending_lock = threading.Lock()
     search_report_topic_name = None
     registration_report_topic_name = None
     doc_create_record_topic_name = None
@@ -35,7 +45,17 @@ class GoogleQueueService:
     def init_app(app):
         """Initialize the publisher."""
         credentials = GoogleAuthService.get_credentials()
-        GoogleQueueService.publisher = pubsub_v1.PublisherClient(credentials=credentials)
+        batch_settings = pubsub_v1.types.BatchSettings(
+            max_messages=app.config.get("GCP_PS_BATCH_MAX_MESSAGES", 100),
+            max_latency=app.config.get("GCP_PS_BATCH_MAX_LATENCY", 0.01),
+        )
+        GoogleQueueService.publisher = pubsub_v1.PublisherClient(batch_settings, credentials=credentials)
+        GoogleQueueService.app = app
+        GoogleQueueService.publish_async = app.config.get("GCP_PS_PUBLISH_ASYNC", False)
+        GoogleQueueService.flush_timeout = app.config.get("GCP_PS_FLUSH_TIMEOUT", 10)
+        if GoogleQueueService.publish_async:
+            atexit.unregister(GoogleQueueService.flush)
+            atexit.register(GoogleQueueService.flush)
         project_id = str(app.config.get("GCP_PS_PROJECT_ID"))
         search_report_topic = str(app.config.get("GCP_PS_SEARCH_REPORT_TOPIC"))
         registration_report_topic = str(app.config.get("GCP_PS_REGISTRATION_REPORT_TOPIC"))
@@ -46,7 +66,7 @@ class GoogleQueueService:
     def publish_search_report(self, payload):
         """Publish the search report request json payload to the Queue Service."""
         try:
-            self.publish(GoogleQueueService.search_report_topic_name, payload)
+            self.publish(GoogleQueueService.search_report_topic_name, payload, "SEARCH_REPORT", payload.get("searchId"))
         except Exception as err:  # pylint: disable=broad-except # noqa F841;
             logger.error("Error publish_search_report: " + str(err))
             raise err
@@ -54,7 +74,12 @@ class GoogleQueueService:
     def publish_registration_report(self, payload):
         """Publish the API registration verification request json payload to the Queue Service."""
         try:
-            self.publish(GoogleQueueService.registration_report_topic_name, payload)
+            self.publish(
+                GoogleQueueService.registration_report_topic_name,
+                payload,
+                "MHR_REG_REPORT",
+                payload.get("registrationId"),
+            )
         except Exception as err:  # pylint: disable=broad-except # noqa F841;
             logger.error("Error publish_registration_report: " + str(err))
             raise err
@@ -70,9 +95,53 @@ class GoogleQueueService:
             logger.error("Error publish_create_doc_record: " + str(err))
             raise err
 
-    def publish(self, topic_name, payload_json):
-        """Publish the payload to the specified topic."""
+    def publish(self, topic_name, payload_json, event_type: str = None, key_id=None):
+        """Publish the payload to the specified topic.
+
+        In async mode return without waiting for the publish result: a failure is logged and recorded as an event
+        tracking record of the event type for the key id by the completion callback.
+        """
         payload = json.dumps(payload_json).encode("utf-8")
         logger.info("Publishing topic=" + topic_name + ", payload=" + json.dumps(payload_json))
         future = GoogleQueueService.publisher.publish(topic_name, payload)
-        future.result()
+        if not GoogleQueueService.publish_async:
+            future.result()
+            return
+        with GoogleQueueService.pending_lock:
+            GoogleQueueService.pending.add(future)
+        future.add_done_callback(lambda done: GoogleQueueService.publish_done(done, topic_name, event_type, key_id))
+
+    @staticmethod
+    def publish_done(future, topic_name: str, event_type: str = None, key_id=None):
+        """Async publish completion callback: log the result and record a failed publish as an event tracking record."""
+        with GoogleQueueService.pending_lock:
+            GoogleQueueService.pending.discard(future)
+        err = future.exception()
+        if err is None:
+            logger.info(f"Enqueue {event_type} event successful for id={key_id}.")
+            return
+        msg: str = f"Enqueue {event_type} event failed for id={key_id}, topic={topic_name}: {err}"
+        logger.error(msg)
+        if not event_type or key_id is None or GoogleQueueService.app is None:
+            return
+        try:
+            # Imported here: the models import the services package.
+            from mhr_api.models import EventTracking  # pylint: disable=import-outside-toplevel
+
+            with GoogleQueueService.app.app_context():
+                EventTracking.create(key_id, event_type, int(HTTPStatus.INTERNAL_SERVER_ERROR), msg)
+        except Exception as tracking_err:  # noqa: B902; runs in the publisher thread
+            logger.error(f"Publish failure event tracking failed for id={key_id}: {tracking_err}")
+
+    @staticmethod
+    def flush(timeout: float = None):
+        """Send any batched messages and wait for outstanding async publishes to complete, on worker shutdown."""
+        with GoogleQueueService.pending_lock:
+            pending = list(GoogleQueueService.pending)
+        if not pending or not GoogleQueueService.publisher:
+            return
+        logger.info(f"Flushing {len(pending)} pending queue messages.")
+        GoogleQueueService.publisher.stop()
+        _, not_done = futures.wait(pending, timeout=timeout or GoogleQueueService.flush_timeout)
+        if not_done:
+            logger.error(f"Queue flush timed out with {len(not_done)} messages not published.")
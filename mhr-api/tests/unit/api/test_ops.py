@@ -37,3 +37,16 @@ def test_ready_check_v1(session, client, jwt):
     rv = client.get('/api/v1/ops/readyz')
     # check
     assert rv.status_code == HTTPStatus.OK
+
+
+def test_metrics_v1(session, client, jwt):
+    """Assert that the metrics endpoint returns the report service client metrics."""
+    # no setup
+
+    # test
+    rv = client.get('/api/v1/ops/metrics')
+    # check
+    assert rv.status_code == HTTPStatus.OK
+    assert 'requests' in rv.json['reportService']
+    assert 'retries' in rv.json['reportService']
+    assert 'authCache' in rv.json
@@ -499,3 +499,43 @@ def test_search_notes(session, mhr_num, has_notes, ncan_doc_id):
             assert has_ncan
     else:
         assert not reg_json.get('notes')
+
+
+def test_search_selection_duplicates():
+    """Assert that the search selection combines duplicate MHR number matches and keeps the selection order."""
+    original_results = [
+        {'mhrNumber': '000900', 'serialNumber': '1001'},
+        {'mhrNumber': '000901', 'serialNumber': '1002'},
+        {'mhrNumber': '000900', 'serialNumber': '1003'},
+        {'mhrNumber': '000902', 'serialNumber': '1004'}
+    ]
+    select_data = [
+        {'mhrNumber': '000902'},
+        {'mhrNumber': '000900'},
+        {'mhrNumber': '000902'},
+        {'mhrNumber': '000900', 'includeLienInfo': True}
+    ]
+    search_result: SearchResult = SearchResult()
+    search_result.search = SearchRequest(search_response=original_results,
+                                         search_type=SearchRequest.SearchTypes.MANUFACTURED_HOME_NUM)
+    search_result.set_search_selection(select_data)
+    selection = search_result.search_select
+    assert [match['mhrNumber'] for match in selection] == ['000902', '000900']
+    assert 'extraMatches' not in selection[0]
+    assert not selection[0].get('includeLienInfo')
+    assert selection[1]['serialNumber'] == '1001'
+    assert selection[1]['includeLienInfo']
+    assert [match['serialNumber'] for match in selection[1]['extraMatches']] == ['1003']
+
+
+def test_build_details_duplicates(session):
+    """Assert that building the search details removes duplicate MHR numbers and keeps the selection order."""
+    search_result: SearchResult = SearchResult()
+    search_result.search_select = [
+        {'mhrNumber': '000901', 'mhId': 200000002},
+        {'mhrNumber': '000900', 'mhId': 200000001},
+        {'mhrNumber': '000901', 'mhId': 200000002},
+        {'mhrNumber': '000902', 'mhId': 200000003, 'selected': False}
+    ]
+    details = search_result.build_details()
+    assert [detail['mhrNumber'] for detail in details] == ['000901', '000900']
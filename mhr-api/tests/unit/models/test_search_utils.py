@@ -0,0 +1,103 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the search utils search response cache.
+
+Test-Suite to ensure that the search response cache keys and invalidation are working as expected.
+"""
+import pytest
+from flask import current_app
+
+from mhr_api.models import MhrParty, MhrRegistration, SearchRequest, search_utils
+
+
+# testdata pattern is ({description}, {search_type1}, {criteria1}, {wildcard1}, {search_type2}, {criteria2},
+# {wildcard2}, {same_key})
+TEST_DATA_CACHE_KEY = [
+    ('Same criteria', 'MM', {'value': '022911'}, False, 'MM', {'value': '022911'}, False, True),
+    ('Spaces', 'MM', {'value': ' 022911 '}, False, 'MM', {'value': '022911'}, False, True),
+    ('Key order', 'MI', {'ownerName': {'last': 'BOB', 'first': 'JOHN'}}, False, 'MI',
+     {'ownerName': {'first': 'JOHN', 'last': 'BOB'}}, False, True),
+    ('Owner name case', 'MI', {'ownerName': {'last': 'Bob', 'first': 'john'}}, False, 'MI',
+     {'ownerName': {'last': 'BOB', 'first': 'JOHN'}}, False, True),
+    ('Organization name case', 'MO', {'value': 'Real Engineered Homes Inc'}, False, 'MO',
+     {'value': 'REAL ENGINEERED HOMES INC'}, False, True),
+    ('Serial case', 'MS', {'value': '52d70556'}, False, 'MS', {'value': '52D70556'}, False, True),
+    ('Wildcard serial case', 'MS', {'value': '52d'}, True, 'MS', {'value': '52D'}, True, False),
+    ('Wildcard search', 'MS', {'value': '52D70556'}, False, 'MS', {'value': '52D70556'}, True, False),
+    ('Different criteria', 'MM', {'value': '022911'}, False, 'MM', {'value': '022912'}, False, False),
+    ('Different name', 'MI', {'ownerName': {'last': 'BOB', 'first': 'JOHN'}}, False, 'MI',
+     {'ownerName': {'last': 'BOB', 'first': 'JON'}}, False, False),
+    ('Serial and MHR number type', 'MS', {'value': '022911'}, False, 'MM', {'value': '022911'}, False, False),
+    ('Organization and serial type', 'MO', {'value': 'TEST'}, False, 'MS', {'value': 'TEST'}, False, False),
+]
+# testdata pattern is ({description}, {model_class}, {rollback}, {cleared})
+TEST_DATA_CACHE_INVALIDATE = [
+    ('New registration', MhrRegistration, False, True),
+    ('New owner', MhrParty, False, True),
+    ('New registration rolled back', MhrRegistration, True, False),
+    ('New search request', SearchRequest, False, False),
+]
+
+
+class SessionStub:
+    """Database session stub with the instances changed by a flush."""
+
+    def __init__(self, new):
+        """Set the new instances."""
+        self.info = {}
+        self.new = new
+        self.dirty = []
+        self.deleted = []
+
+
+@pytest.mark.parametrize('desc,search_type1,criteria1,wildcard1,search_type2,criteria2,wildcard2,same_key',
+                         TEST_DATA_CACHE_KEY)
+def test_search_cache_key(session, monkeypatch, desc, search_type1, criteria1, wildcard1, search_type2, criteria2,
+                          wildcard2, same_key):
+    """Assert that search response cache keys are the same only for equivalent search criteria."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', True)
+    key1 = search_utils.search_cache_key(search_type1, {'criteria': criteria1, 'wildcardSearch': wildcard1})
+    key2 = search_utils.search_cache_key(search_type2, {'criteria': criteria2, 'wildcardSearch': wildcard2})
+    assert key1
+    assert key2
+    assert (key1 == key2) == same_key
+
+
+def test_search_cache_key_disabled(session, monkeypatch):
+    """Assert that there is no search response cache key when search caching is disabled."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', False)
+    assert search_utils.search_cache_key('MM', {'criteria': {'value': '022911'}}) is None
+
+
+@pytest.mark.parametrize('desc,model_class,rollback,cleared', TEST_DATA_CACHE_INVALIDATE)
+def test_search_cache_invalidate(session, monkeypatch, desc, model_class, rollback, cleared):
+    """Assert that a committed change to a search table clears the search response cache."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', True)
+    monkeypatch.setattr(search_utils, '_search_cache', None)
+    cache_key = search_utils.search_cache_key('MM', {'criteria': {'value': '022911'}})
+    search_response = [{'mhrNumber': '022911', 'status': 'ACTIVE'}]
+    search_utils.set_cached_search(cache_key, search_response, 1, 1)
+    db_session = SessionStub([model_class()])
+    # test
+    search_utils._search_cache_after_flush(db_session, None)
+    if rollback:
+        search_utils._search_cache_after_rollback(db_session)
+    search_utils._search_cache_after_commit(db_session)
+    # check
+    cached = search_utils.get_cached_search(cache_key)
+    if cleared:
+        assert cached is None
+    else:
+        assert cached == (search_response, 1, 1)
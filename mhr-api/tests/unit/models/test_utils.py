@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Test Suite to ensure the model utility functions are working as expected."""
+import json
 from datetime import timedelta as _timedelta
 
 import pytest
@@ -135,3 +136,22 @@ def test_ts_from_iso_format_no_tz(session, registration_ts, expected_ts):
         reg_ts = model_utils.ts_from_iso_format(registration_ts)
         test_ts = model_utils.format_ts(reg_ts)
         assert test_ts == expected_ts
+
+
+def test_json_size():
+    """Assert that measuring the serialized json size of data works as expected."""
+    data = {
+        'searchQuery': {'type': 'SERIAL_NUMBER', 'criteria': {'value': 'JU622994'}},
+        'details': [{'matchType': 'EXACT', 'baseRegistrationNumber': 'TEST0001', 'year': 2004, 'amount': 10.5,
+                     'names': ['ONE', 'TWO'], 'expired': False, 'note': None}] * 20,
+        'empty': [],
+        'totalResultsSize': 20
+    }
+    # test
+    assert model_utils.json_size(data) == len(json.dumps(data))
+    assert model_utils.json_size(data['details']) == len(json.dumps(data['details']))
+    assert model_utils.json_size([]) == len(json.dumps([]))
+    # Stops early once max size is exceeded.
+    size = model_utils.json_size(data, 500)
+    assert size > 500
+    assert size < len(json.dumps(data))
@@ -0,0 +1,88 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to verify the report service client retry policy.
+
+Test-Suite to ensure that report service requests are only retried on connection failures and the retry status codes.
+"""
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from mhr_api.reports.v2.report_client import ReportClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Respond to each POST with the next configured (delay, status) response."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Count the request, then delay and respond."""
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with self.server.lock:
+            index = min(self.server.request_count, len(self.server.responses) - 1)
+            self.server.request_count += 1
+        delay, status = self.server.responses[index]
+        time.sleep(delay)
+        try:
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        except OSError:  # The client timed out and closed the connection.
+            pass
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Skip request logging."""
+
+
+@pytest.fixture
+def stub_server():
+    """Run a local report service stand-in, resetting the shared client session around the test."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.responses = [(0, HTTPStatus.OK)]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    backoff_factor = ReportClient.backoff_factor
+    ReportClient.backoff_factor = 0
+    ReportClient._session = None  # pylint: disable=protected-access
+    yield server
+    ReportClient.backoff_factor = backoff_factor
+    ReportClient._session = None  # pylint: disable=protected-access
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_timeout_not_retried(stub_server):
+    """Assert that a report service request that times out waiting for the response is not sent again."""
+    stub_server.responses = [(1.0, HTTPStatus.OK)]
+    url = f'http://127.0.0.1:{stub_server.server_address[1]}/convert/html'
+    with pytest.raises(requests.exceptions.RequestException):
+        ReportClient.post(url, data=b'{}', timeout=0.2)
+    time.sleep(0.5)
+    assert stub_server.request_count == 1
+
+
+def test_status_retried(stub_server):
+    """Assert that a report service request is retried on an unavailable response."""
+    stub_server.responses = [(0, HTTPStatus.SERVICE_UNAVAILABLE), (0, HTTPStatus.OK)]
+    url = f'http://127.0.0.1:{stub_server.server_address[1]}/convert/html'
+    response = ReportClient.post(url, data=b'{}', timeout=5)
+    assert response.status_code == HTTPStatus.OK
+    assert stub_server.request_count == 2
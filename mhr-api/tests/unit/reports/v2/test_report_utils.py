@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Report helper function tests."""
+import io
 import json
 
+import PyPDF2
 from flask import current_app
 # import pytest
 
@@ -68,6 +70,42 @@ def test_get_html_from_data(session):
     current_app.logger.info('html_data length=' + str(len(html_data)))
 
 
+def test_update_toc_page_numbers_destinations(session):
+    """Assert that search report TOC page numbers are set from the pdf named destinations."""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(4):
+        writer.add_blank_page(612, 792)
+    writer.add_named_destination('001234', 1)
+    writer.add_named_destination('001235', 3)
+    pdf_buffer = io.BytesIO()
+    writer.write(pdf_buffer)
+    json_data = {
+        'totalResultsSize': 3,
+        'selected': [
+            {'mhrNumber': '001234'},
+            {'mhrNumber': '001234', 'duplicate': True},
+            {'mhrNumber': '001235'}
+        ]
+    }
+    json_data = report_utils.update_toc_page_numbers(json_data, pdf_buffer.getvalue())
+    assert json_data['totalPageCount'] == 4
+    assert json_data['selected'][0]['pageNumber'] == 2
+    assert not json_data['selected'][1].get('pageNumber')
+    assert json_data['selected'][2]['pageNumber'] == 4
+
+
+def test_template_environment(session):
+    """Assert that a report template source is compiled once and rendered with autoescaping."""
+    json_data = get_json_from_file(SEARCH_RESULT_MHR_DATAFILE)
+    report = Report(json_data, 'PS12345', ReportTypes.SEARCH_DETAIL_REPORT, 'Account Name')
+    request_data = report._setup_report_data()
+    template1 = report_utils.TemplateEnvironment.get_template(request_data['template'])
+    template2 = report_utils.TemplateEnvironment.get_template(request_data['template'])
+    assert template1 is template2
+    request_data = {'template': '<p>{{ name }}</p>', 'templateVars': {'name': '<b>TEST</b>'}}
+    assert report_utils.get_html_from_data(request_data) == '<p>&lt;b&gt;TEST&lt;/b&gt;</p>'
+
+
 def test_get_report_files(session):
     """Assert that getting the report source files from report data works as expected."""
     json_data = get_json_from_file(SEARCH_RESULT_MHR_DATAFILE)
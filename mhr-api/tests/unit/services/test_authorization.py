@@ -89,3 +89,33 @@ def test_bcol_helpdesk_account(session, desc, account_id, valid):
     result = authz.is_bcol_help(account_id)
     # check
     assert result == valid
+
+
+def test_auth_cache_key(session):
+    """Assert that auth api cache keys are unique per token and account and do not contain the token."""
+    # test
+    key1 = authz.auth_cache_key('account_org', 'token1', '1234')
+    key2 = authz.auth_cache_key('account_org', 'token2', '1234')
+    key3 = authz.auth_cache_key('account_org', 'token1', '2518')
+    # check
+    assert key1 == authz.auth_cache_key('account_org', 'token1', '1234')
+    assert key1 != key2
+    assert key1 != key3
+    assert 'token1' not in key1
+
+
+def test_auth_cache_copy(session, monkeypatch):
+    """Assert that cached auth api responses are returned as copies that callers cannot change."""
+    monkeypatch.setitem(current_app.config, 'AUTH_CACHE_ENABLED', True)
+    monkeypatch.setattr(authz, '_auth_cache', None)
+    response = {'orgs': [{'id': 1234, 'branchName': 'Branch 1'}]}
+    cache_key = authz.auth_cache_key('user_orgs', 'token1')
+    # test
+    authz.set_cached(cache_key, response)
+    response['orgs'].append({'id': 2518})
+    cached = authz.get_cached(cache_key)
+    cached['orgs'][0]['branchName'] = 'Updated'
+    # check
+    cached = authz.get_cached(cache_key)
+    assert len(cached['orgs']) == 1
+    assert cached['orgs'][0]['branchName'] == 'Branch 1'
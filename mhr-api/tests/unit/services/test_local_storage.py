@@ -0,0 +1,58 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local filesystem document storage tests."""
+import pytest
+
+from mhr_api.services.document_storage.local_storage import LocalStorageClient
+from mhr_api.services.document_storage.storage_service import GoogleStorageService
+
+
+TEST_DOC_NAME = '2024/01/02/search-results-report-ut-local.pdf'
+TEST_DATA = b'%PDF-1.4 local storage test data' * 1000
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    """Use a local directory for document storage for the duration of a test."""
+    client = GoogleStorageService.STORAGE_CLIENT
+    buckets = GoogleStorageService.STORAGE_BUCKETS
+    GoogleStorageService.STORAGE_CLIENT = LocalStorageClient(str(tmp_path))
+    GoogleStorageService.STORAGE_BUCKETS = {}
+    yield tmp_path
+    GoogleStorageService.STORAGE_CLIENT = client
+    GoogleStorageService.STORAGE_BUCKETS = buckets
+
+
+def test_local_save_get_document(session, local_storage):
+    """Assert that saving and getting a document with local storage works as expected."""
+    # test
+    response = GoogleStorageService.save_document(TEST_DOC_NAME, TEST_DATA)
+    raw_data = GoogleStorageService.get_document(TEST_DOC_NAME)
+    # check
+    assert response
+    assert raw_data == TEST_DATA
+    assert GoogleStorageService.get_document_size(TEST_DOC_NAME) == len(TEST_DATA)
+    assert GoogleStorageService.get_document_link(TEST_DOC_NAME).startswith('file://')
+
+
+def test_local_stream_document(session, local_storage):
+    """Assert that streaming a document byte range with local storage works as expected."""
+    GoogleStorageService.save_document(TEST_DOC_NAME, TEST_DATA)
+    # test
+    whole = b''.join(GoogleStorageService.stream_document(TEST_DOC_NAME))
+    part = b''.join(GoogleStorageService.stream_document(TEST_DOC_NAME, None, 100, 199))
+    # check
+    assert whole == TEST_DATA
+    assert part == TEST_DATA[100:200]
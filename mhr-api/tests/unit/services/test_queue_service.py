@@ -13,9 +13,11 @@
 # limitations under the License.
 """Google queue service publish tests."""
 import os
+from concurrent import futures
 
 from flask import current_app
 
+from mhr_api.models import EventTracking
 from mhr_api.services.queue_service import GoogleQueueService
 
 
@@ -79,3 +81,18 @@ def test_publish_pay_completion(session):
 def is_ci_testing() -> bool:
     """Check unit test environment: exclude pub/sub for CI testing."""
     return  current_app.config.get("DEPLOYMENT_ENV", "testing") == "testing"
+
+
+def test_publish_done_error(session):
+    """Assert that a failed async publish is recorded as an event tracking record."""
+    key_id = 99999998
+    event_type = EventTracking.EventTrackingTypes.SEARCH_REPORT.value
+    future = futures.Future()
+    future.set_exception(Exception('Publish timed out.'))
+    # test
+    GoogleQueueService.publish_done(future, 'test-topic', event_type, key_id)
+    # check
+    events = EventTracking.find_by_key_id_type(key_id, event_type)
+    assert events
+    assert events[-1].status == 500
+    assert events[-1].message.find('Publish timed out.') > 0
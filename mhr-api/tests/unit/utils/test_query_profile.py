@@ -0,0 +1,40 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per request DB query profile tests."""
+from mhr_api.utils.query_profile import QueryProfile
+
+
+def test_query_profile():
+    """Assert that the statement count, total time and slowest statements are recorded."""
+    profile = QueryProfile(slowest_size=2)
+    profile.add('SELECT 1', 1.5)
+    profile.add('SELECT  *\n  FROM registrations', 10.25)
+    profile.add('SELECT 2', 0.5)
+    profile.add('SELECT 3', 4)
+    result = profile.json('GET /test')
+    assert result['endpoint'] == 'GET /test'
+    assert result['statementCount'] == 4
+    assert result['totalMs'] == 16.25
+    assert len(result['slowest']) == 2
+    assert result['slowest'][0] == {'ms': 10.25, 'statement': 'SELECT * FROM registrations'}
+    assert result['slowest'][1]['statement'] == 'SELECT 3'
+    assert profile.server_timing() == 'db;dur=16.25;desc="4 statements"'
+
+
+def test_query_profile_no_slowest():
+    """Assert that no slowest statements are kept if the slowest size is 0."""
+    profile = QueryProfile(slowest_size=0)
+    profile.add('SELECT 1', 1.5)
+    assert profile.count == 1
+    assert not profile.slowest
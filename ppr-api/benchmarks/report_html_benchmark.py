@@ -0,0 +1,148 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Report html benchmark: time the html generation for a large search report.
+
+Run from the ppr-api directory:
+
+    poetry run python benchmarks/report_html_benchmark.py --statements 1000 --iterations 5
+
+The search report has the statements count of copies of a unit test search result registration, split into
+sub-reports the way a large search report is. Each sub-report html is generated twice: once for the TOC page numbers
+and once for the final render. The html generation is timed compiling the template on every render (the previous
+behaviour) and with the shared report template environment.
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from jinja2 import Template
+
+from ppr_api import create_app
+from ppr_api.reports.v2 import report_utils
+from ppr_api.reports.v2.report import SUBREPORT_SIZE, Report
+from ppr_api.reports.v2.report_utils import ReportTypes
+
+SEARCH_DATAFILE = "tests/unit/reports/data/search-detail-reg-num-example.json"
+RENDERS_PER_SUBREPORT = 2
+
+
+def build_search_data(statements: int) -> dict:
+    """Build search report data with the statements count of uniquely numbered registrations."""
+    with open(SEARCH_DATAFILE, "r", encoding="UTF-8") as data_file:
+        search_data = json.load(data_file)
+    detail = search_data["details"][0]
+    select = search_data["selected"][0]
+    search_data["details"] = []
+    search_data["selected"] = []
+    for index in range(statements):
+        reg_num: str = f"{index + 1:06d}B"
+        reg_detail = copy.deepcopy(detail)
+        reg_detail["financingStatement"]["baseRegistrationNumber"] = reg_num
+        reg_select = copy.deepcopy(select)
+        reg_select["baseRegistrationNumber"] = reg_num
+        search_data["details"].append(reg_detail)
+        search_data["selected"].append(reg_select)
+    search_data["totalResultsSize"] = statements
+    search_data["exactResultsSize"] = statements
+    return search_data
+
+
+def build_subreport_requests(search_data: dict) -> list:
+    """Build the report service request data (template and template data) for each large search sub-report."""
+    requests = []
+    details = search_data.pop("details")
+    selected = search_data.pop("selected")
+    rep_count: int = (len(details) + SUBREPORT_SIZE - 1) // SUBREPORT_SIZE
+    for start_index in range(0, len(details), SUBREPORT_SIZE):
+        sub_data = copy.deepcopy(search_data)
+        sub_data["details"] = copy.deepcopy(details[start_index : start_index + SUBREPORT_SIZE])
+        sub_data["selected"] = copy.deepcopy(selected[start_index : start_index + SUBREPORT_SIZE])
+        sub_data["subreport"] = f"{len(requests) + 1} of {rep_count}"
+        sub_data["pageNumOffset"] = 0
+        sub_data["search_large"] = True
+        report = Report(sub_data, "BENCHMARK", ReportTypes.SEARCH_DETAIL_REPORT, "Benchmark Account")
+        requests.append(report._setup_report_data())  # pylint: disable=protected-access
+    return requests
+
+
+def render_compiled_each_time(request_data: dict) -> str:
+    """Generate the html the previous way, compiling the template source for the render."""
+    return Template(request_data["template"], autoescape=True).render(request_data["templateVars"])
+
+
+def time_renders(requests: list, render, iterations: int) -> list:
+    """Return the elapsed seconds of each iteration of generating every sub-report html RENDERS_PER_SUBREPORT times."""
+    elapsed = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        for request_data in requests:
+            for _ in range(RENDERS_PER_SUBREPORT):
+                render(request_data)
+        elapsed.append(time.perf_counter() - start_time)
+    return elapsed
+
+
+def summarize(elapsed: list) -> dict:
+    """Summarize the iteration times in milliseconds."""
+    return {
+        "firstMs": round(elapsed[0] * 1000, 1),
+        "minMs": round(min(elapsed) * 1000, 1),
+        "meanMs": round(sum(elapsed) / len(elapsed) * 1000, 1),
+    }
+
+
+def run(args) -> dict:
+    """Run the benchmark, returning the summary by render mode."""
+    requests = build_subreport_requests(build_search_data(args.statements))
+    html_length: int = sum(len(render_compiled_each_time(request_data)) for request_data in requests)
+    # Start the shared environment cold: the first iteration includes compiling the template or loading the bytecode.
+    report_utils.TemplateEnvironment.environment = None
+    report_utils.TemplateEnvironment.names.clear()
+    report_utils.TemplateEnvironment.sources.clear()
+    summary = {
+        "statements": args.statements,
+        "subreports": len(requests),
+        "renders": len(requests) * RENDERS_PER_SUBREPORT,
+        "htmlLength": html_length,
+        "compileEachRender": summarize(time_renders(requests, render_compiled_each_time, args.iterations)),
+        "sharedEnvironment": summarize(time_renders(requests, report_utils.get_html_from_data, args.iterations)),
+    }
+    summary["meanSpeedup"] = round(
+        summary["compileEachRender"]["meanMs"] / max(summary["sharedEnvironment"]["meanMs"], 0.1), 1
+    )
+    return summary
+
+
+def main() -> int:
+    """Parse the command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="PPR search report html generation benchmark.")
+    parser.add_argument("--config", default="development", help="App configuration name.")
+    parser.add_argument("--statements", type=int, default=1000, help="Number of search result registrations.")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed passes over the sub-reports.")
+    parser.add_argument("--output", help="Write the summary json to this file.")
+    args = parser.parse_args()
+    app = create_app(args.config)
+    with app.app_context():
+        summary = run(args)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
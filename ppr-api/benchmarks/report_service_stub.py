@@ -0,0 +1,421 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local report service stand-in: a Gotenberg compatible server returning deterministic pdfs.
+
+Run from the ppr-api or mhr-api directory and set REPORT_API_URL to the server url and REPORT_API_AUDIENCE to an
+empty value (no report service token):
+
+    poetry run python benchmarks/report_service_stub.py --port 3000 --latency 0.2 --page-latency 0.01
+
+The server accepts the report service requests the APIs and jobs make:
+
+- POST /forms/chromium/convert/html with the index.html, header.html and footer.html files and the page margin form
+  fields. The html text is laid out as lines of text: elements with a page-break-before/after style start a new page,
+  element ids are pdf named destinations, and the header and footer pageNumber and totalPages elements are set.
+- POST /forms/pdfengines/merge with the pdf files, merged in file name order.
+- GET /health.
+
+The same request always returns the same pdf. Each response is delayed by the latency plus the page latency for each
+pdf page, to stand in for the report service rendering time.
+"""
+import argparse
+import io
+import re
+import sys
+import textwrap
+import threading
+import time
+from html.parser import HTMLParser
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import PyPDF2
+
+SINGLE_URI = "/forms/chromium/convert/html"
+MERGE_URI = "/forms/pdfengines/merge"
+HEALTH_URI = "/health"
+POINTS_PER_INCH = 72
+PAPER_WIDTH = 8.5
+PAPER_HEIGHT = 11.0
+MARGIN_DEFAULT = 0.39
+FONT_SIZE = 9
+LINE_HEIGHT = 11
+LINE_WIDTH_CHARS = 110
+PAGE_NUMBER = "\x00pageNumber\x00"
+TOTAL_PAGES = "\x00totalPages\x00"
+BLOCK_TAGS = (
+    "address",
+    "br",
+    "div",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "li",
+    "p",
+    "section",
+    "table",
+    "tr",
+)
+SKIP_TAGS = ("head", "script", "style", "title")
+PAGE_BREAK_BEFORE = re.compile(r"(page-)?break-before\s*:\s*(always|page)", re.IGNORECASE)
+PAGE_BREAK_AFTER = re.compile(r"(page-)?break-after\s*:\s*(always|page)", re.IGNORECASE)
+PAGE_NUMBER_ELEMENT = re.compile(r'(<(\w+)[^>]*class="[^"]*\b(pageNumber|totalPages)\b[^"]*"[^>]*>)\s*(</\2>)')
+
+
+class ReportHtmlParser(HTMLParser):
+    """Lay out html text as pages of lines, recording the page of each element id."""
+
+    def __init__(self, lines_per_page: int = 0):
+        """Create the parser: 0 lines per page puts all the text on one page."""
+        super().__init__(convert_charrefs=True)
+        self.lines_per_page = lines_per_page
+        self.pages = [[]]
+        self.destinations = {}
+        self._text = []
+        self._skip_depth = 0
+        self._break_after = []
+
+    def handle_starttag(self, tag, attrs):
+        """Start a new line for block elements and a new page for page break styles."""
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        attr_values = dict(attrs)
+        style: str = attr_values.get("style") or ""
+        if tag in BLOCK_TAGS:
+            self._end_line()
+        if PAGE_BREAK_BEFORE.search(style):
+            self._new_page()
+        if attr_values.get("id") and attr_values["id"] not in self.destinations:
+            self.destinations[attr_values["id"]] = len(self.pages) - 1
+        if tag not in ("br", "hr", "img", "input", "meta", "link"):
+            self._break_after.append(bool(PAGE_BREAK_AFTER.search(style)))
+
+    def handle_endtag(self, tag):
+        """End the line for block elements and start a new page after a page break style element."""
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+            return
+        if tag in BLOCK_TAGS:
+            self._end_line()
+        if self._break_after and self._break_after.pop():
+            self._new_page()
+
+    def handle_data(self, data):
+        """Collect the element text."""
+        if not self._skip_depth:
+            self._text.append(data)
+
+    def close(self):
+        """Finish the layout, removing a trailing empty page."""
+        super().close()
+        self._end_line()
+        if len(self.pages) > 1 and not self.pages[-1]:
+            self.pages.pop()
+
+    def _end_line(self):
+        """Add the collected text as wrapped lines."""
+        text = " ".join("".join(self._text).split())
+        self._text = []
+        if not text:
+            return
+        for line in textwrap.wrap(text, LINE_WIDTH_CHARS) or [text]:
+            if self.lines_per_page and len(self.pages[-1]) >= self.lines_per_page:
+                self._new_page()
+            self.pages[-1].append(line)
+
+    def _new_page(self):
+        """Start a new page unless the current page is empty."""
+        self._end_line()
+        if self.pages[-1]:
+            self.pages.append([])
+
+
+def html_lines(html_text: str) -> list:
+    """Get the html text as a list of lines, with the pageNumber and totalPages element text set to placeholders."""
+    if not html_text:
+        return []
+
+    def set_placeholder(match):
+        placeholder: str = PAGE_NUMBER if match.group(3) == "pageNumber" else TOTAL_PAGES
+        return match.group(1) + placeholder + match.group(4)
+
+    parser = ReportHtmlParser()
+    parser.feed(PAGE_NUMBER_ELEMENT.sub(set_placeholder, html_text))
+    parser.close()
+    return parser.pages[0]
+
+
+def pdf_text(text: str) -> str:
+    """Get the text as a pdf string literal."""
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def text_stream(lines: list, x_pos: float, y_pos: float) -> str:
+    """Get the content stream operators to show the lines of text from the top left position."""
+    if not lines:
+        return ""
+    operators = [f"BT /F1 {FONT_SIZE} Tf {LINE_HEIGHT} TL {x_pos:.2f} {y_pos:.2f} Td"]
+    operators.extend(f"{pdf_text(line)} Tj T*" for line in lines)
+    operators.append("ET")
+    return "\n".join(operators)
+
+
+def set_page_numbers(lines: list, number: str, total: str) -> list:
+    """Set the page number and total pages in the header or footer lines."""
+    return [line.replace(PAGE_NUMBER, number).replace(TOTAL_PAGES, total) for line in lines]
+
+
+def build_pdf(pages: list, destinations: dict, header: list, footer: list, layout: dict) -> bytes:
+    """Build a pdf with the lines of text on each page, and the named destinations by page index.
+
+    The pdf is written directly with no creation date or id, so the same pages always produce the same pdf.
+    """
+    width: float = layout["paperWidth"] * POINTS_PER_INCH
+    height: float = layout["paperHeight"] * POINTS_PER_INCH
+    left: float = layout["marginLeft"] * POINTS_PER_INCH
+    top: float = height - layout["marginTop"] * POINTS_PER_INCH
+    footer_top: float = layout["marginBottom"] * POINTS_PER_INCH - LINE_HEIGHT
+    total: str = str(len(pages))
+    # Objects: 1 catalog, 2 pages, 3 font, then a page and a content stream object for each page.
+    objects = {
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    }
+    page_refs = []
+    for index, lines in enumerate(pages):
+        page_id: int = 4 + index * 2
+        page_refs.append(f"{page_id} 0 R")
+        number: str = str(index + 1)
+        streams = [
+            text_stream(set_page_numbers(header, number, total), left, height - LINE_HEIGHT * 2),
+            text_stream(lines, left, top - LINE_HEIGHT),
+            text_stream(set_page_numbers(footer, number, total), left, footer_top),
+        ]
+        content: bytes = "\n".join(stream for stream in streams if stream).encode("latin-1")
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width:.2f} {height:.2f}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode("latin-1")
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode("latin-1")
+    names = " ".join(
+        f"{pdf_text(name)} [{page_refs[page_index]} /Fit]" for name, page_index in sorted(destinations.items())
+    )
+    catalog: str = "<< /Type /Catalog /Pages 2 0 R"
+    if names:
+        catalog += f" /Names << /Dests << /Names [{names}] >> >>"
+    objects[1] = (catalog + " >>").encode("latin-1")
+
+    pdf = io.BytesIO()
+    pdf.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = pdf.tell()
+        pdf.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id]))
+    xref_offset: int = pdf.tell()
+    pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for obj_id in sorted(objects):
+        pdf.write(b"%010d 00000 n \n" % offsets[obj_id])
+    pdf.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return pdf.getvalue()
+
+
+def get_layout(fields: dict) -> dict:
+    """Get the page size and margins in inches from the request form fields."""
+    layout = {
+        "paperWidth": PAPER_WIDTH,
+        "paperHeight": PAPER_HEIGHT,
+        "marginTop": MARGIN_DEFAULT,
+        "marginBottom": MARGIN_DEFAULT,
+        "marginLeft": MARGIN_DEFAULT,
+        "marginRight": MARGIN_DEFAULT,
+    }
+    for key in layout:
+        try:
+            if fields.get(key):
+                layout[key] = float(fields[key])
+        except ValueError:
+            pass
+    return layout
+
+
+def convert_html(files: dict, fields: dict):
+    """Build the pdf for the index.html, header.html and footer.html files, returning the pdf and page count."""
+    layout = get_layout(fields)
+    body_height: float = (layout["paperHeight"] - layout["marginTop"] - layout["marginBottom"]) * POINTS_PER_INCH
+    parser = ReportHtmlParser(max(int(body_height // LINE_HEIGHT), 1))
+    parser.feed(files["index.html"].decode("utf-8"))
+    parser.close()
+    header = html_lines(files.get("header.html", b"").decode("utf-8"))
+    footer = html_lines(files.get("footer.html", b"").decode("utf-8"))
+    return build_pdf(parser.pages, parser.destinations, header, footer, layout), len(parser.pages)
+
+
+def merge_pdfs(files: dict):
+    """Merge the pdf files in file name order, returning the merged pdf and page count."""
+    writer = PyPDF2.PdfWriter()
+    for name in sorted(files):
+        writer.append(PyPDF2.PdfReader(io.BytesIO(files[name])))
+    merged = io.BytesIO()
+    writer.write(merged)
+    return merged.getvalue(), len(writer.pages)
+
+
+def parse_multipart(content_type: str, body: bytes):
+    """Get the multipart/form-data files by file name and the form fields by name."""
+    files = {}
+    fields = {}
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not match:
+        return files, fields
+    for part in body.split(b"--" + match.group(1).encode("latin-1"))[1:]:
+        if part.startswith(b"--"):
+            break
+        headers, _, content = part.partition(b"\r\n\r\n")
+        if content.endswith(b"\r\n"):
+            content = content[:-2]
+        disposition = headers.decode("latin-1")
+        filename = re.search(r'filename="([^"]*)"', disposition)
+        name = re.search(r'\bname="([^"]*)"', disposition)
+        if filename:
+            files[filename.group(1)] = content
+        elif name:
+            fields[name.group(1)] = content.decode("utf-8")
+    return files, fields
+
+
+class ReportServiceHandler(BaseHTTPRequestHandler):
+    """Handle the report service requests."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "ReportServiceStub/1.0"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Report the server is up."""
+        if self.path != HEALTH_URI:
+            self.send_text(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+        self.send_text(HTTPStatus.OK, '{"status":"up"}', "application/json")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Convert html to pdf or merge pdfs."""
+        body: bytes = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path not in (SINGLE_URI, MERGE_URI):
+            self.send_text(HTTPStatus.NOT_FOUND, "Not found.")
+            return
+        files, fields = parse_multipart(self.headers.get("Content-Type"), body)
+        try:
+            if self.path == SINGLE_URI:
+                if "index.html" not in files:
+                    self.send_text(HTTPStatus.BAD_REQUEST, "No index.html file found.")
+                    return
+                pdf_data, page_count = convert_html(files, fields)
+            else:
+                pdf_files = {name: data for name, data in files.items() if name.lower().endswith(".pdf")}
+                if not pdf_files:
+                    self.send_text(HTTPStatus.BAD_REQUEST, "No pdf files found.")
+                    return
+                pdf_data, page_count = merge_pdfs(pdf_files)
+        except Exception as err:  # noqa: B902; return the error as the report service would
+            self.send_text(HTTPStatus.INTERNAL_SERVER_ERROR, f"Report generation failed: {err}")
+            return
+        time.sleep(self.server.latency + self.server.page_latency * page_count)
+        self.server.record(self.path, page_count)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(pdf_data)))
+        self.end_headers()
+        self.wfile.write(pdf_data)
+
+    def send_text(self, status: HTTPStatus, text: str, content_type: str = "text/plain"):
+        """Send a text response."""
+        data: bytes = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Only log requests if verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ReportServiceStub(ThreadingHTTPServer):
+    """The report service stand-in server, counting the requests and pages by endpoint."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, page_latency: float = 0.0, verbose: bool = False):
+        """Create the server on the local port: port 0 is any free port."""
+        super().__init__(("127.0.0.1", port), ReportServiceHandler)
+        self.latency = latency
+        self.page_latency = page_latency
+        self.verbose = verbose
+        self.stats = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Get the server url to use as the report service url."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record(self, path: str, page_count: int):
+        """Add a request to the endpoint request and page counts."""
+        with self._stats_lock:
+            path_stats = self.stats.setdefault(path, {"requests": 0, "pages": 0})
+            path_stats["requests"] += 1
+            path_stats["pages"] += page_count
+
+    def get_stats(self, reset: bool = False) -> dict:
+        """Get a copy of the endpoint request and page counts, optionally resetting them."""
+        with self._stats_lock:
+            stats = {path: dict(path_stats) for path, path_stats in self.stats.items()}
+            if reset:
+                self.stats = {}
+        return stats
+
+    def start(self) -> threading.Thread:
+        """Serve requests in a background thread."""
+        thread = threading.Thread(target=self.serve_forever, name="report-service-stub", daemon=True)
+        thread.start()
+        return thread
+
+
+def main() -> int:
+    """Parse the command line arguments and run the server until interrupted."""
+    parser = argparse.ArgumentParser(description="Local Gotenberg compatible report service stand-in.")
+    parser.add_argument("--port", type=int, default=3000, help="Local port to listen on.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to delay every response.")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Extra seconds to delay per pdf page.")
+    parser.add_argument("--verbose", action="store_true", help="Log every request.")
+    args = parser.parse_args()
+    server = ReportServiceStub(args.port, args.latency, args.page_latency, args.verbose)
+    print(f"Report service stand-in listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Search result benchmark: time the search selection and detail de-duplication for a large business debtor search.
+
+Run from the ppr-api directory:
+
+    poetry run python benchmarks/search_result_benchmark.py --matches 5000 --iterations 5
+
+The search matches have duplicate base registration numbers (every 5th match repeats the previous registration with a
+different debtor name). The search selection and the detail building steps are timed separately, with the
+SearchResult dictionary/set lookups and with the previous list scanning implementations copied below. No database
+access is needed: the registration details are stand-ins keyed by base registration number.
+"""
+import argparse
+import copy
+import json
+import sys
+import time
+
+from report_html_benchmark import summarize
+
+from ppr_api import create_app
+from ppr_api.models import SearchRequest, SearchResult
+from ppr_api.models import utils as model_utils
+
+
+def build_matches(match_count: int) -> list:
+    """Build a synthetic business debtor search match list with duplicate base registration numbers."""
+    matches = []
+    for index in range(match_count):
+        reg_num: str = "B" + str(index - (1 if index % 5 == 4 else 0)).rjust(7, "0")
+        matches.append(
+            {
+                "baseRegistrationNumber": reg_num,
+                "matchType": model_utils.SEARCH_MATCH_EXACT if index % 3 == 0 else "SIMILAR",
+                "createDateTime": "2021-06-23T13:33:56+00:00",
+                "registrationType": "SA",
+                "debtor": {"businessName": "BENCHMARK DEBTOR " + str(index)},
+            }
+        )
+    return matches
+
+
+def legacy_set_search_selection(original_select: list, search_select: list) -> list:
+    """Previous search selection: scan the original matches for each selected similar registration (unsorted)."""
+    reg_list = [s["baseRegistrationNumber"] for s in search_select if s["matchType"] != model_utils.SEARCH_MATCH_EXACT]
+    reg_list = list(dict.fromkeys(reg_list))
+    update_select = []
+    for original in original_select:
+        if original["matchType"] == model_utils.SEARCH_MATCH_EXACT:
+            update_select.append(original)
+    for reg_num in reg_list:
+        for original in original_select:
+            if (
+                original["matchType"] != model_utils.SEARCH_MATCH_EXACT
+                and original["baseRegistrationNumber"] == reg_num
+            ):
+                update_select.append(original)
+    return update_select
+
+
+def legacy_build_details(search_select: list, results: list) -> list:
+    """Previous detail building: scan the details added so far and the registration list for each selection."""
+    new_results = []
+    for select in search_select:
+        if select["matchType"] == model_utils.SEARCH_MATCH_EXACT or ("selected" not in select or select["selected"]):
+            reg_num = select["baseRegistrationNumber"]
+            found = False
+            for match in new_results:
+                if match["financingStatement"]["baseRegistrationNumber"] == reg_num:
+                    found = True
+            if not found:
+                for result in results:
+                    if reg_num == result["financingStatement"]["baseRegistrationNumber"]:
+                        new_results.append(result)
+                        break
+    return new_results
+
+
+def build_search_result(matches: list) -> SearchResult:
+    """Build a search result with a registration detail stand-in for every match."""
+    registrations = [
+        {
+            "matchType": match["matchType"],
+            "financingStatement": {"baseRegistrationNumber": match["baseRegistrationNumber"]},
+        }
+        for match in matches
+    ]
+    search_request: SearchRequest = SearchRequest(
+        search_response=matches, search_type=SearchRequest.SearchTypes.REGISTRATION_NUM.value
+    )
+    search_result: SearchResult = SearchResult(search_response=registrations)
+    search_result.search = search_request
+    return search_result
+
+
+def time_step(step, iterations: int) -> list:
+    """Return the elapsed seconds of each iteration of the step."""
+    elapsed = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        step()
+        elapsed.append(time.perf_counter() - start_time)
+    return elapsed
+
+
+def run(args) -> dict:
+    """Run the benchmark, returning the summary by step and implementation."""
+    matches = build_matches(args.matches)
+    search_result = build_search_result(matches)
+    search_select = copy.deepcopy(matches)
+    # Registration number searches are not sorted, so both selection implementations do the same work.
+    selection = search_result.set_search_selection(search_select)
+    if selection != legacy_set_search_selection(matches, search_select):
+        raise RuntimeError("Indexed and list scanning search selections differ.")
+    search_result.search_select = selection
+    details = search_result.build_details()
+    if details != legacy_build_details(selection, search_result.search_response):
+        raise RuntimeError("Indexed and list scanning search details differ.")
+    summary = {
+        "matches": args.matches,
+        "details": len(details),
+        "selectionIndexed": summarize(
+            time_step(lambda: search_result.set_search_selection(search_select), args.iterations)
+        ),
+        "selectionListScan": summarize(
+            time_step(lambda: legacy_set_search_selection(matches, search_select), args.iterations)
+        ),
+        "detailsIndexed": summarize(time_step(search_result.build_details, args.iterations)),
+        "detailsListScan": summarize(
+            time_step(lambda: legacy_build_details(selection, search_result.search_response), args.iterations)
+        ),
+    }
+    return summary
+
+
+def main() -> int:
+    """Parse the command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="PPR search selection and detail de-duplication benchmark.")
+    parser.add_argument("--config", default="development", help="App configuration name.")
+    parser.add_argument("--matches", type=int, default=5000, help="Number of search matches.")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed passes over each step.")
+    parser.add_argument("--output", help="Write the summary json to this file.")
+    args = parser.parse_args()
+    app = create_app(args.config)
+    with app.app_context():
+        summary = run(args)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as output_file:
+            json.dump(summary, output_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
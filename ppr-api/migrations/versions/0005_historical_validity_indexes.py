@@ -0,0 +1,48 @@
+"""0005_historical_validity_indexes
+
+Revision ID: b83f0e6d27c1
+Revises: 7d2a9c41e5b3
+Create Date: 2025-07-21 10:04:37.512906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from alembic_utils.pg_function import PGFunction
+
+
+# revision identifiers, used by Alembic.
+revision = 'b83f0e6d27c1'
+down_revision = '7d2a9c41e5b3'
+branch_labels = None
+depends_on = None
+
+
+public_registration_validity = PGFunction(
+    schema="public",
+    signature="registration_validity(registration_id IN INTEGER, registration_id_end IN INTEGER)",
+    definition="RETURNS int4range\n    LANGUAGE sql\n    IMMUTABLE PARALLEL SAFE\n    AS\n    $$\n    SELECT CASE WHEN registration_id_end IS NULL OR registration_id_end >= registration_id\n                THEN int4range(registration_id, registration_id_end)\n                ELSE 'empty'::int4range END;\n    $$"
+)
+
+
+def upgrade():
+    # ### Manually created: registration id validity ranges for historical (as of) searches. ###
+    op.create_entity(public_registration_validity)
+    op.create_index('ix_parties_financing_validity',
+                    'parties',
+                    ['financing_id', sa.text('registration_validity(registration_id, registration_id_end)')],
+                    unique=False,
+                    postgresql_using='gist')
+    op.create_index('ix_serial_collateral_financing_validity',
+                    'serial_collateral',
+                    ['financing_id', sa.text('registration_validity(registration_id, registration_id_end)')],
+                    unique=False,
+                    postgresql_using='gist')
+    # ### end Alembic commands ###
+
+
+def downgrade():
+    # ### Manually created: registration id validity ranges for historical (as of) searches. ###
+    op.drop_index('ix_serial_collateral_financing_validity', table_name='serial_collateral', postgresql_using='gist')
+    op.drop_index('ix_parties_financing_validity', table_name='parties', postgresql_using='gist')
+    op.drop_entity(public_registration_validity)
+    # ### end Alembic commands ###
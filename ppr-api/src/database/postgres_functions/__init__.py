@@ -39,3 +39,5 @@ from .get_mhr_doc_gov_agent_id import get_mhr_doc_gov_agent_id
 from .mhr_name_compressed_key import mhr_name_compressed_key
 from .mhr_serial_compressed_key import mhr_serial_compressed_key
 from .get_mhr_doc_staff_id import get_mhr_doc_staff_id
+from .registration_validity import registration_validity
+from .searchable_financing_statement_refresh import searchable_financing_statement_refresh
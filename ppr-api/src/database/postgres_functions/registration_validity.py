@@ -0,0 +1,19 @@
+"""Maintain db function registration_validity here."""
+from alembic_utils.pg_function import PGFunction
+
+
+registration_validity = PGFunction(
+    schema="public",
+    signature="registration_validity(registration_id IN INTEGER, registration_id_end IN INTEGER)",
+    definition=r"""
+    RETURNS int4range
+    LANGUAGE sql
+    IMMUTABLE PARALLEL SAFE
+    AS
+    $$
+    SELECT CASE WHEN registration_id_end IS NULL OR registration_id_end >= registration_id
+                THEN int4range(registration_id, registration_id_end)
+                ELSE 'empty'::int4range END;
+    $$;
+    """
+)
@@ -0,0 +1,38 @@
+"""Maintain db function searchable_financing_statement_refresh here."""
+from alembic_utils.pg_function import PGFunction
+
+
+# Trigger function on registrations and financing_statements: insert or update the financing statement search end
+# time, 30 days after the expiry date or the earliest discharge registration.
+searchable_financing_statement_refresh = PGFunction(
+    schema="public",
+    signature="searchable_financing_statement_refresh()",
+    definition=r"""
+    RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS
+    $$
+    DECLARE
+        v_financing_id INTEGER;
+    BEGIN
+        IF TG_TABLE_NAME = 'financing_statements' THEN
+            v_financing_id := NEW.id;
+        ELSE
+            v_financing_id := NEW.financing_id;
+        END IF;
+        INSERT INTO searchable_financing_statements (financing_id, search_until_ts)
+        SELECT fs.id,
+               LEAST(fs.expire_date + interval '30 days',
+                     (SELECT MIN(r.registration_ts) + interval '30 days'
+                        FROM registrations r
+                       WHERE r.financing_id = fs.id
+                         AND r.registration_type_cl = 'DISCHARGE'))
+          FROM financing_statements fs
+         WHERE fs.id = v_financing_id
+        ON CONFLICT (financing_id) DO UPDATE SET search_until_ts = EXCLUDED.search_until_ts;
+        RETURN NULL;
+    END
+    ;
+    $$;
+    """
+)
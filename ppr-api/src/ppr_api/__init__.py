@@ -28,10 +28,13 @@ from ppr_api.callback import auth_service, storage_service
 from ppr_api.config import config
 from ppr_api.metadata import APP_RUNNING_ENVIRONMENT, APP_VERSION
 from ppr_api.models import db
+from ppr_api.reports.v2.report import init_template_cache
+from ppr_api.reports.v2.report_client import ReportClient
 from ppr_api.resources import endpoints
 from ppr_api.schemas import rsbc_schemas
 from ppr_api.services import flags, queue_service
 from ppr_api.translations import babel
+from ppr_api.utils import query_profile
 from ppr_api.utils.auth import jwt
 from ppr_api.utils.logging import logger, setup_logging
 
@@ -65,6 +68,9 @@ def create_app(service_environment=APP_RUNNING_ENVIRONMENT, **kwargs):
     storage_service.init_app(app)
     endpoints.init_app(app)
     queue_service.init_app(app)
+    init_template_cache(app)
+    ReportClient.init_app(app)
+    query_profile.init_app(app)
 
     setup_jwt_manager(app, jwt)
 
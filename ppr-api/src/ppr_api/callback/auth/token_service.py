@@ -14,8 +14,11 @@
 """This maintains access tokens for API calls."""
 import base64
 import json
+import threading
+import time
 from abc import ABC, abstractmethod
 
+import google.auth.jwt
 import google.auth.transport.requests
 import google.oauth2.id_token
 from flask import current_app
@@ -23,6 +26,11 @@ from google.oauth2 import service_account
 
 from ppr_api.utils.logging import logger
 
+# Refresh a cached report service ID token this many seconds before it expires.
+TOKEN_REFRESH_SECONDS = 300
+# Google ID token lifetime if the token expiry cannot be read.
+TOKEN_DEFAULT_LIFETIME = 3600
+
 
 class TokenService(ABC):  # pylint: disable=too-few-public-methods
     """Token Service abstract class with single get_token method."""
@@ -45,6 +53,9 @@ class GoogleStorageTokenService(TokenService):  # pylint: disable=too-few-public
 
     service_account_info = None
     credentials = None
+    # Report service ID tokens by audience: (token, expiry timestamp).
+    report_api_tokens = {}
+    report_api_token_lock = threading.Lock()
     # Use service account env var if available.
     if gcp_auth_key:
         sa_bytes = bytes(gcp_auth_key, "utf-8")
@@ -90,7 +101,28 @@ class GoogleStorageTokenService(TokenService):  # pylint: disable=too-few-public
             logger.info(f"Getting report service token for {rs_url}")
         if not audience:
             return None
-        auth_req = google.auth.transport.requests.Request()
-        token = google.oauth2.id_token.fetch_id_token(auth_req, audience)
-        logger.debug("Call successful: obtained token.")
-        return token
+        return cls.get_id_token(audience)
+
+    @classmethod
+    def get_id_token(cls, audience: str):
+        """Get a cached ID token for the audience, fetching a new token if not cached or about to expire."""
+        with cls.report_api_token_lock:
+            cached = cls.report_api_tokens.get(audience)
+            if cached and cached[1] - TOKEN_REFRESH_SECONDS > time.time():
+                return cached[0]
+            auth_req = google.auth.transport.requests.Request()
+            token = google.oauth2.id_token.fetch_id_token(auth_req, audience)
+            cls.report_api_tokens[audience] = (token, get_token_expiry(token))
+            logger.info(f"Call successful: obtained ID token for {audience}.")
+            return token
+
+
+def get_token_expiry(token: str) -> float:
+    """Get the token expiry timestamp from the token claims, without verifying the token."""
+    try:
+        claims = google.auth.jwt.decode(token, verify=False)
+        if claims.get("exp"):
+            return float(claims["exp"])
+    except Exception as err:  # noqa: B902; use the default token lifetime
+        logger.info(f"Could not read the ID token expiry, using the default: {err}")
+    return time.time() + TOKEN_DEFAULT_LIFETIME
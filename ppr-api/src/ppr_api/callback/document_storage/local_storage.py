@@ -0,0 +1,107 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local filesystem stand-in for the Cloud Storage client, for offline development and benchmarking.
+
+Buckets are directories and blobs are files under a root directory. Only the client, bucket, and blob calls used by
+the storage service are implemented.
+"""
+import datetime
+import os
+from pathlib import Path
+
+
+class LocalBlob:
+    """A named file in a local bucket directory."""
+
+    def __init__(self, bucket_path: Path, name: str):
+        """Create the blob for the name in the bucket directory."""
+        self.name = name
+        self.path = bucket_path / name
+
+    @property
+    def size(self) -> int:
+        """Return the file size in bytes."""
+        return self.path.stat().st_size
+
+    @property
+    def time_created(self) -> datetime.datetime:
+        """Return the file modification time."""
+        return datetime.datetime.fromtimestamp(self.path.stat().st_mtime, tz=datetime.timezone.utc)
+
+    def upload_from_string(self, data, content_type: str = None):  # pylint: disable=unused-argument
+        """Write the data to the file, replacing any existing contents."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_bytes(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp_path, self.path)
+
+    def upload_from_file(self, file_obj, content_type: str = None):  # pylint: disable=unused-argument
+        """Copy the file object contents to the file, replacing any existing contents."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as tmp_file:
+            while buf := file_obj.read(1024 * 1024):
+                tmp_file.write(buf)
+        os.replace(tmp_path, self.path)
+
+    def download_as_bytes(self, start: int = None, end: int = None) -> bytes:
+        """Return the file contents, limited to the inclusive byte range if start or end is set."""
+        with open(self.path, "rb") as blob_file:
+            if start:
+                blob_file.seek(start)
+            if end is None:
+                return blob_file.read()
+            return blob_file.read(end - (start or 0) + 1)
+
+    def open(self, mode: str = "rb", chunk_size: int = None):  # pylint: disable=unused-argument
+        """Open the file for reading."""
+        return open(self.path, mode)  # pylint: disable=unspecified-encoding,consider-using-with
+
+    def delete(self):
+        """Delete the file."""
+        self.path.unlink()
+
+    def generate_signed_url(self, **kwargs) -> str:  # pylint: disable=unused-argument
+        """Return a file URL instead of a time-limited download link."""
+        return self.path.resolve().as_uri()
+
+
+class LocalBucket:
+    """A local bucket directory."""
+
+    def __init__(self, root_path: Path, bucket_id: str):
+        """Create the bucket for the bucket id under the root directory."""
+        self.name = bucket_id
+        self.path = root_path / bucket_id
+
+    def blob(self, name: str) -> LocalBlob:
+        """Return a blob handle for the name: the file may not exist."""
+        return LocalBlob(self.path, name)
+
+    def get_blob(self, name: str) -> LocalBlob:
+        """Return the blob for the name if the file exists, otherwise None."""
+        blob = LocalBlob(self.path, name)
+        return blob if blob.path.is_file() else None
+
+
+class LocalStorageClient:  # pylint: disable=too-few-public-methods
+    """Storage client with buckets as directories under a root directory."""
+
+    def __init__(self, root_path: str):
+        """Create the client for the root directory."""
+        self.root_path = Path(root_path)
+
+    def bucket(self, bucket_id: str) -> LocalBucket:
+        """Return the bucket directory handle for the bucket id."""
+        return LocalBucket(self.root_path, bucket_id)
@@ -13,12 +13,16 @@
 # limitations under the License.
 """This class is a wrapper for document storage API calls."""
 import datetime
+import threading
 from abc import ABC, abstractmethod
 from enum import Enum
 
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
 from ppr_api.callback.auth.token_service import GoogleStorageTokenService
+from ppr_api.callback.document_storage.local_storage import LocalStorageClient
 from ppr_api.callback.utils.exceptions import StorageException
 from ppr_api.utils.logging import logger
 
@@ -26,6 +30,7 @@ HTTP_DELETE = "delete"
 HTTP_GET = "get"
 HTTP_POST = "post"
 CONTENT_TYPE_PDF = "application/pdf"
+STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class DocumentTypes(str, Enum):
@@ -62,6 +67,13 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
     GCP_BUCKET_ID_VERIFICATION = None
     GCP_BUCKET_ID_REGISTRATION = None
     GCP_BUCKET_ID_MAIL = None
+    # Process wide storage client and bucket handles, created on first use.
+    STORAGE_CLIENT = None
+    STORAGE_BUCKETS = {}
+    STORAGE_LOCAL_PATH = None
+    STORAGE_POOL_SIZE = 10
+    STORAGE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+    STORAGE_LOCK = threading.Lock()
 
     @staticmethod
     def init_app(app):
@@ -70,6 +82,11 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
         GoogleStorageService.GCP_BUCKET_ID_VERIFICATION = app.config.get("GCP_CS_BUCKET_ID_VERIFICATION")
         GoogleStorageService.GCP_BUCKET_ID_REGISTRATION = app.config.get("GCP_CS_BUCKET_ID_REGISTRATION")
         GoogleStorageService.GCP_BUCKET_ID_MAIL = app.config.get("GCP_CS_BUCKET_ID_MAIL")
+        GoogleStorageService.STORAGE_LOCAL_PATH = app.config.get("GCP_CS_LOCAL_PATH")
+        GoogleStorageService.STORAGE_POOL_SIZE = app.config.get("GCP_CS_POOL_SIZE", 10)
+        GoogleStorageService.STORAGE_UPLOAD_CHUNK_SIZE = app.config.get("GCP_CS_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024)
+        GoogleStorageService.STORAGE_CLIENT = None
+        GoogleStorageService.STORAGE_BUCKETS = {}
 
     @classmethod
     def get_document(cls, name: str, doc_type: str = None):
@@ -83,6 +100,39 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
             logger.error(f"get_document failed for doc type={doc_type}, name={name}. {err}")
             raise StorageException("The system failed to retrieve the specified document.") from err
 
+    @classmethod
+    def get_document_size(cls, name: str, doc_type: str = None) -> int:
+        """Fetch the size in bytes of the uniquely named document in cloud storage."""
+        try:
+            logger.info(f"Fetching size doc type={doc_type}, name={name}.")
+            blob = cls.__get_bucket(doc_type).get_blob(name)
+            if blob is None:
+                raise StorageException(f"GET document failed: no doc type={doc_type}, name={name}.")
+            return blob.size
+        except StorageException as storage_err:
+            raise storage_err
+        except Exception as err:  # pylint: disable=broad-except # noqa F841;
+            logger.error(f"get_document_size failed for doc type={doc_type}, name={name}. {err}")
+            raise StorageException("The system failed to retrieve the specified document.") from err
+
+    @classmethod
+    def stream_document(cls, name: str, doc_type: str = None, start: int = 0, end: int = None):
+        """Generate the uniquely named document binary data in chunks, limited to the inclusive byte range.
+
+        Only one chunk at a time is held in memory, regardless of the document size.
+        """
+        blob = cls.__get_bucket(doc_type).blob(name)
+        with blob.open("rb", chunk_size=STREAM_CHUNK_SIZE) as reader:
+            reader.seek(start)
+            remaining: int = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                buf = reader.read(STREAM_CHUNK_SIZE if remaining is None else min(STREAM_CHUNK_SIZE, remaining))
+                if not buf:
+                    break
+                if remaining is not None:
+                    remaining -= len(buf)
+                yield buf
+
     @classmethod
     def get_document_link(cls, name: str, doc_type: str = None, available_days: int = 1):
         """Fetch the uniquely named document from cloud storage as a time-limited download link."""
@@ -107,7 +157,10 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
 
     @classmethod
     def save_document(cls, name: str, raw_data, doc_type: str = None):
-        """Save or replace the named document in cloud storage with the binary data as the file contents."""
+        """Save or replace the named document in cloud storage with the binary data or file object as the contents.
+
+        A file object is uploaded from the start as a chunked resumable upload, so only one chunk is held in memory.
+        """
         try:
             logger.info(f"Saving doc type={doc_type}, name={name}.")
             return cls.__call_cs_api(HTTP_POST, name, raw_data, doc_type)
@@ -143,6 +196,50 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
             return cls.GCP_BUCKET_ID_VERIFICATION
         return cls.GCP_BUCKET_ID
 
+    @classmethod
+    def get_client(cls):
+        """Get the process wide storage client, creating it on first use.
+
+        The client shares a connection pool across requests and refreshes its credentials in the background before
+        they expire. If GCP_CS_LOCAL_PATH is set the client is a local filesystem stand-in.
+        """
+        with cls.STORAGE_LOCK:
+            if cls.STORAGE_CLIENT is None:
+                if cls.STORAGE_LOCAL_PATH:
+                    logger.info(f"Using local document storage path={cls.STORAGE_LOCAL_PATH}.")
+                    cls.STORAGE_CLIENT = LocalStorageClient(cls.STORAGE_LOCAL_PATH)
+                else:
+                    credentials = GoogleStorageTokenService.get_credentials()
+                    credentials.with_non_blocking_refresh()
+                    http = AuthorizedSession(credentials)
+                    http.mount(
+                        "https://",
+                        HTTPAdapter(pool_connections=cls.STORAGE_POOL_SIZE, pool_maxsize=cls.STORAGE_POOL_SIZE),
+                    )
+                    cls.STORAGE_CLIENT = storage.Client(credentials=credentials, _http=http)
+            return cls.STORAGE_CLIENT
+
+    @classmethod
+    def __get_bucket(cls, doc_type: str = None):
+        """Get the cached Cloud Storage bucket handle for the document type."""
+        bucket_id = cls.__get_bucket_id(doc_type)
+        bucket = cls.STORAGE_BUCKETS.get(bucket_id)
+        if bucket is None:
+            bucket = cls.get_client().bucket(bucket_id)
+            cls.STORAGE_BUCKETS[bucket_id] = bucket
+        return bucket
+
+    @classmethod
+    def __upload(cls, blob, data):
+        """Upload the pdf binary data or file object contents to the blob."""
+        media_type: str = CONTENT_TYPE_PDF
+        if hasattr(data, "read"):
+            data.seek(0)
+            blob.chunk_size = cls.STORAGE_UPLOAD_CHUNK_SIZE
+            blob.upload_from_file(data, content_type=media_type)
+        else:
+            blob.upload_from_string(data=data, content_type=media_type)
+
     @classmethod
     def __call_cs_api(  # pylint: disable=too-many-arguments; just 1 more
         cls,
@@ -152,13 +249,9 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
         doc_type: str = None,
     ):
         """Call the Cloud Storage API."""
-        credentials = GoogleStorageTokenService.get_credentials()
-        storage_client = storage.Client(credentials=credentials)
-        bucket = storage_client.bucket(cls.__get_bucket_id(doc_type))
-        blob = bucket.blob(name)
+        blob = cls.__get_bucket(doc_type).blob(name)
         if method == HTTP_POST:
-            media_type: str = CONTENT_TYPE_PDF
-            blob.upload_from_string(data=data, content_type=media_type)
+            cls.__upload(blob, data)
             return blob.time_created
         if method == HTTP_GET:
             contents = blob.download_as_bytes()
@@ -171,13 +264,9 @@ class GoogleStorageService(StorageService):  # pylint: disable=too-few-public-me
     @classmethod
     def __call_cs_api_link(cls, name: str, data=None, doc_type: str = None, available_days: int = 1):
         """Call the Cloud Storage API, returning a time-limited download link."""
-        credentials = GoogleStorageTokenService.get_credentials()
-        storage_client = storage.Client(credentials=credentials)
-        bucket = storage_client.bucket(cls.__get_bucket_id(doc_type))
-        blob = bucket.blob(name)
+        blob = cls.__get_bucket(doc_type).blob(name)
         if data:
-            media_type: str = CONTENT_TYPE_PDF
-            blob.upload_from_string(data=data, content_type=media_type)
+            cls.__upload(blob, data)
         url = blob.generate_signed_url(
             version="v4", expiration=datetime.timedelta(days=available_days, hours=0, minutes=0), method="GET"
         )
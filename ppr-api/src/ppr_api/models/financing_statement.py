@@ -20,6 +20,7 @@ from __future__ import annotations
 from http import HTTPStatus
 
 from flask import current_app
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql import text
 
 from ppr_api.exceptions import BusinessException, DatabaseException, ResourceErrorCodes
@@ -28,6 +29,7 @@ from ppr_api.models.type_tables import RegistrationType, RegistrationTypes
 from ppr_api.utils.base import BaseEnum
 from ppr_api.utils.logging import logger
 
+from .client_code import ClientCode
 from .db import db
 from .general_collateral import (  # noqa: F401 pylint: disable=unused-import; needed by the SQLAlchemy relationship
     GeneralCollateral,
@@ -50,6 +52,9 @@ from .vehicle_collateral import (  # noqa: F401 pylint: disable=unused-import; n
     VehicleCollateral,
 )
 
+# Maximum number of base registration numbers in a single bulk financing statement load IN clause.
+BULK_LOAD_BATCH_SIZE: int = 1000
+
 
 class FinancingStatement(db.Model):  # pylint: disable=too-many-instance-attributes
     """This class maintains financing statement information."""
@@ -581,6 +586,67 @@ class FinancingStatement(db.Model):  # pylint: disable=too-many-instance-attribu
             )
         return statement
 
+    @classmethod
+    def find_all_by_registration_numbers(cls, registration_nums: list) -> dict:
+        """Return financing statements keyed by base registration number for a list of base registration numbers.
+
+        Used to build search result details: the registrations, parties, collateral, court orders and change
+        history needed to generate the financing statement json are loaded in a fixed number of set-based
+        queries instead of lazily per statement. Registration numbers with no matching financing statement are
+        not included in the result.
+        """
+        statements = {}
+        if not registration_nums:
+            return statements
+        reg_nums = list(dict.fromkeys(registration_nums))
+        try:
+            for index in range(0, len(reg_nums), BULK_LOAD_BATCH_SIZE):
+                batch = reg_nums[index : index + BULK_LOAD_BATCH_SIZE]
+                results = (
+                    db.session.query(FinancingStatement, Registration.registration_num)
+                    .filter(
+                        FinancingStatement.id == Registration.financing_id,
+                        Registration.registration_num.in_(batch),
+                        Registration.registration_type_cl.in_(["PPSALIEN", "MISCLIEN", "CROWNLIEN"]),
+                    )
+                    .options(*FinancingStatement.__bulk_load_options())
+                    .all()
+                )
+                for statement, reg_num in results:
+                    statements[reg_num] = statement
+        except Exception as db_exception:  # noqa: B902; return nicer error
+            logger.error("DB find_all_by_registration_numbers exception: " + repr(db_exception))
+            raise DatabaseException(db_exception) from db_exception
+        return statements
+
+    @staticmethod
+    def __bulk_load_options() -> list:
+        """Build the relationship eager load options used to generate the financing statement json in bulk."""
+        party_options = (
+            selectinload(Party.address),
+            selectinload(Party.client_code).selectinload(ClientCode.address),
+        )
+        return [
+            selectinload(FinancingStatement.registration).options(
+                selectinload(Registration.reg_type),
+                selectinload(Registration.parties).options(*party_options),
+                selectinload(Registration.court_order),
+                selectinload(Registration.trust_indenture),
+                selectinload(Registration.general_collateral),
+                selectinload(Registration.general_collateral_legacy),
+                selectinload(Registration.vehicle_collateral),
+                selectinload(Registration.securities_act_notices).selectinload(
+                    SecuritiesActNotice.securities_act_orders
+                ),
+            ),
+            selectinload(FinancingStatement.parties).options(*party_options),
+            selectinload(FinancingStatement.vehicle_collateral),
+            selectinload(FinancingStatement.general_collateral),
+            selectinload(FinancingStatement.general_collateral_legacy),
+            selectinload(FinancingStatement.trust_indenture),
+            selectinload(FinancingStatement.previous_statement),
+        ]
+
     @classmethod
     def find_by_financing_id(cls, financing_id: int = None):
         """Return a financing statement by financing statement ID."""
@@ -64,7 +64,7 @@ SELECT r.registration_type,r.registration_ts AS base_registration_ts,
                                                               'YYYY-MM-DD HH24:MI:SSTZHH') at time zone 'utc') - 
                                                 interval '30 days'))
    AND sc.financing_id = fs.id
-   AND sc.registration_id_end IS NULL
+   AND registration_validity(sc.registration_id, sc.registration_id_end) @> CAST(:query_value1 AS INTEGER)
 """
 
 # Equivalent logic as DB view search_by_reg_num_vw, but API determines the where clause.
@@ -150,7 +150,7 @@ WITH q AS (
                                                               'YYYY-MM-DD HH24:MI:SSTZHH') at time zone 'utc') - 
                                                 interval '30 days'))
    AND p.financing_id = fs.id
-   AND p.registration_id_end IS NULL
+   AND registration_validity(p.registration_id, p.registration_id_end) @> CAST(:query_value1 AS INTEGER)
    AND p.party_type = 'DB'
    AND p.bus_name_base = search_name_base
    AND p.bus_name_key_char1 = search_key_char1
@@ -195,7 +195,7 @@ SELECT * FROM (WITH q AS (SELECT(searchkey_last_name(:query_last)) AS search_las
                                                               'YYYY-MM-DD HH24:MI:SSTZHH') at time zone 'utc') - 
                                                 interval '30 days'))
    AND p.financing_id = fs.id
-   AND p.registration_id_end IS NULL
+   AND registration_validity(p.registration_id, p.registration_id_end) @> CAST(:query_value1 AS INTEGER)
    AND p.party_type = 'DI'
    AND p.id IN (SELECT * FROM unnest(match_individual_name(:query_last, :query_first, :query_last_quotient,
                                                            :query_first_quotient, :query_default_quotient))) 
@@ -486,18 +486,17 @@ def create_from_search_query(search_query: SearchRequest, search_reg_id: int) ->
     query_results = search_query.search_response
     detail_results = []
     search_result.search_response = detail_results
+    # Load all the matching financing statements in bulk rather than one at a time.
+    statements = FinancingStatement.find_all_by_registration_numbers(
+        [result["baseRegistrationNumber"] for result in query_results]
+    )
+    added_reg_nums = set()
     for result in query_results:
         reg_num = result["baseRegistrationNumber"]
         match_type = result["matchType"]
-        found = False
-        if detail_results:  # Check for duplicates.
-            for statement in detail_results:
-                if statement["financingStatement"]["baseRegistrationNumber"] == reg_num:
-                    found = True
-        if not found:  # No duplicates.
-            # Set to staff for small performance gain: skip account id/historical checks.
-            logger.debug(f"fetching registration for {reg_num}")
-            financing = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+        if reg_num not in added_reg_nums:  # No duplicates.
+            added_reg_nums.add(reg_num)
+            financing = get_statement(statements, reg_num)
             financing.mark_update_json = True  # Added for PDF, indicate if party or collateral was added.
             # Set to true to include change history.
             financing.include_changes_json = True
@@ -515,6 +514,25 @@ def create_from_search_query(search_query: SearchRequest, search_reg_id: int) ->
     return search_result
 
 
+def get_statement(statements: dict, reg_num: str) -> FinancingStatement:
+    """Get a bulk loaded financing statement, falling back to the single lookup to report a missing statement."""
+    financing = statements.get(reg_num)
+    if not financing:
+        # Set to staff for small performance gain: skip account id/historical checks.
+        logger.debug(f"fetching registration for {reg_num}")
+        financing = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+    return financing
+
+
+def is_valid_as_of(registration_id: int, registration_id_end: int, search_reg_id: int) -> bool:
+    """True if a party or collateral record exists as of the search registration id.
+
+    A record is valid from the registration that added it up to, but not including, the registration that removed
+    it: the same registration id range the registration_validity db function and the search queries use.
+    """
+    return registration_id <= search_reg_id and (not registration_id_end or registration_id_end > search_reg_id)
+
+
 def get_historical_json(fin: FinancingStatement, search_reg_id: int, search_ts) -> dict:
     """Get the reistration JSON with change history at a point in time."""
     statement = {"statusType": fin.state_type}
@@ -547,7 +565,7 @@ def get_historical_json(fin: FinancingStatement, search_reg_id: int, search_ts)
         statement["vehicleCollateral"] = vehicle_collateral
     if fin.trust_indenture:
         for trust in fin.trust_indenture:
-            if not trust.registration_id_end:
+            if is_valid_as_of(trust.registration_id, trust.registration_id_end, search_reg_id):
                 if trust.trust_indenture == "Y":
                     statement["trustIndenture"] = True
                 else:
@@ -628,16 +646,10 @@ def vehicle_collateral_json(fin: FinancingStatement, registration_id: int, searc
     collateral_list = []
     for collateral in fin.vehicle_collateral:
         collateral_json = None
-        if collateral.registration_id == registration_id and (
-            not collateral.registration_id_end or collateral.registration_id_end <= search_reg_id
-        ):
-            collateral_json = collateral.json
-        elif collateral.registration_id_end and collateral.registation_id_end <= search_reg_id:
-            collateral_json = collateral.json
-            collateral_json["added"] = True
-        elif not collateral.registration_id_end and collateral.registration_id <= search_reg_id:
+        if is_valid_as_of(collateral.registration_id, collateral.registration_id_end, search_reg_id):
             collateral_json = collateral.json
-            collateral_json["added"] = True
+            if collateral.registration_id != registration_id:
+                collateral_json["added"] = True
         if collateral_json:
             collateral_list.append(collateral_json)
     return collateral_list
@@ -659,11 +671,7 @@ def party_json(fin: FinancingStatement, party_type: str, registration_id: int, s
             party_type == Party.PartyTypes.DEBTOR_COMPANY.value
             and party.party_type == Party.PartyTypes.DEBTOR_INDIVIDUAL.value
         ):
-            if party.registration_id_end and party.registration_id_end <= search_reg_id:
-                p_json = party.json
-                if party.registration_id != registration_id:
-                    p_json["added"] = True
-            elif not party.registration_id_end and party.registration_id <= search_reg_id:
+            if is_valid_as_of(party.registration_id, party.registration_id_end, search_reg_id):
                 p_json = party.json
                 if party.registration_id != registration_id:
                     p_json["added"] = True
@@ -741,8 +749,11 @@ def __is_edit_general_collateral(fin: FinancingStatement, registration_id: int,
 
 def update_details(search_result: SearchResult) -> dict:
     """Generate the search selection details from the search selection order without duplicates."""
-    results = search_result.search_response
+    results_by_reg_num = {}
+    for result in search_result.search_response:
+        results_by_reg_num.setdefault(result["financingStatement"]["baseRegistrationNumber"], result)
     new_results = []
+    added_reg_nums = set()
     similar_count = 0
     # Use the same order as the search selection match list in the registration list.
     for select in search_result.search_select:
@@ -750,15 +761,9 @@ def update_details(search_result: SearchResult) -> dict:
             if select["matchType"] != model_utils.SEARCH_MATCH_EXACT:
                 similar_count += 1
             reg_num = select["baseRegistrationNumber"]
-            found = False
-            if new_results:  # Check for duplicates.
-                for match in new_results:
-                    if match["financingStatement"]["baseRegistrationNumber"] == reg_num:
-                        found = True
-            if not found:  # No duplicates.
-                for result in results:
-                    if reg_num == result["financingStatement"]["baseRegistrationNumber"]:
-                        new_results.append(result)
-                        break
+            if reg_num not in added_reg_nums:  # No duplicates.
+                added_reg_nums.add(reg_num)
+                if reg_num in results_by_reg_num:
+                    new_results.append(results_by_reg_num[reg_num])
     search_result.similar_match_count = similar_count
     return new_results
@@ -128,26 +128,19 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
         """Execute a search by registration number query."""
         reg_num = self.request_json["criteria"]["value"]
         row = None
+        columns = None
         try:
             result = db.session.execute(text(search_utils.REG_NUM_QUERY), {"query_value": reg_num.strip().upper()})
+            columns = search_utils.get_result_columns(result)
             row = result.first()
         except Exception as db_exception:  # noqa: B902; return nicer error
             logger.error("DB search_by_registration_number exception: " + str(db_exception))
             raise DatabaseException(db_exception) from db_exception
 
         if row is not None:
-            registration_type = str(row[0])
             # Remove state check for now - let the DB view take care of it.
-            timestamp = row[1]
-            result_json = [
-                {
-                    "baseRegistrationNumber": str(row[2]),
-                    "matchType": str(row[3]),
-                    "createDateTime": model_utils.format_ts(timestamp),
-                    "registrationType": registration_type,
-                }
-            ]
-            if reg_num != str(row[2]):
+            result_json = [search_utils.build_search_result_reg_num(row, columns)]
+            if reg_num != result_json[0]["baseRegistrationNumber"]:
                 result_json[0]["registrationNumber"] = reg_num
 
             self.returned_results_size = 1
@@ -161,162 +154,93 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
         """Execute a search query for either an aircraft DOT, MHR number, or serial number search type."""
         search_value = self.request_json["criteria"]["value"]
         query = search_utils.SERIAL_NUM_QUERY
+        build_result = search_utils.build_search_result_serial
         if self.search_type == "MH":
             query = search_utils.MHR_NUM_QUERY
             query = query.replace("CASE WHEN serial_number", "CASE WHEN mhr_number")
+            build_result = search_utils.build_search_result_mhr
         elif self.search_type == "AC":
             query = search_utils.AIRCRAFT_DOT_QUERY
-        rows = None
         try:
-            result = db.session.execute(text(query), {"query_value": search_value.strip().upper()})
-            rows = result.fetchall()
+            results_json, total_count = self.execute_search(
+                query, {"query_value": search_value.strip().upper()}, build_result
+            )
         except Exception as db_exception:  # noqa: B902; return nicer error
             logger.error("DB search_by_serial_type exception: " + str(db_exception))
             raise DatabaseException(db_exception) from db_exception
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                registration_type = str(row[0])
-                timestamp = row[1]
-                collateral = {"type": str(row[2]), "serialNumber": str(row[3])}
-                value = row[4]
-                if value is not None:
-                    collateral["year"] = int(value)
-                value = row[5]
-                if value is not None:
-                    collateral["make"] = str(value)
-                value = row[6]
-                if value is not None:
-                    collateral["model"] = str(value)
-                match_type = str(row[8])
-                if self.search_type == "MH":
-                    collateral["manufacturedHomeRegistrationNumber"] = str(row[12])
-                result_json = {
-                    "baseRegistrationNumber": str(row[7]),
-                    "matchType": match_type,
-                    "createDateTime": model_utils.format_ts(timestamp),
-                    "registrationType": registration_type,
-                    "vehicleCollateral": collateral,
-                }
-                results_json.append(result_json)
-
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            if self.returned_results_size > 0:
-                self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.set_search_response(results_json, total_count)
 
     def search_by_business_name(self):
         """Execute a debtor business name search query."""
         search_value = self.request_json["criteria"]["debtorName"]["business"]
-        rows = None
         try:
-            result = db.session.execute(
-                text(search_utils.BUSINESS_NAME_QUERY),
+            results_json, total_count = self.execute_search(
+                search_utils.BUSINESS_NAME_QUERY,
                 {
                     "query_bus_name": search_value.strip().upper(),
                     "query_bus_quotient": current_app.config.get("SIMILARITY_QUOTIENT_BUSINESS_NAME"),
                 },
+                search_utils.build_search_result_business,
             )
-            rows = result.fetchall()
         except Exception as db_exception:  # noqa: B902; return nicer error
             logger.error("DB search_by_business_name exception: " + str(db_exception))
             raise DatabaseException(db_exception) from db_exception
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                registration_type = str(row[0])
-                timestamp = row[1]
-                debtor = {"businessName": str(row[2]), "partyId": int(row[7])}
-                result_json = {
-                    "baseRegistrationNumber": str(row[3]),
-                    "matchType": str(row[4]),
-                    "createDateTime": model_utils.format_ts(timestamp),
-                    "registrationType": registration_type,
-                    "debtor": debtor,
-                }
-                results_json.append(result_json)
-
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            if self.returned_results_size > 0:
-                self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.set_search_response(results_json, total_count)
 
-    def search_by_individual_name(self):  # pylint: disable=too-many-locals; easier to follow
+    def search_by_individual_name(self):
         """Execute a debtor individual name search query."""
-        result = None
         middle_name = None
         last_name = self.request_json["criteria"]["debtorName"]["last"]
         first_name = self.request_json["criteria"]["debtorName"]["first"]
-        quotient_first = current_app.config.get("SIMILARITY_QUOTIENT_FIRST_NAME")
-        quotient_last = current_app.config.get("SIMILARITY_QUOTIENT_LAST_NAME")
-        quotient_default = current_app.config.get("SIMILARITY_QUOTIENT_DEFAULT")
         if "second" in self.request_json["criteria"]["debtorName"]:
             middle_name = self.request_json["criteria"]["debtorName"]["second"]
-        rows = None
+        query = search_utils.INDIVIDUAL_NAME_QUERY
+        query_params = {
+            "query_last": last_name.strip().upper(),
+            "query_first": first_name.strip().upper(),
+            "query_last_quotient": current_app.config.get("SIMILARITY_QUOTIENT_LAST_NAME"),
+            "query_first_quotient": current_app.config.get("SIMILARITY_QUOTIENT_FIRST_NAME"),
+            "query_default_quotient": current_app.config.get("SIMILARITY_QUOTIENT_DEFAULT"),
+        }
+        if middle_name is not None and middle_name.strip() != "" and middle_name.strip().upper() != "NONE":
+            query = search_utils.INDIVIDUAL_NAME_MIDDLE_QUERY
+            query_params["query_middle"] = middle_name.strip().upper()
         try:
-            if middle_name is not None and middle_name.strip() != "" and middle_name.strip().upper() != "NONE":
-                result = db.session.execute(
-                    text(search_utils.INDIVIDUAL_NAME_MIDDLE_QUERY),
-                    {
-                        "query_last": last_name.strip().upper(),
-                        "query_first": first_name.strip().upper(),
-                        "query_middle": middle_name.strip().upper(),
-                        "query_last_quotient": quotient_last,
-                        "query_first_quotient": quotient_first,
-                        "query_default_quotient": quotient_default,
-                    },
-                )
-            else:
-                result = db.session.execute(
-                    text(search_utils.INDIVIDUAL_NAME_QUERY),
-                    {
-                        "query_last": last_name.strip().upper(),
-                        "query_first": first_name.strip().upper(),
-                        "query_last_quotient": quotient_last,
-                        "query_first_quotient": quotient_first,
-                        "query_default_quotient": quotient_default,
-                    },
-                )
-            rows = result.fetchall()
+            results_json, total_count = self.execute_search(
+                query, query_params, search_utils.build_search_result_individual
+            )
         except Exception as db_exception:  # noqa: B902; return nicer error
             logger.error("DB search_by_individual_name exception: " + str(db_exception))
             raise DatabaseException(db_exception) from db_exception
-        if rows is not None:
-            results_json = []
-            for row in rows:
-                registration_type = str(row[0])
-                timestamp = row[1]
-                person = {"last": str(row[2]), "first": str(row[3])}
-                if row[4]:
-                    person["middle"] = str(row[4])
-                debtor = {"personName": person, "partyId": int(row[5])}
-                if row[10]:
-                    debtor["birthDate"] = model_utils.format_ts(row[10])
-                result_json = {
-                    "baseRegistrationNumber": str(row[6]),
-                    "matchType": str(row[7]),
-                    "createDateTime": model_utils.format_ts(timestamp),
-                    "registrationType": registration_type,
-                    "debtor": debtor,
-                }
-                results_json.append(result_json)
-
-            self.returned_results_size = len(results_json)
-            self.total_results_size = self.returned_results_size
-            if self.returned_results_size > 0:
-                self.search_response = results_json
-        else:
-            self.returned_results_size = 0
-            self.total_results_size = 0
+        self.set_search_response(results_json, total_count)
+
+    @staticmethod
+    def execute_search(query: str, query_params: dict, build_result):
+        """Execute a search query and build the results json and total match count in a single pass.
+
+        If a result set size limit is configured the total match count is taken from a window aggregate in the same
+        query, replacing the separate total count query.
+        """
+        max_results_size: int = current_app.config.get("SEARCH_RESULTS_LIMIT", 0)
+        if max_results_size and max_results_size > 0:
+            query = search_utils.build_limit_query(query)
+            query_params["max_results_size"] = max_results_size
+        result = search_utils.execute_search_query(query, query_params)
+        return search_utils.build_search_results(result, build_result)
+
+    def set_search_response(self, results_json: list, total_count: int):
+        """Set the search query results and result counts from the search results json."""
+        self.returned_results_size = len(results_json)
+        self.total_results_size = total_count
+        if self.returned_results_size > 0:
+            self.search_response = results_json
 
     def get_total_count(self):
-        """Execute a search to get the total match count for the search criteria. Only call if limit reached."""
+        """Execute a search to get the total match count for the search criteria.
+
+        Search queries with a result set size limit get the total match count from the same query: only call this
+        if the search query did not.
+        """
         query_text = search_utils.COUNT_QUERY_FROM_SEARCH_TYPE[self.search_type]
         if query_text:
             count_query = text(query_text)
@@ -352,20 +276,38 @@ class SearchRequest(db.Model):  # pylint: disable=too-many-instance-attributes
                 self.total_results_size = int(row[0])
 
     def search(self):
-        """Execute a search with the previously set search type and criteria."""
-        if self.search_type == self.SearchTypes.REGISTRATION_NUM.value:
-            self.search_by_registration_number()
-        elif self.search_type == self.SearchTypes.MANUFACTURED_HOME_NUM.value:
+        """Execute a search with the previously set search type and criteria.
+
+        Identical search criteria may be answered from the search response cache. The search request is always saved.
+        """
+        if self.search_type == self.SearchTypes.MANUFACTURED_HOME_NUM.value:
             # Format before searching
             search_utils.format_mhr_number(self.request_json)
-            self.search_by_serial_type()
-        elif self.search_type in (self.SearchTypes.SERIAL_NUM.value, self.SearchTypes.AIRCRAFT_AIRFRAME_DOT.value):
+        cache_key: str = search_utils.search_cache_key(self.search_type, self.request_json)
+        cached = search_utils.get_cached_search(cache_key)
+        if cached is not None:
+            self.search_response, self.returned_results_size, self.total_results_size = cached
+        else:
+            self.execute_search_type()
+            search_utils.set_cached_search(
+                cache_key, self.search_response, self.returned_results_size, self.total_results_size
+            )
+        self.save()
+
+    def execute_search_type(self):
+        """Execute the search query for the search type and set the search response and result counts."""
+        if self.search_type == self.SearchTypes.REGISTRATION_NUM.value:
+            self.search_by_registration_number()
+        elif self.search_type in (
+            self.SearchTypes.MANUFACTURED_HOME_NUM.value,
+            self.SearchTypes.SERIAL_NUM.value,
+            self.SearchTypes.AIRCRAFT_AIRFRAME_DOT.value,
+        ):
             self.search_by_serial_type()
         elif self.search_type == self.SearchTypes.BUSINESS_DEBTOR.value:
             self.search_by_business_name()
         else:
             self.search_by_individual_name()
-        self.save()
 
     @classmethod
     def find_by_id(cls, search_id: int):
@@ -15,7 +15,6 @@
 
 from __future__ import annotations
 
-import json
 from http import HTTPStatus
 
 from flask import current_app
@@ -129,7 +128,8 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
                     self.score = SCORE_LARGE_REPORT
                     logger.info("Setting score to mark report generation for large search container.")
             else:
-                results_length = len(json.dumps(new_results))
+                max_size: int = max(current_app.config.get("MAX_SIZE_SEARCH_RT"), LARGE_REPORT_JSON_SIZE)
+                results_length = model_utils.json_size(new_results, max_size)
                 logger.debug(f"Search id={self.search_id} data size={results_length}.")
                 if results_length > current_app.config.get("MAX_SIZE_SEARCH_RT"):
                     # Small results size but large report data: allow callback
@@ -139,7 +139,7 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
                         self.score = SCORE_LARGE_REPORT
                         logger.info("Setting score to mark report generation for large search container.")
         else:
-            results_length = len(json.dumps(new_results))
+            results_length = model_utils.json_size(new_results, current_app.config.get("MAX_SIZE_SEARCH_RT"))
             logger.debug(f"Search id= {self.search_id} results size={results_length}.")
             if results_length > current_app.config.get("MAX_SIZE_SEARCH_RT"):
                 logger.info(f"Search id={self.search_id} size exceeds RT max, setting up async report.")
@@ -148,8 +148,12 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
 
     def build_details(self):
         """Generate the search selection details from the search selection order without duplicates."""
-        results = self.search_response
+        # Index the registration list by base registration number: keep the first occurrence.
+        results_by_reg_num = {}
+        for result in self.search_response:
+            results_by_reg_num.setdefault(result["financingStatement"]["baseRegistrationNumber"], result)
         new_results = []
+        added_reg_nums = set()
         similar_count = 0
         # Use the same order as the search selection match list in the registration list.
         for select in self.search_select:
@@ -159,16 +163,9 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
                 if select["matchType"] != model_utils.SEARCH_MATCH_EXACT:
                     similar_count += 1
                 reg_num = select["baseRegistrationNumber"]
-                found = False
-                if new_results:  # Check for duplicates.
-                    for match in new_results:
-                        if match["financingStatement"]["baseRegistrationNumber"] == reg_num:
-                            found = True
-                if not found:  # No duplicates.
-                    for result in results:
-                        if reg_num == result["financingStatement"]["baseRegistrationNumber"]:
-                            new_results.append(result)
-                            break
+                if reg_num not in added_reg_nums and reg_num in results_by_reg_num:  # No duplicates.
+                    new_results.append(results_by_reg_num[reg_num])
+                    added_reg_nums.add(reg_num)
         self.similar_match_count = similar_count
         return new_results
 
@@ -181,18 +178,16 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
         # Remove duplicates
         reg_list = list(dict.fromkeys(reg_list))
         update_select = []
-        # Always use original exact matches
+        # Always use original exact matches, index original similar matches by base registration number.
+        similar_by_reg_num = {}
         for original in original_select:
             if original["matchType"] == model_utils.SEARCH_MATCH_EXACT:
                 update_select.append(original)
+            else:
+                similar_by_reg_num.setdefault(original["baseRegistrationNumber"], []).append(original)
         # Set similar matches with no duplicates.
         for reg_num in reg_list:
-            for original in original_select:
-                if (
-                    original["matchType"] != model_utils.SEARCH_MATCH_EXACT
-                    and original["baseRegistrationNumber"] == reg_num
-                ):
-                    update_select.append(original)
+            update_select.extend(similar_by_reg_num.get(reg_num, []))
 
         # Now sort by search type.
         if self.search.search_type == SearchRequest.SearchTypes.INDIVIDUAL_DEBTOR.value:
@@ -331,17 +326,16 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
         search_result = SearchResult(search_id=search_query.id, exact_match_count=0, similar_match_count=0)
         query_results = search_query.search_response
         detail_results = []
+        added_reg_nums = set()
+        statements = FinancingStatement.find_all_by_registration_numbers(
+            [result["baseRegistrationNumber"] for result in query_results]
+        )
         for result in query_results:
             reg_num = result["baseRegistrationNumber"]
             match_type = result["matchType"]
-            found = False
-            if detail_results:  # Check for duplicates.
-                for statement in detail_results:
-                    if statement["financingStatement"]["baseRegistrationNumber"] == reg_num:
-                        found = True
-            if not found:  # No duplicates.
-                # Set to staff for small performance gain: skip account id/historical checks.
-                financing = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+            if reg_num not in added_reg_nums:  # No duplicates.
+                added_reg_nums.add(reg_num)
+                financing = SearchResult.__get_statement(statements, reg_num)
                 financing.mark_update_json = mark_added  # Added for PDF, indicate if party or collateral was added.
                 # Set to true to include change history.
                 financing.include_changes_json = True
@@ -362,10 +356,11 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
         search.search_id = search_id
         search.search_select = search_json
         detail_results = []
+        statements = FinancingStatement.find_all_by_registration_numbers(
+            [result["baseRegistrationNumber"] for result in search_json]
+        )
         for result in search_json:
-            reg_num = result["baseRegistrationNumber"]
-            # Set to staff for small performance gain: skip account id/historical checks.
-            financing = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+            financing = SearchResult.__get_statement(statements, result["baseRegistrationNumber"])
             # Set to true to include change history.
             financing.include_changes_json = True
             financing_json = {"financingStatement": financing.json}
@@ -374,6 +369,15 @@ class SearchResult(db.Model):  # pylint: disable=too-many-instance-attributes
 
         return search
 
+    @staticmethod
+    def __get_statement(statements: dict, reg_num: str) -> FinancingStatement:
+        """Get a bulk loaded financing statement, falling back to the single lookup to report a missing statement."""
+        financing = statements.get(reg_num)
+        if not financing:
+            # Set to staff for small performance gain: skip account id/historical checks.
+            financing = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+        return financing
+
     @staticmethod
     def validate_search_select(select_json, search_id: int):  # pylint: disable=unused-argument
         """Perform any extra data validation here.
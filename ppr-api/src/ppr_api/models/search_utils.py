@@ -15,7 +15,18 @@
 
 Search constants and helper functions.
 """
+import copy
+import json
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+
 from ppr_api.models import utils as model_utils
+from ppr_api.utils.cache import TTLCache
+
+from .db import db
 
 # flake8: noqa Q000,E122,E131
 # Disable Q000: Allow query strings to be in double quotation marks that contain single quotation marks.
@@ -31,8 +42,20 @@ ACCOUNT_SEARCH_HISTORY_MAX_SIZE = 1000
 # Maximum number or results returned by search.
 SEARCH_RESULTS_MAX_SIZE = 5000
 
+# Number of rows fetched from a search query cursor at a time when building the search results json.
+SEARCH_RESULTS_CHUNK_SIZE = 500
+
 # Result set size limit clause
 RESULTS_SIZE_LIMIT_CLAUSE = "FETCH FIRST :max_results_size ROWS ONLY"
+# Search query total match count window aggregate: evaluated before the result set size limit is applied.
+TOTAL_COUNT_SELECT = ", COUNT(*) OVER() AS total_count"
+TOTAL_COUNT_COLUMN = "total_count"
+SEARCH_QUERY_FROM = "\n  FROM registrations r, financing_statements fs"
+
+# Search response cache: a committed change to any of these tables may change a search response.
+SEARCH_CACHE_TABLES = ("registrations", "financing_statements", "parties", "serial_collateral")
+SEARCH_CACHE_CHANGED_KEY = "search_cache_changed"
+_search_cache: TTLCache = None
 
 # Accoun search filtering, soriting request parameters
 FROM_UI_PARAM = "fromUI"
@@ -105,16 +128,12 @@ SELECT r.registration_type,r.registration_ts AS base_registration_ts,
         r.registration_number AS base_registration_num,
         CASE WHEN serial_number = :query_value THEN 'EXACT' ELSE 'SIMILAR' END match_type,
         fs.expire_date,fs.state_type,sc.id AS vehicle_id, sc.mhr_number
-  FROM registrations r, financing_statements fs, serial_collateral sc 
+  FROM registrations r, financing_statements fs, serial_collateral sc, searchable_financing_statements sfs
  WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id 
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND sc.financing_id = fs.id
    AND sc.registration_id_end IS NULL
 """
@@ -124,17 +143,13 @@ REG_NUM_QUERY = """
 SELECT r2.registration_type, r2.registration_ts AS base_registration_ts, 
        r2.registration_number AS base_registration_num,
        'EXACT' AS match_type, fs.state_type, fs.expire_date
-  FROM registrations r, financing_statements fs, registrations r2
+  FROM registrations r, financing_statements fs, registrations r2, searchable_financing_statements sfs
  WHERE r.financing_id = fs.id
    AND r2.financing_id = fs.id
    AND r2.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.registration_number = :query_value
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
 """
 
 # Equivalent logic as DB view search_by_mhr_num_vw, but API determines the where clause.
@@ -179,16 +194,12 @@ SELECT r.registration_type,r.registration_ts AS base_registration_ts,
        CASE WHEN p.bus_name_base = search_name_base THEN 'EXACT'
             ELSE 'SIMILAR' END match_type,
        fs.expire_date,fs.state_type,p.id
-  FROM registrations r, financing_statements fs, parties p, q
+  FROM registrations r, financing_statements fs, parties p, q, searchable_financing_statements sfs
 WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND p.financing_id = fs.id
    AND p.registration_id_end IS NULL
    AND p.party_type = 'DB'
@@ -219,16 +230,12 @@ SELECT r.registration_type,r.registration_ts AS base_registration_ts,
                  AND p.first_name_char1 = LEFT(:query_first, 1) THEN 'EXACT'
             ELSE 'SIMILAR' END match_type,
        fs.expire_date,fs.state_type, p.birth_date
-  FROM registrations r, financing_statements fs, parties p, q
+  FROM registrations r, financing_statements fs, parties p, q, searchable_financing_statements sfs
 WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND p.financing_id = fs.id
    AND p.registration_id_end IS NULL
    AND p.party_type = 'DI'
@@ -258,16 +265,12 @@ SELECT r.registration_type,r.registration_ts AS base_registration_ts,
                  (p.middle_initial is NULL OR LEFT(p.middle_initial, 1) = LEFT(:query_middle, 1)) THEN 'EXACT'
             ELSE 'SIMILAR' END match_type,
        fs.expire_date,fs.state_type, p.birth_date
-  FROM registrations r, financing_statements fs, parties p, q
+  FROM registrations r, financing_statements fs, parties p, q, searchable_financing_statements sfs
 WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND p.financing_id = fs.id
    AND p.registration_id_end IS NULL
    AND p.party_type = 'DI'
@@ -282,16 +285,12 @@ WITH q AS (
    SELECT searchkey_business_name(:query_bus_name) AS search_key
 )
 SELECT COUNT(r.id) AS query_count
-  FROM registrations r, financing_statements fs, parties p, q
+  FROM registrations r, financing_statements fs, parties p, q, searchable_financing_statements sfs
  WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND p.financing_id = fs.id
    AND p.registration_id_end IS NULL
    AND p.party_type = 'DB'
@@ -301,16 +300,12 @@ SELECT COUNT(r.id) AS query_count
 
 INDIVIDUAL_NAME_TOTAL_COUNT = """
 SELECT COUNT(r.id) AS query_count
-  FROM registrations r, financing_statements fs, parties p
+  FROM registrations r, financing_statements fs, parties p, searchable_financing_statements sfs
  WHERE r.financing_id = fs.id
    AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
    AND r.base_reg_number IS NULL
-   AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-   AND NOT EXISTS (SELECT r3.id
-                     FROM registrations r3
-                    WHERE r3.financing_id = fs.id
-                      AND r3.registration_type_cl = 'DISCHARGE'
-                      AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+   AND sfs.financing_id = fs.id
+   AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
    AND p.financing_id = fs.id
    AND p.registration_id_end IS NULL
    AND p.party_type = 'DI'
@@ -320,16 +315,12 @@ SELECT COUNT(r.id) AS query_count
 
 SERIAL_SEARCH_COUNT_BASE = """
 SELECT COUNT(r.id) AS query_count
-  FROM registrations r, financing_statements fs, serial_collateral sc
+  FROM registrations r, financing_statements fs, serial_collateral sc, searchable_financing_statements sfs
   WHERE r.financing_id = fs.id
     AND r.registration_type_cl IN ('PPSALIEN', 'MISCLIEN', 'CROWNLIEN')
     AND r.base_reg_number IS NULL
-    AND (fs.expire_date IS NULL OR fs.expire_date > ((now() at time zone 'utc') - interval '30 days'))
-    AND NOT EXISTS (SELECT r3.id
-                      FROM registrations r3
-                     WHERE r3.financing_id = fs.id
-                       AND r3.registration_type_cl = 'DISCHARGE'
-                       AND r3.registration_ts < ((now() at time zone 'utc') - interval '30 days'))
+    AND sfs.financing_id = fs.id
+    AND (sfs.search_until_ts IS NULL OR sfs.search_until_ts > (now() at time zone 'utc'))
     AND sc.financing_id = fs.id
     AND sc.registration_id_end IS NULL 
 """
@@ -434,6 +425,193 @@ def format_mhr_number(request_json):
     request_json["criteria"]["value"] = mhr_num
 
 
+def get_search_cache() -> TTLCache:
+    """Return the process search response cache, creating it from the app configuration on first use."""
+    global _search_cache  # pylint: disable=global-statement
+    if _search_cache is None:
+        _search_cache = TTLCache(
+            current_app.config.get("SEARCH_CACHE_MAX_SIZE", 500), current_app.config.get("SEARCH_CACHE_TTL", 120)
+        )
+    return _search_cache
+
+
+def search_cache_key(search_type: str, request_json: dict) -> str:
+    """Return the search response cache key for the search criteria, or None if search caching is disabled.
+
+    Criteria values are trimmed and, except for a registration number search that returns the requested value,
+    converted to upper case as the search queries do. Debtor name searches include the similarity quotients.
+    """
+    if not current_app.config.get("SEARCH_CACHE_ENABLED"):
+        return None
+    to_upper: bool = search_type != "RG"
+
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(val) for key, val in value.items()}
+        if isinstance(value, str):
+            return value.strip().upper() if to_upper else value.strip()
+        return value
+
+    key = {"type": search_type, "criteria": normalize(request_json.get("criteria", {}))}
+    if search_type == "BS":
+        key["quotients"] = [current_app.config.get("SIMILARITY_QUOTIENT_BUSINESS_NAME")]
+    elif search_type == "IS":
+        key["quotients"] = [
+            current_app.config.get("SIMILARITY_QUOTIENT_LAST_NAME"),
+            current_app.config.get("SIMILARITY_QUOTIENT_FIRST_NAME"),
+            current_app.config.get("SIMILARITY_QUOTIENT_DEFAULT"),
+        ]
+    return json.dumps(key, sort_keys=True)
+
+
+def get_cached_search(cache_key: str):
+    """Return a copy of the cached (search_response, returned_results_size, total_results_size) or None."""
+    if not cache_key:
+        return None
+    cached = get_search_cache().get(cache_key)
+    return copy.deepcopy(cached) if cached is not None else None
+
+
+def set_cached_search(cache_key: str, search_response, returned_results_size: int, total_results_size: int):
+    """Cache a copy of the search response and result counts for the search criteria."""
+    if cache_key:
+        get_search_cache().set(cache_key, copy.deepcopy((search_response, returned_results_size, total_results_size)))
+
+
+@event.listens_for(Session, "after_flush")
+def _search_cache_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    """Flag the session if the flush changed a table the search responses are built from."""
+    if _search_cache is None or session.info.get(SEARCH_CACHE_CHANGED_KEY):
+        return
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if getattr(instance, "__tablename__", None) in SEARCH_CACHE_TABLES:
+            session.info[SEARCH_CACHE_CHANGED_KEY] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _search_cache_after_commit(session):
+    """Clear the search response cache when a committed change may alter a search response."""
+    if session.info.pop(SEARCH_CACHE_CHANGED_KEY, None) and _search_cache is not None:
+        _search_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _search_cache_after_rollback(session):
+    """Rolled back changes do not alter search responses."""
+    session.info.pop(SEARCH_CACHE_CHANGED_KEY, None)
+
+
+def execute_search_query(query: str, query_params: dict):
+    """Execute a search query with a server side cursor so the result rows can be streamed in chunks."""
+    return db.session.execute(text(query), query_params, execution_options={"stream_results": True})
+
+
+def build_limit_query(query: str) -> str:
+    """Add the total match count window aggregate and the result set size limit to a search query.
+
+    The total match count is computed in the same statement, so a search that reaches the limit does not need a
+    second count query.
+    """
+    query = query.replace(SEARCH_QUERY_FROM, TOTAL_COUNT_SELECT + SEARCH_QUERY_FROM, 1)
+    return query + RESULTS_SIZE_LIMIT_CLAUSE
+
+
+def get_result_columns(result) -> dict:
+    """Map the search query result column names to row positions.
+
+    The mapping is built once per query result from the result keys and used by the result builders for the rows of
+    every partition, so columns are read by name without a mapping object per row.
+    """
+    return {name: index for index, name in enumerate(result.keys())}
+
+
+def build_search_results(result, build_result):
+    """Build the search results json and the total match count from a streamed query result.
+
+    Rows are fetched SEARCH_RESULTS_CHUNK_SIZE at a time and mapped to json by the search type result builder, so
+    only the json and the current chunk of rows are held in memory. If the query includes the total count window
+    aggregate the total match count is taken from it, otherwise it is the number of results.
+    """
+    columns: dict = get_result_columns(result)
+    total_index = columns.get(TOTAL_COUNT_COLUMN)
+    results_json = []
+    total_count = None
+    for rows in result.partitions(SEARCH_RESULTS_CHUNK_SIZE):
+        if total_count is None and rows and total_index is not None:
+            total_count = int(rows[0][total_index])
+        results_json.extend(build_result(row, columns) for row in rows)
+    return results_json, total_count if total_count is not None else len(results_json)
+
+
+def build_search_result_reg_num(row, columns: dict) -> dict:
+    """Build a single search summary json from a DB row for a registration number search."""
+    return {
+        "baseRegistrationNumber": str(row[columns["base_registration_num"]]),
+        "matchType": str(row[columns["match_type"]]),
+        "createDateTime": model_utils.format_ts(row[columns["base_registration_ts"]]),
+        "registrationType": str(row[columns["registration_type"]]),
+    }
+
+
+def build_search_result_serial(row, columns: dict) -> dict:
+    """Build a single search summary json from a DB row for a serial number or aircraft DOT search."""
+    collateral = {"type": str(row[columns["serial_type"]]), "serialNumber": str(row[columns["serial_number"]])}
+    year = row[columns["year"]]
+    if year is not None:
+        collateral["year"] = int(year)
+    make = row[columns["make"]]
+    if make is not None:
+        collateral["make"] = str(make)
+    model = row[columns["model"]]
+    if model is not None:
+        collateral["model"] = str(model)
+    return {
+        "baseRegistrationNumber": str(row[columns["base_registration_num"]]),
+        "matchType": str(row[columns["match_type"]]),
+        "createDateTime": model_utils.format_ts(row[columns["base_registration_ts"]]),
+        "registrationType": str(row[columns["registration_type"]]),
+        "vehicleCollateral": collateral,
+    }
+
+
+def build_search_result_mhr(row, columns: dict) -> dict:
+    """Build a single search summary json from a DB row for a manufactured home registration number search."""
+    result_json = build_search_result_serial(row, columns)
+    result_json["vehicleCollateral"]["manufacturedHomeRegistrationNumber"] = str(row[columns["mhr_number"]])
+    return result_json
+
+
+def build_search_result_business(row, columns: dict) -> dict:
+    """Build a single search summary json from a DB row for a business debtor name search."""
+    return {
+        "baseRegistrationNumber": str(row[columns["base_registration_num"]]),
+        "matchType": str(row[columns["match_type"]]),
+        "createDateTime": model_utils.format_ts(row[columns["base_registration_ts"]]),
+        "registrationType": str(row[columns["registration_type"]]),
+        "debtor": {"businessName": str(row[columns["business_name"]]), "partyId": int(row[columns["id"]])},
+    }
+
+
+def build_search_result_individual(row, columns: dict) -> dict:
+    """Build a single search summary json from a DB row for an individual debtor name search."""
+    person = {"last": str(row[columns["last_name"]]), "first": str(row[columns["first_name"]])}
+    middle = row[columns["middle_initial"]]
+    if middle:
+        person["middle"] = str(middle)
+    debtor = {"personName": person, "partyId": int(row[columns["id"]])}
+    birth_date = row[columns["birth_date"]]
+    if birth_date:
+        debtor["birthDate"] = model_utils.format_ts(birth_date)
+    return {
+        "baseRegistrationNumber": str(row[columns["base_registration_num"]]),
+        "matchType": str(row[columns["match_type"]]),
+        "createDateTime": model_utils.format_ts(row[columns["base_registration_ts"]]),
+        "registrationType": str(row[columns["registration_type"]]),
+        "debtor": debtor,
+    }
+
+
 class AccountSearchParams:
     """Contains parameter values to use when querying account summary search history information."""
 
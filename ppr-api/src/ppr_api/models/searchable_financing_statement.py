@@ -0,0 +1,39 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This module holds the search end time of financing statements that may still be returned by a search.
+
+A financing statement is searchable until 30 days after it expires or is discharged. Rather than check the expiry
+date and discharge registrations of every candidate financing statement in every search query, the searches join on
+this table. Rows are maintained by the searchable_financing_statement_refresh database trigger on every financing
+statement and registration insert or update, however the change is written. The ppr-registrations-historical job
+removes the rows of statements that are no longer searchable.
+"""
+from .db import db
+
+
+class SearchableFinancingStatement(db.Model):  # pylint: disable=too-few-public-methods
+    """This class maintains the time each financing statement stops being returned by a search."""
+
+    __tablename__ = "searchable_financing_statements"
+
+    financing_id = db.mapped_column("financing_id", db.Integer, primary_key=True)
+    # Null if the financing statement never expires and has not been discharged.
+    search_until_ts = db.mapped_column("search_until_ts", db.DateTime, nullable=True, index=True)
+
+    @classmethod
+    def find_by_financing_id(cls, financing_id: int):
+        """Return the searchable financing statement by financing statement id."""
+        if not financing_id:
+            return None
+        return db.session.query(SearchableFinancingStatement).filter(cls.financing_id == financing_id).one_or_none()
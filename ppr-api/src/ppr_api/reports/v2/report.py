@@ -10,27 +10,26 @@
 # specific language governing permissions and limitations under the License.
 """Produces a PDF output based on templates and JSON messages."""
 import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from http import HTTPStatus
 from pathlib import Path
 
 import markupsafe
 import pycountry
-import requests
 from flask import current_app
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ppr_api.callback.auth.token_service import GoogleStorageTokenService
 from ppr_api.models import utils as model_utils
 from ppr_api.reports.v2 import report_utils
+from ppr_api.reports.v2.report_client import ReportClient
 from ppr_api.reports.v2.report_utils import ReportMeta, ReportTypes
 from ppr_api.utils.logging import logger
 
 SINGLE_URI = "/forms/chromium/convert/html"
 MERGE_URI = "/forms/pdfengines/merge"
 SUBREPORT_SIZE = 500
-RS_TIMEOUT = 1800.0
 
 
 class Report:  # pylint: disable=too-few-public-methods
@@ -54,7 +53,7 @@ class Report:  # pylint: disable=too-few-public-methods
         return GoogleStorageTokenService.get_report_api_token(rs_url)
 
     def send_request(self, uri: str, meta_data, files, rs_token):
-        """Post report generation request to the report service with a retry strategy on 502, 503 responses."""
+        """Post report generation request to the report service with the shared report client retry strategy."""
         url = current_app.config.get("REPORT_SVC_URL") + uri
         if self.large_container:
             if current_app.config.get("REPORT_SVC_LARGE_URL"):
@@ -68,15 +67,7 @@ class Report:  # pylint: disable=too-few-public-methods
         logger.debug(
             "Account {0} report type {1} calling report-api {2}.".format(self._account_id, self._report_key, url)
         )
-        retry_strategy = Retry(total=4, backoff_factor=1.0, status_forcelist=[502, 503])
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        http = requests.Session()
-        http.mount("https://", adapter)
-        response = http.post(url=url, headers=headers, data=meta_data, files=files, timeout=RS_TIMEOUT)
-        if response.status_code == HTTPStatus.BAD_GATEWAY and self.large_container:
-            response = http.post(url=url, headers=headers, data=meta_data, files=files, timeout=RS_TIMEOUT)
-        if response.status_code == HTTPStatus.BAD_GATEWAY and self.large_container:
-            response = http.post(url=url, headers=headers, data=meta_data, files=files, timeout=RS_TIMEOUT)
+        response = ReportClient.post(url=url, headers=headers, data=meta_data, files=files)
         logger.info(
             "Account {0} report type {1} response status: {2}.".format(
                 self._account_id, self._report_key, response.status_code
@@ -112,21 +103,73 @@ class Report:  # pylint: disable=too-few-public-methods
         return response.content, response.status_code, {"Content-Type": "application/pdf"}
 
     def get_search_pdf(self):
-        """Render a search report with TOC page numbers set in a second report call."""
+        """Render a search report with TOC page numbers set from an initial report call.
+
+        The final report replaces the initial report TOC pages with a render of only the TOC pages, falling back to
+        rendering the entire report again if the TOC pages cannot be replaced.
+        """
         logger.debug("Account {0} report type {1} setting up report data.".format(self._account_id, self._report_key))
+        token = self.get_report_service_token()
+        content, status_code, headers = self._get_search_initial_pdf(token)
+        if status_code != HTTPStatus.OK:
+            return content, status_code, headers
+        if self._report_data.get("totalResultsSize", 0) < 1:
+            # No TOC page numbers: the initial report is the final report.
+            return content, status_code, headers
+        if current_app.config.get("REPORT_SEARCH_TOC_MERGE") and not self._report_data.get("search_large"):
+            report_pdf = self._get_search_toc_merged_pdf(token, content)
+            if report_pdf:
+                return report_pdf, status_code, headers
+        return self._get_search_final_pdf(token)
+
+    def _get_search_initial_pdf(self, token):
+        """Render the search report with no TOC page numbers and set the report data TOC page numbers from it."""
         data_copy = copy.deepcopy(self._report_data)
         # 1: Generate the search pdf with no TOC page numbers or total page count.
         data = self._setup_report_data()
         meta_data = report_utils.get_report_meta_data(self._report_key)
-        token = self.get_report_service_token()
         files = report_utils.get_report_files(data, self._report_key, False, False)
         response_reg = self.send_request(SINGLE_URI, meta_data, files, token)
         if response_reg.status_code != HTTPStatus.OK:
             return report_utils.report_error(response_reg, self._report_key, self._account_id)
         # 2: Set TOC page numbers in report data from initial search pdf page numbering.
         self._report_data = report_utils.update_toc_page_numbers(data_copy, response_reg.content)
+        return response_reg.content, response_reg.status_code, {"Content-Type": "application/pdf"}
+
+    def _get_search_toc_merged_pdf(self, token, report_pdf):
+        """Render only the TOC pages with page numbers set and replace the initial search report TOC pages.
+
+        Registrations start on a new page, so the TOC pages are the pages before the first registration page.
+        Returns None if the TOC pages cannot be replaced.
+        """
+        toc_page_count: int = report_utils.get_toc_page_count(self._report_data)
+        if toc_page_count < 1:
+            return None
+        toc_data = {key: value for key, value in self._report_data.items() if key != "details"}
+        toc_report = Report(copy.deepcopy(toc_data), self._account_id, self._report_key, self._account_name)
+        toc_report.large_container = self.large_container
+        toc_report._report_data["details"] = []  # pylint: disable=protected-access
+        data = toc_report._setup_report_data()  # pylint: disable=protected-access
+        meta_data = report_utils.get_report_meta_data(self._report_key)
+        files = report_utils.get_report_files(data, self._report_key, False, False)
+        files["footer.html"] = report_utils.set_footer_total_pages(
+            files["footer.html"], self._report_data.get("totalPageCount")
+        )
+        logger.info(f"Search report generating {toc_page_count} TOC pages with page numbers set.")
+        response = self.send_request(SINGLE_URI, meta_data, files, token)
+        if response.status_code != HTTPStatus.OK:
+            logger.warning(f"Search report TOC generation failed status={response.status_code}.")
+            return None
+        report_pdf = report_utils.replace_toc_pages(report_pdf, response.content, toc_page_count)
+        if not report_pdf:
+            logger.warning("Search report TOC page count mismatch: regenerating the report.")
+        return report_pdf
+
+    def _get_search_final_pdf(self, token):
+        """Render the search report with the TOC page numbers and total page count set."""
         # 3: Generate search report again with TOC page numbers and total page count.
         data_final = self._setup_report_data()
+        meta_data = report_utils.get_report_meta_data(self._report_key)
         files = report_utils.get_report_files(data_final, self._report_key, False, False)
         logger.info("Search report regenerating with TOC page numbers set.")
         response = self.send_request(SINGLE_URI, meta_data, files, token)
@@ -136,60 +179,77 @@ class Report:  # pylint: disable=too-few-public-methods
         return response.content, response.status_code, {"Content-Type": "application/pdf"}
 
     def get_large_search_pdf(self):  # pylint: disable=too-many-locals
-        """Render a large search report as concatenated sub-reports."""
+        """Render a large search report as concatenated sub-reports.
+
+        Sub-reports are rendered concurrently by up to REPORT_SEARCH_PARALLEL workers in 2 steps. The first step
+        gets each sub-report page count and sub-report relative TOC page numbers. After all sub-reports complete the
+        first step the page offsets are known, and the second step renders the sub-reports with the report TOC page
+        numbers.
+        """
         logger.debug(f"Account {self._account_id} large search setting up report data.")
         data_copy = copy.deepcopy(self._report_data)
         data_length = len(data_copy["details"])
         search_ts = data_copy.get("searchDateTime")
-        subreport_count = 0
-        start_index = 0
-        end_index = SUBREPORT_SIZE
-        report_files = {}
-        details = data_copy["details"]
-        selected = data_copy["selected"]
+        details = data_copy.pop("details")
+        selected = data_copy.pop("selected")
         select_index = 0
         rep_count = int(data_length / SUBREPORT_SIZE) + ((data_length / SUBREPORT_SIZE) % 1 > 0)
+        sub_reports = []
+        sub_selected = []
+        for start_index in range(0, data_length, SUBREPORT_SIZE):
+            subreport_count = len(sub_reports) + 1
+            logger.debug(f"Account {self._account_id} building subreport {subreport_count} start index={start_index}")
+            sub_details = details[start_index : start_index + SUBREPORT_SIZE]
+            sub_selected.append(report_utils.get_subreport_selected(selected[select_index:], sub_details))
+            select_index += len(sub_selected[-1])
+            sub_data = copy.deepcopy(data_copy)
+            sub_data["details"] = copy.deepcopy(sub_details)
+            sub_data["selected"] = copy.deepcopy(sub_selected[-1])
+            sub_data["subreport"] = f"{subreport_count} of {rep_count}"
+            sub_data["pageNumOffset"] = 0
+            sub_report = Report(sub_data, self._account_id, self._report_key, self._account_name)
+            sub_report.large_container = self.large_container
+            sub_reports.append(sub_report)
+
+        token = self.get_report_service_token()
+        responses = self._run_subreports(
+            sub_reports, "page numbers", lambda report: report._get_search_initial_pdf(token)  # pylint: disable=W0212
+        )
+        for content, status_code, headers in responses:
+            if status_code != HTTPStatus.OK:
+                return content, status_code, headers
+        # Sub-report TOC page numbers are relative: add the number of pages in the previous sub-reports.
+        page_offset: int = 0
         rep_summary = []
-        self._report_data["pageNumOffset"] = 0
-        while start_index < data_length:
-            subreport_count += 1
-            logger.info(f"Account {self._account_id} building subreport {subreport_count}")
-            logger.debug(f"Start index={start_index} end index={end_index}")
-            self._report_data["details"] = details[start_index:end_index]
-            logger.debug("Details length=" + str(len(self._report_data["details"])))
-            # logger.debug(f'Select index={select_index} length=' + str(len(selected)))
-            self._report_data["selected"] = report_utils.get_subreport_selected(
-                selected[select_index:], self._report_data["details"]
-            )
-            logger.debug(f"Select index={select_index} length=" + str(len(self._report_data["selected"])))
-            self._report_data["searchDateTime"] = search_ts
-            self._report_data["subreport"] = f"{subreport_count} of {rep_count}"
+        for subreport_count, sub_report in enumerate(sub_reports, start=1):
+            report_data = sub_report._report_data  # pylint: disable=protected-access
+            for select in report_data["selected"]:
+                if select.get("pageNumber"):
+                    select["pageNumber"] += page_offset
             rep_summary.append(
                 report_utils.get_report_summary(
-                    self._report_data["selected"],
-                    subreport_count,
-                    len(self._report_data["details"]),
-                    self._report_data["pageNumOffset"],
+                    sub_selected[subreport_count - 1], subreport_count, len(report_data["details"]), page_offset
                 )
             )
-            content, status_code, headers = self.get_search_pdf()
+            page_offset += report_data.get("totalPageCount", 0)
+        responses = self._run_subreports(
+            sub_reports, "render", lambda report: report._get_search_final_pdf(token)  # pylint: disable=W0212
+        )
+        report_files = {}
+        for subreport_count, (content, status_code, headers) in enumerate(responses, start=1):
             if status_code != HTTPStatus.OK:
                 return content, status_code, headers
-            report_key = f"pdf{subreport_count}.pdf"
-            report_files[report_key] = content
-            start_index += SUBREPORT_SIZE
-            end_index += SUBREPORT_SIZE
-            select_index += len(self._report_data["selected"])
+            report_files[f"pdf{subreport_count}.pdf"] = content
 
         # Build cover summary
         cover_data = {
             "searchDateTime": search_ts,
-            "reportCount": subreport_count,
+            "reportCount": len(sub_reports),
             "totalResultsSize": data_length,
             "exactResultsSize": report_utils.get_exact_count(selected),
             "searchQuery": data_copy["searchQuery"],
             "reports": rep_summary,
-            "reportPageCount": self._report_data["pageNumOffset"],
+            "reportPageCount": page_offset,
         }
         # logger.info(cover_data)
         self._report_key = ReportTypes.SEARCH_COVER_REPORT
@@ -199,7 +259,28 @@ class Report:  # pylint: disable=too-few-public-methods
             return content, status_code, headers
         report_files["cover.pdf"] = content
         # Merge subreports
-        return report_utils.merge_pdfs(report_files), status_code, {"Content-Type": "application/pdf"}
+        return report_utils.merge_pdfs_file(report_files), status_code, {"Content-Type": "application/pdf"}
+
+    def _run_subreports(self, sub_reports: list, step_name: str, run_step) -> list:
+        """Run a large search sub-report generation step on a bounded worker pool, returning the results in order."""
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        max_workers: int = max(1, min(len(sub_reports), current_app.config.get("REPORT_SEARCH_PARALLEL", 1)))
+        logger.info(f"Account {self._account_id} {len(sub_reports)} subreports {step_name} with {max_workers} workers.")
+
+        def run_subreport(subreport_count: int, sub_report):
+            with app.app_context():
+                start_time = time.perf_counter()
+                try:
+                    result = run_step(sub_report)
+                except Exception as err:  # noqa: B902; log the failed subreport, the caller gets the exception
+                    logger.error(f"Account {self._account_id} subreport {subreport_count} {step_name} failed: {err}")
+                    raise err
+                elapsed: float = time.perf_counter() - start_time
+                logger.info(f"Account {self._account_id} subreport {subreport_count} {step_name} took {elapsed:.3f}s.")
+                return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run_subreport, range(1, len(sub_reports) + 1), sub_reports))
 
     def get_registration_mail_pdf(self):
         """Render a mail registration report with cover letter."""
@@ -285,17 +366,24 @@ class Report:  # pylint: disable=too-few-public-methods
         return report_id
 
     def _get_template(self):
-        """Load from the local file system the template matching the report type."""
+        """Get from the template cache the template matching the report type."""
         try:
             template_path = current_app.config.get("REPORT_TEMPLATE_PATH")
-            template_code = Path(f"{template_path}/{self._get_template_filename()}").read_text(encoding="UTF-8")
-            # substitute template parts
-            template_code = self._substitute_template_parts(template_code)
+            template_code = report_utils.TemplateCache.get_template(
+                template_path, self._get_template_filename(), Report._load_template
+            )
         except Exception as err:  # noqa: B902; just logging
             logger.error(err)
             raise err
         return template_code
 
+    @staticmethod
+    def _load_template(template_path: str, file_name: str):
+        """Load from the local file system the template matching the file name."""
+        template_code = Path(f"{template_path}/{file_name}").read_text(encoding="UTF-8")
+        # substitute template parts
+        return Report._substitute_template_parts(template_code)
+
     @staticmethod
     def _substitute_template_parts(template_code):
         """Substitute template parts in main template.
@@ -954,3 +1042,17 @@ class Report:  # pylint: disable=too-few-public-methods
             local_datetime = local_datetime + timedelta(hours=offset)
         timestamp = local_datetime.strftime("%B %-d, %Y at %-I:%M:%S %p Pacific time")
         return timestamp.replace(" PM ", " pm ")
+
+
+def init_template_cache(app):
+    """Load the report templates into the template cache at app startup."""
+    with app.app_context():
+        template_path = app.config.get("REPORT_TEMPLATE_PATH")
+        for report_meta in ReportMeta.reports.values():
+            file_name: str = "{}.html".format(report_meta["fileName"])
+            if not Path(f"{template_path}/{file_name}").exists():
+                continue
+            try:
+                report_utils.TemplateCache.get_template(template_path, file_name, Report._load_template)
+            except Exception as err:  # noqa: B902; just logging
+                logger.error(f"Error loading report template {file_name}: " + str(err))
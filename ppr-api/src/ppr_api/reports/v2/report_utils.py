@@ -10,13 +10,16 @@
 # specific language governing permissions and limitations under the License.
 """Helper/utility functions for report generation."""
 import copy
+import hashlib
 import io
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
 import PyPDF2
 from flask import current_app
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template
+from PyPDF2.generic import NameObject
 
 from ppr_api.models import utils as model_utils
 from ppr_api.utils.base import BaseEnum
@@ -49,6 +52,7 @@ REPORT_META_DATA = {
 }
 REPORT_FILES = {"index.html": "", "header.html": "", "footer.html": ""}
 REG_PAGE_PREFIX = "Number: "
+FOOTER_TOTAL_PAGES = '<span class="totalPages"></span>'
 
 # Map from API search type to report description
 TO_SEARCH_DESCRIPTION = {
@@ -173,6 +177,81 @@ class ReportMeta:  # pylint: disable=too-few-public-methods
     }
 
 
+class TemplateCache:  # pylint: disable=too-few-public-methods
+    """Process level cache of report templates with the template parts substituted.
+
+    Templates are keyed by the template path and report template file name. When REPORT_TEMPLATE_RELOAD is set
+    (development) a template is loaded again if a template file has been modified since it was cached.
+    """
+
+    templates: dict = {}
+
+    @classmethod
+    def get_template(cls, template_path: str, file_name: str, load_template) -> str:
+        """Get a cached template, using the load_template function to load it if not cached or modified."""
+        key: str = f"{template_path}/{file_name}"
+        modified: float = None
+        if current_app.config.get("REPORT_TEMPLATE_RELOAD"):
+            modified = get_template_modified(template_path, file_name)
+        cached = cls.templates.get(key)
+        if cached and cached[0] == modified:
+            return cached[1]
+        template_code: str = load_template(template_path, file_name)
+        cls.templates[key] = (modified, template_code)
+        logger.info(f"Loaded report template {key} into the template cache.")
+        return template_code
+
+
+def get_template_modified(template_path: str, file_name: str) -> float:
+    """Get the most recent modification time of a report template and the template parts."""
+    modified: float = Path(f"{template_path}/{file_name}").stat().st_mtime
+    for part_path in Path(f"{template_path}/template-parts").rglob("*.html"):
+        modified = max(modified, part_path.stat().st_mtime)
+    return modified
+
+
+class TemplateEnvironment:
+    """Process level Jinja environment that compiles each report template source once.
+
+    Template sources from the template cache are loaded by a name that is a digest of the source, so a template
+    reloaded because it was modified is compiled again. Compiled templates are kept in the environment cache, and the
+    template bytecode is cached in REPORT_TEMPLATE_BYTECODE_CACHE_DIR (the system temp directory if not set) so a new
+    process skips compiling.
+    """
+
+    environment: Environment = None
+    names: dict = {}
+    sources: dict = {}
+
+    @classmethod
+    def get_environment(cls) -> Environment:
+        """Get the shared environment, creating it on first use."""
+        if not cls.environment:
+            bytecode_cache = None
+            cache_dir: str = current_app.config.get("REPORT_TEMPLATE_BYTECODE_CACHE_DIR")
+            try:
+                bytecode_cache = FileSystemBytecodeCache(cache_dir or None)
+            except Exception as err:  # noqa: B902; just logging
+                logger.error(f"Report template bytecode cache unavailable dir={cache_dir}: " + str(err))
+            cls.environment = Environment(
+                loader=FunctionLoader(cls.sources.get),
+                bytecode_cache=bytecode_cache,
+                autoescape=True,
+                auto_reload=False,
+            )
+        return cls.environment
+
+    @classmethod
+    def get_template(cls, source: str) -> Template:
+        """Get the compiled template for the template source, compiling it if not cached."""
+        name: str = cls.names.get(source)
+        if not name:
+            name = hashlib.sha256(source.encode("UTF-8")).hexdigest()
+            cls.sources[name] = source
+            cls.names[source] = name
+        return cls.get_environment().get_template(name)
+
+
 class Config:  # pylint: disable=too-few-public-methods
     """Configuration that loads report template static data."""
 
@@ -442,11 +521,27 @@ def get_report_files(request_data: dict, report_type: str, mail: bool = False, l
 
 def get_html_from_data(request_data) -> str:
     """Get html by merging the template with the report data."""
-    template_ = Template(request_data["template"], autoescape=True)
+    template_ = TemplateEnvironment.get_template(request_data["template"])
     html_output = template_.render(request_data["templateVars"])
     return html_output
 
 
+def get_destination_pages(pdf_reader) -> dict:
+    """Get the page index of every named destination in the pdf in one pass.
+
+    The report service creates a named destination for each report link target, so the registration anchors linked
+    from the search report TOC map registration numbers to pages without extracting the page text.
+    """
+    try:
+        return {
+            str(name).lstrip("/"): pdf_reader.get_destination_page_number(destination)
+            for name, destination in pdf_reader.named_destinations.items()
+        }
+    except Exception as err:  # noqa: B902; fall back to page text extraction
+        logger.warning(f"Report pdf named destinations unavailable: {err}")
+    return {}
+
+
 def update_toc_page_numbers(json_data, reg_pdf_data):
     """Try and update toc page numbers from the registration pdf."""
     if json_data["totalResultsSize"] > 0:
@@ -458,11 +553,20 @@ def update_toc_page_numbers(json_data, reg_pdf_data):
         json_data["totalPageCount"] = pagecount
         page_index = 0
         logger.info(f" TOC totalPageCount={pagecount}, getting page numbers")
+        dest_pages: dict = get_destination_pages(bodypdf)
+        text_count: int = 0
         last_num: str = ""
         for select in json_data["selected"]:
             if select["baseRegistrationNumber"] != last_num:
                 reg_text = REG_PAGE_PREFIX + select["baseRegistrationNumber"]
                 last_num = select["baseRegistrationNumber"]
+                dest_index: int = dest_pages.get(last_num, -1)
+                if dest_index >= 0:
+                    page_index = dest_index + 1
+                    select["pageNumber"] = dest_index + 1 + page_offset
+                    continue
+                # Not a named destination: fall back to scanning the page text.
+                text_count += 1
                 # logger.info(f'start page index={page_index} reg_text={reg_text}')
                 for i in range(page_index, pagecount):
                     # logger.info(f'{reg_text} scanning page {i}')
@@ -473,13 +577,49 @@ def update_toc_page_numbers(json_data, reg_pdf_data):
                         page_index = i + 1
                         select["pageNumber"] = i + 1 + page_offset
                         break
-        logger.info("Collecting page numbers completed.")
+        logger.info(f"Collecting page numbers completed: {text_count} found by page text.")
         if "pageNumOffset" in json_data:
             json_data["pageNumOffset"] = page_offset + pagecount
             logger.info("Updated page numbers offset=" + str(json_data["pageNumOffset"]))
     return json_data
 
 
+def get_toc_page_count(json_data) -> int:
+    """Get the number of search report TOC pages from the page number of the first registration."""
+    if json_data.get("selected") and json_data["selected"][0].get("pageNumber"):
+        return json_data["selected"][0]["pageNumber"] - 1
+    return 0
+
+
+def set_footer_total_pages(footer: str, total_pages: int) -> str:
+    """Replace the footer generated total page count with the provided count for a partial report render."""
+    if not footer or not total_pages:
+        return footer
+    return footer.replace(FOOTER_TOTAL_PAGES, f"<span>{total_pages}</span>")
+
+
+def replace_toc_pages(report_pdf, toc_pdf, toc_page_count: int):
+    """Replace the report TOC pages content with the TOC pdf pages, keeping the report page links.
+
+    The TOC pdf pages have the same layout as the report TOC pages, so the report page link annotations still
+    apply. Returns None if the TOC pdf has fewer than the expected number of TOC pages.
+    """
+    toc_reader = PyPDF2.PdfReader(io.BytesIO(toc_pdf))
+    report_reader = PyPDF2.PdfReader(io.BytesIO(report_pdf))
+    if len(toc_reader.pages) < toc_page_count or len(report_reader.pages) <= toc_page_count:
+        return None
+    writer = PyPDF2.PdfWriter()
+    writer.clone_document_from_reader(report_reader)
+    for index in range(toc_page_count):
+        page = writer.pages[index]
+        toc_page = toc_reader.pages[index]
+        for key in ("/Contents", "/Resources"):
+            page[NameObject(key)] = toc_page.raw_get(key).clone(writer)
+    writer_buffer = io.BytesIO()
+    writer.write(writer_buffer)
+    return writer_buffer.getvalue()
+
+
 def set_cover(report_data):  # pylint: disable=too-many-branches, too-many-statements
     """Add cover page report data. Cover page envelope window lines up to a maximum of 4."""
     cover_info = {}
@@ -587,24 +727,40 @@ def get_exact_count(selected) -> int:
 
 
 def merge_pdfs(report_files):
-    """Merge pdf content in memory."""
-    logger.debug("merge_pdfs starting")
-    merger = PyPDF2.PdfMerger()
-    merger.append(io.BytesIO(report_files["cover.pdf"]))
-    rep_count = len(report_files) - 1
-    count = 0
-    report_size = len(report_files["cover.pdf"])
-    while count < rep_count:
-        count += 1
-        key = f"pdf{count}.pdf"
-        report_size += len(report_files[key])
-        logger.debug(f"merge_pdfs running report size={report_size}")
-        merger.append(io.BytesIO(report_files[key]))
-    writer_buffer = io.BytesIO()
-    merger.write(writer_buffer)
-    merger.close()
-    logger.debug(f"merge_pdfs final report size={report_size}")
-    return writer_buffer.getvalue()
+    """Merge pdf content, returning the merged pdf data."""
+    with merge_pdfs_file(report_files) as merged_file:
+        return merged_file.read()
+
+
+def merge_pdfs_file(report_files, max_memory: int = None):
+    """Merge pdf content into a spooled temporary file, returned positioned at the start.
+
+    The merged pdf is held in memory up to max_memory (REPORT_MERGE_SPOOL_MAX_SIZE) bytes, then written to disk. Each
+    pdf is removed from report_files as it is appended. If the pdfs total more than max_memory bytes each one is
+    appended from a temporary file, so the report data is released instead of held until the merge completes.
+    """
+    if max_memory is None:
+        max_memory = current_app.config.get("REPORT_MERGE_SPOOL_MAX_SIZE", 64 * 1024 * 1024)
+    keys = ["cover.pdf"] + [f"pdf{count}.pdf" for count in range(1, len(report_files))]
+    report_size: int = sum(len(report_files[key]) for key in keys)
+    logger.debug(f"merge_pdfs starting report count={len(keys)} size={report_size}")
+    writer = PyPDF2.PdfWriter()
+    for key in keys:
+        pdf_data = report_files.pop(key)
+        if report_size > max_memory:
+            with tempfile.TemporaryFile() as pdf_file:
+                pdf_file.write(pdf_data)
+                del pdf_data
+                writer.append(PyPDF2.PdfReader(pdf_file))
+        else:
+            writer.append(PyPDF2.PdfReader(io.BytesIO(pdf_data)))
+    # A max_size of 0 is unlimited: spool to disk on the first write instead.
+    merged_file = tempfile.SpooledTemporaryFile(max_size=max(max_memory, 1))  # pylint: disable=consider-using-with
+    writer.write(merged_file)
+    writer.close()
+    logger.debug(f"merge_pdfs final report size={merged_file.tell()}")
+    merged_file.seek(0)
+    return merged_file
 
 
 def format_description(description: str) -> str:
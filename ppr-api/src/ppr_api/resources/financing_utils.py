@@ -420,7 +420,7 @@ def get_registration_report(  # pylint: disable=too-many-return-statements,too-m
             return raw_data, response_status, headers
 
         # Edge case: too large to generate in real time.
-        results_length = len(json.dumps(report_data))
+        results_length = model_utils.json_size(report_data, current_app.config.get("MAX_SIZE_SEARCH_RT"))
         if results_length > current_app.config.get("MAX_SIZE_SEARCH_RT"):
             logger.info(f"Registration {registration_id} queued, size too large: {results_length}.")
             resource_utils.enqueue_registration_report(registration, report_data, report_type)
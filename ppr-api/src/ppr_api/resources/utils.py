@@ -14,8 +14,9 @@
 """Resource helper utilities for processing requests."""
 from http import HTTPStatus
 
-from flask import current_app, jsonify, request
+from flask import Response, current_app, jsonify, request, send_file, stream_with_context
 
+from ppr_api.callback.document_storage.storage_service import GoogleStorageService
 from ppr_api.exceptions import BusinessException, DatabaseException, ResourceErrorCodes
 from ppr_api.models import EventTracking, MailReport, Party, Registration, VerificationReport, search_utils
 from ppr_api.models import utils as model_utils
@@ -138,6 +139,47 @@ def is_pdf(req):
     return accept and accept.upper() == "APPLICATION/PDF"
 
 
+def get_byte_range(req, size: int):
+    """Get the inclusive start, end byte range and response status of a request for a document of size bytes.
+
+    A missing or multiple range request header is the whole document. An unsatisfiable range is (None, None, 416).
+    """
+    byte_range = req.range
+    if not byte_range or byte_range.units != "bytes" or len(byte_range.ranges) != 1:
+        return 0, size - 1, HTTPStatus.OK
+    satisfiable = byte_range.range_for_length(size)
+    if not satisfiable:
+        return None, None, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    return satisfiable[0], satisfiable[1] - 1, HTTPStatus.PARTIAL_CONTENT
+
+
+def stored_pdf_response(req, doc_name: str, doc_type: str = None):
+    """Stream a PDF document from storage to the response, honouring a single byte range request header."""
+    size: int = GoogleStorageService.get_document_size(doc_name, doc_type)
+    start, end, status = get_byte_range(req, size)
+    if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        return Response(status=status, headers={"Content-Range": f"bytes */{size}"})
+    logger.info(f"Streaming {doc_name} size={size} bytes {start}-{end}.")
+    resp = Response(
+        stream_with_context(GoogleStorageService.stream_document(doc_name, doc_type, start, end)),
+        status=status,
+        mimetype="application/pdf",
+    )
+    resp.headers["Accept-Ranges"] = "bytes"
+    resp.headers["Content-Length"] = str(end - start + 1)
+    if status == HTTPStatus.PARTIAL_CONTENT:
+        resp.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return resp
+
+
+def pdf_response(raw_data):
+    """Build a generated PDF report response, streaming the report if it is a file object (a large search report)."""
+    if hasattr(raw_data, "read"):
+        raw_data.seek(0)
+        return send_file(raw_data, mimetype="application/pdf")
+    return raw_data, HTTPStatus.OK, {"Content-Type": "application/pdf"}
+
+
 def get_apikey(req):
     """Get gateway api key from request headers."""
     return req.headers.get("x-apikey")
@@ -549,7 +591,7 @@ def enqueue_verification_report(registration_id: int, party_id: int):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_verification_report(payload)
-        logger.info(f"Enqueue mail verification report successful for id={registration_id}.")
+        logger.info(f"Mail verification report queued for id={registration_id}.")
     except Exception as err:  # noqa: B902; do not alter app processing
         msg = f"Enqueue mail verification report failed for id={registration_id}, party={party_id}: " + str(err)
         logger.error(msg)
@@ -576,7 +618,7 @@ def enqueue_registration_report(registration: Registration, json_data: dict, rep
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_registration_report(payload)
-        logger.info(f"Enqueue registration report successful for id={registration.id}.")
+        logger.info(f"Registration report queued for id={registration.id}.")
     except DatabaseException as db_err:
         # Just log, do not return an error response.
         msg = f"Enqueue registration report db error for id={registration.id}: " + str(db_err)
@@ -600,7 +642,7 @@ def enqueue_callback_registration_report(registration_id: int):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_registration_report(payload)
-        logger.info(f"Enqueue registration report successful for id={registration_id}.")
+        logger.info(f"Registration report queued for id={registration_id}.")
     except DatabaseException as db_err:
         # Just log, do not return an error response.
         msg = f"Enqueue registration report db error for id={registration_id}: " + str(db_err)
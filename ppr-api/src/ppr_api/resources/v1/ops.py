@@ -16,6 +16,8 @@ from flask import Blueprint, jsonify
 from sqlalchemy import exc, text
 
 from ppr_api.models import db
+from ppr_api.reports.v2.report_client import ReportClient
+from ppr_api.services import authz
 from ppr_api.utils.logging import logger
 
 bp = Blueprint("OPS1", __name__, url_prefix="/ops")  # pylint: disable=invalid-name
@@ -46,3 +48,9 @@ def healthz():
 def readyz():
     """Status check to verify the service is ready to respond."""
     return jsonify({"message": "api is ready"}), 200
+
+
+@bp.route("/metrics")
+def metrics():
+    """Return the process report service client and auth api cache metrics."""
+    return jsonify({"reportService": ReportClient.get_metrics(), "authCache": authz.get_auth_cache_stats()}), 200
@@ -18,7 +18,7 @@ import json
 from http import HTTPStatus
 
 import requests
-from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from flask import Blueprint, current_app, jsonify, request
 from flask_cors import cross_origin
 from registry_schemas import utils as schema_utils
 
@@ -53,8 +53,6 @@ CALLBACK_MESSAGES = {
 CALLBACK_PARAM = "callbackURL"
 REPORT_URL = "/ppr/api/v1/search-results/{search_id}"
 USE_CURRENT_PARAM = "useCurrent"
-STREAMING_THRESHOLD = 31 * 1024 * 1024
-HTTP_OK = "200"
 
 
 @bp.route("/<string:search_id>", methods=["POST", "OPTIONS"])
@@ -118,7 +116,7 @@ def post_search_results(search_id: str):  # pylint: disable=too-many-branches,to
             callback_url = search_detail.callback_url
             is_ui_pdf = True
         elif not is_callback and callback_url is not None:
-            results_length = len(json.dumps(response_data))
+            results_length = model_utils.json_size(response_data, current_app.config.get("MAX_SIZE_SEARCH_RT"))
             logger.debug(f"Search id={search_id} data size={results_length}.")
             if results_length <= current_app.config.get("MAX_SIZE_SEARCH_RT"):
                 callback_url = None
@@ -175,24 +173,7 @@ def get_search_results(search_id: str):  # pylint: disable=too-many-branches,too
                 # Fetch binary data from doc storage.
                 doc_name = search_detail.doc_storage_url
                 logger.info(f"Fetching search report {doc_name} from doc storage.")
-                raw_data = GoogleStorageService.get_document(doc_name)
-                size = len(raw_data)
-                if size < STREAMING_THRESHOLD:
-                    return raw_data, HTTPStatus.OK, {"Content-Type": "application/pdf"}
-                logger.info(f"streaming response report size={size}")
-
-                def stream(begin, end, raw_data):
-                    offset = max(0, begin)
-                    while offset < end:
-                        end_chunk = offset + (10 * 1024)
-                        buf = raw_data[offset:end_chunk]
-                        offset += len(buf)
-                        yield buf
-
-                resp = Response(stream_with_context(stream(0, size, raw_data)))
-                resp.headers["Content-Type"] = "application/pdf"
-                resp.status = HTTP_OK
-                return resp
+                return resource_utils.stored_pdf_response(request, doc_name)
 
             # If get to here report not yet generated: create, store, return it.
             logger.info(f"Generating search report for {search_id}.")
@@ -207,7 +188,7 @@ def get_search_results(search_id: str):  # pylint: disable=too-many-branches,too
                 logger.info(f"Save document storage response: {response}.")
                 search_detail.doc_storage_url = doc_name
                 search_detail.save()
-                return raw_data, HTTPStatus.OK, {"Content-Type": "application/pdf"}
+                return resource_utils.pdf_response(raw_data)
             # Report generation error: return error response.
             if status_code not in (HTTPStatus.OK, HTTPStatus.CREATED):
                 return resource_utils.report_exception_response(raw_data, status_code)
@@ -407,7 +388,7 @@ def results_pdf_response(
         logger.info(f"Save {doc_name} document storage response: {response}")
         search_detail.doc_storage_url = doc_name
         search_detail.save()
-        return raw_data, HTTPStatus.OK, {"Content-Type": "application/pdf"}
+        return resource_utils.pdf_response(raw_data)
     # Report generation error: return Accepted status code to identify error.
     response_data["reportAvailable"] = False
     return jsonify(response_data), HTTPStatus.ACCEPTED, {"Content-Type": "application/json"}
@@ -492,7 +473,7 @@ def enqueue_search_report(search_id: str):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_search_report(payload)
-        logger.info(f"Enqueue search report successful for id={search_id}.")
+        logger.info(f"Search report queued for id={search_id}.")
     except Exception as err:  # noqa: B902; do not alter app processing
         logger.error(f"Enqueue search report failed for id={search_id}: " + str(err))
         EventTracking.create(
@@ -511,7 +492,7 @@ def enqueue_notification(search_id: str):
         if apikey:
             payload["apikey"] = apikey
         GoogleQueueService().publish_notification(payload)
-        logger.info(f"Enqueue notification successful for id={search_id}.")
+        logger.info(f"API notification queued for id={search_id}.")
     except Exception as err:  # noqa: B902; do not alter app processing
         logger.error(f"Enqueue notification failed for id={search_id}: " + str(err))
         EventTracking.create(
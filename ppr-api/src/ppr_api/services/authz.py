@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This manages all of the authentication and authorization service."""
+import copy
+import hashlib
+import threading
 from http import HTTPStatus
 from typing import List
 
@@ -21,6 +24,7 @@ from requests import Session, exceptions
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from ppr_api.utils.cache import TTLCache
 from ppr_api.utils.logging import logger
 
 SYSTEM_ROLE = "system"
@@ -103,6 +107,65 @@ def authorized(identifier: str, jwt: JwtManager) -> bool:  # pylint: disable=too
     return False
 
 
+_auth_cache: TTLCache = None
+_auth_session: Session = None
+_auth_lock = threading.Lock()
+
+
+def get_auth_cache() -> TTLCache:
+    """Return the process auth api response cache, or None if auth caching is disabled."""
+    global _auth_cache  # pylint: disable=global-statement
+    if not current_app.config.get("AUTH_CACHE_ENABLED"):
+        return None
+    with _auth_lock:
+        if _auth_cache is None:
+            _auth_cache = TTLCache(
+                current_app.config.get("AUTH_CACHE_MAX_SIZE", 1000), current_app.config.get("AUTH_CACHE_TTL", 60)
+            )
+    return _auth_cache
+
+
+def get_auth_session() -> Session:
+    """Return the process auth api session, reusing connections between requests."""
+    global _auth_session  # pylint: disable=global-statement
+    with _auth_lock:
+        if _auth_session is None:
+            retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+            adapter = HTTPAdapter(max_retries=retries)
+            _auth_session = Session()
+            _auth_session.mount("http://", adapter)
+            _auth_session.mount("https://", adapter)
+    return _auth_session
+
+
+def auth_cache_key(name: str, token: str, *args) -> str:
+    """Build an auth api response cache key from the request name, a hash of the token, and the request values."""
+    token_hash: str = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return "|".join([name, token_hash, *[str(arg) for arg in args]])
+
+
+def get_auth_cache_stats() -> dict:
+    """Return the auth api response cache size and hit/miss counts."""
+    cache = get_auth_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+def get_cached(cache_key: str):
+    """Return a copy of the cached auth api response for the key, or None.
+
+    Callers get their own copy so changes to a response never alter the cached value shared by other requests.
+    """
+    cache = get_auth_cache()
+    return copy.deepcopy(cache.get(cache_key)) if cache is not None else None
+
+
+def set_cached(cache_key: str, value):
+    """Cache an auth api response for the key if auth caching is enabled."""
+    cache = get_auth_cache()
+    if cache is not None:
+        cache.set(cache_key, copy.deepcopy(value))
+
+
 def authorized_token(  # pylint: disable=too-many-return-statements
     identifier: str, jwt: JwtManager, action: List[str]
 ) -> bool:
@@ -120,18 +183,20 @@ def authorized_token(  # pylint: disable=too-many-return-statements
         auth_url = template_url.format(**vars())
 
         token = jwt.get_token_auth_header()
+        cache_key: str = auth_cache_key("authorized_token", token, identifier, ",".join(action))
+        cached = get_cached(cache_key)
+        if cached is not None:
+            return cached
         headers = {"Authorization": "Bearer " + token}
         try:
-            with Session() as http:
-                retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-                http.mount("http://", HTTPAdapter(max_retries=retries))
-                rv = http.get(url=auth_url, headers=headers)
-
-                if rv.status_code != HTTPStatus.OK or not rv.json().get("roles"):
-                    return False
-
-                if all(elem.lower() in rv.json().get("roles") for elem in action):
-                    return True
+            rv = get_auth_session().get(url=auth_url, headers=headers)
+            if rv.status_code != HTTPStatus.OK:
+                return False
+            authorized_action: bool = bool(rv.json().get("roles")) and all(
+                elem.lower() in rv.json().get("roles") for elem in action
+            )
+            set_cached(cache_key, authorized_action)
+            return authorized_action
 
         except (
             exceptions.ConnectionError,  # pylint: disable=broad-except
@@ -159,14 +224,17 @@ def user_orgs(token: str) -> dict:
     try:
         headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json"}
         # logger.debug('Auth get user orgs url=' + url)
-        with Session() as http:
-            retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-            http.mount("http://", HTTPAdapter(max_retries=retries))
-            ret_val = http.get(url=api_url, headers=headers)
-            logger.debug("Auth get user orgs response status: " + str(ret_val.status_code))
-            # logger.debug('Auth get user orgs response data:')
-            response = ret_val.json()
-            # logger.debug(response)
+        cache_key: str = auth_cache_key("user_orgs", token)
+        response = get_cached(cache_key)
+        if response is not None:
+            return response
+        ret_val = get_auth_session().get(url=api_url, headers=headers)
+        logger.debug("Auth get user orgs response status: " + str(ret_val.status_code))
+        # logger.debug('Auth get user orgs response data:')
+        response = ret_val.json()
+        # logger.debug(response)
+        if ret_val.status_code == HTTPStatus.OK:
+            set_cached(cache_key, response)
     except (
         exceptions.ConnectionError,  # pylint: disable=broad-except
         exceptions.Timeout,
@@ -191,14 +259,17 @@ def account_org(token: str, account_id: str) -> dict:
     try:
         headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json"}
         # logger.debug('Auth get user orgs url=' + url)
-        with Session() as http:
-            retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
-            http.mount("http://", HTTPAdapter(max_retries=retries))
-            ret_val = http.get(url=api_url, headers=headers)
-            logger.debug("Auth get user orgs response status: " + str(ret_val.status_code))
-            # logger.debug('Auth get account org response data:')
-            response = ret_val.json()
-            # logger.debug(response)
+        cache_key: str = auth_cache_key("account_org", token, account_id)
+        response = get_cached(cache_key)
+        if response is not None:
+            return response
+        ret_val = get_auth_session().get(url=api_url, headers=headers)
+        logger.debug("Auth get user orgs response status: " + str(ret_val.status_code))
+        # logger.debug('Auth get account org response data:')
+        response = ret_val.json()
+        # logger.debug(response)
+        if ret_val.status_code == HTTPStatus.OK:
+            set_cached(cache_key, response)
     except (
         exceptions.ConnectionError,  # pylint: disable=broad-except
         exceptions.Timeout,
@@ -0,0 +1,135 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Opt in per request database query profiling from SQLAlchemy engine events.
+
+For a sample of requests the statement count, total database time and slowest statements are logged with the request
+endpoint, and optionally returned in a Server-Timing response header.
+"""
+import heapq
+import random
+import time
+
+from flask import Flask, Response, g, has_app_context, request
+from sqlalchemy import event
+
+from ppr_api.models import db
+from ppr_api.utils.logging import logger
+
+PROFILE_KEY = "db_query_profile"
+# Statements are logged with whitespace collapsed, truncated to this length.
+STATEMENT_MAX_LENGTH = 200
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class QueryProfile:
+    """The statement count, total time and slowest statements of the database queries run by a request."""
+
+    def __init__(self, slowest_size: int = 3):
+        """Set the number of slowest statements to keep."""
+        self.count: int = 0
+        self.total_ms: float = 0
+        self.slowest_size: int = slowest_size
+        self._slowest = []
+
+    def add(self, statement: str, elapsed_ms: float):
+        """Record a statement and its execution time in milliseconds."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.slowest_size <= 0:
+            return
+        entry = (elapsed_ms, self.count, statement)
+        if len(self._slowest) < self.slowest_size:
+            heapq.heappush(self._slowest, entry)
+        elif elapsed_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    @property
+    def slowest(self) -> list:
+        """Return the slowest statements json, slowest first."""
+        return [
+            {"ms": round(elapsed_ms, 2), "statement": " ".join(statement.split())[:STATEMENT_MAX_LENGTH]}
+            for elapsed_ms, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+    def json(self, endpoint: str = None) -> dict:
+        """Return the profile as a json object."""
+        return {
+            "endpoint": endpoint,
+            "statementCount": self.count,
+            "totalMs": round(self.total_ms, 2),
+            "slowest": self.slowest,
+        }
+
+    def server_timing(self) -> str:
+        """Return the profile as a Server-Timing header value."""
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} statements"'
+
+
+def get_profile() -> QueryProfile:
+    """Return the query profile of the current request, or None if the request is not profiled."""
+    if not has_app_context():
+        return None
+    return g.get(PROFILE_KEY)
+
+
+def _before_cursor_execute(  # pylint: disable=unused-argument
+    conn, cursor, statement, parameters, context, executemany
+):
+    """Record the statement start time if the current request is profiled."""
+    if context is not None and get_profile() is not None:
+        context.query_profile_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+    """Add the statement execution time to the current request profile."""
+    start = getattr(context, "query_profile_start", None)
+    if start is None:
+        return
+    profile = get_profile()
+    if profile is not None:
+        profile.add(statement, (time.perf_counter() - start) * 1000)
+
+
+def init_app(app: Flask):
+    """Listen to the database engine statement events and profile a sample of requests if enabled."""
+    if not app.config.get("DB_QUERY_PROFILE_ENABLED"):
+        return
+    sample_rate: float = app.config.get("DB_QUERY_PROFILE_SAMPLE_RATE", 1.0)
+    slowest_size: int = app.config.get("DB_QUERY_PROFILE_SLOWEST", 3)
+    add_header: bool = app.config.get("DB_QUERY_PROFILE_HEADER", False)
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    logger.info(f"DB query profiling enabled sample rate={sample_rate}.")
+
+    @app.before_request
+    def start_query_profile():  # pylint: disable=unused-variable
+        if random.random() < sample_rate:  # noqa: S311 not used for security
+            g.setdefault(PROFILE_KEY, QueryProfile(slowest_size))
+
+    @app.after_request
+    def end_query_profile(response: Response):  # pylint: disable=unused-variable
+        profile: QueryProfile = g.pop(PROFILE_KEY, None)
+        if profile is not None:
+            profile_json = profile.json(f"{request.method} {request.url_rule or request.path}")
+            logger.info(
+                f"DB query profile {profile_json['endpoint']} status={response.status_code} "
+                + f"statements={profile.count} db_ms={profile_json['totalMs']}",
+                additional=profile_json,
+            )
+            if add_header:
+                response.headers[SERVER_TIMING_HEADER] = profile.server_timing()
+        return response
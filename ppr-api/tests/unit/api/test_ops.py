@@ -27,3 +27,16 @@ def test_health_check(session, client, jwt):
     rv = client.get('/ops/healthz')
     # check
     assert rv.status_code == HTTPStatus.OK
+
+
+def test_metrics(session, client, jwt):
+    """Assert that the metrics endpoint returns the report service client metrics."""
+    # no setup
+
+    # test
+    rv = client.get('/ops/metrics')
+    # check
+    assert rv.status_code == HTTPStatus.OK
+    assert 'requests' in rv.json['reportService']
+    assert 'retries' in rv.json['reportService']
+    assert 'authCache' in rv.json
@@ -23,6 +23,8 @@ from ppr_api.utils.validators.party_validator import validate_registration_parti
 
 import pytest
 from flask import current_app
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
 
 from ppr_api.exceptions import BusinessException, DatabaseException, ResourceErrorCodes
 from ppr_api.models import Registration, VerificationReport
@@ -42,6 +44,16 @@ TEST_USER_ORGS_DATA_JSON = [
 #    ('Valid account', '2617', True),
     ('No token', '2617', False),
 ]
+# testdata pattern is ({description}, {range header}, {start}, {end}, {status})
+TEST_BYTE_RANGE_DATA = [
+    ('No range', None, 0, 999, HTTPStatus.OK),
+    ('First bytes', 'bytes=0-99', 0, 99, HTTPStatus.PARTIAL_CONTENT),
+    ('Resume from offset', 'bytes=500-', 500, 999, HTTPStatus.PARTIAL_CONTENT),
+    ('Last bytes', 'bytes=-100', 900, 999, HTTPStatus.PARTIAL_CONTENT),
+    ('End past size', 'bytes=900-2000', 900, 999, HTTPStatus.PARTIAL_CONTENT),
+    ('Multiple ranges', 'bytes=0-9,20-29', 0, 999, HTTPStatus.OK),
+    ('Unsatisfiable', 'bytes=1000-1100', None, None, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+]
 # testdata pattern is ({description}, {valid data})
 TEST_VALIDATE_REGISTRATION_DATA = [
     ('Valid amendment', True),
@@ -422,3 +434,14 @@ def test_same_party(session, client, jwt, desc, rp_json, sp_json, same, same_add
         assert result
     else:
         assert not result
+
+
+@pytest.mark.parametrize('desc,range_header,start,end,status', TEST_BYTE_RANGE_DATA)
+def test_get_byte_range(desc, range_header, start, end, status):
+    """Assert that getting a stored document byte range from the request headers works as expected."""
+    headers = {'Range': range_header} if range_header else {}
+    req = Request(EnvironBuilder(headers=headers).get_environ())
+    # test
+    result = resource_utils.get_byte_range(req, 1000)
+    # check
+    assert result == (start, end, status)
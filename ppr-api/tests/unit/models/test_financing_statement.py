@@ -312,6 +312,24 @@ def test_find_debtor_names(session, reg_num, results_size):
             assert names_json[3]['businessName'] == 'TEST 8 TRANSFER DEBTOR'
 
 
+def test_find_all_by_registration_numbers(session):
+    """Assert that bulk loading financing statements by registration number works as expected."""
+    reg_nums = ['TEST0001', 'TEST0002', 'TEST0001', 'TESTXXXX']
+    statements = FinancingStatement.find_all_by_registration_numbers(reg_nums)
+    assert len(statements) == 2
+    assert 'TESTXXXX' not in statements
+    for reg_num in ('TEST0001', 'TEST0002'):
+        statement = statements.get(reg_num)
+        assert statement
+        statement.include_changes_json = True
+        bulk_json = statement.json
+        assert bulk_json['baseRegistrationNumber'] == reg_num
+        single = FinancingStatement.find_by_registration_number(reg_num, None, True, False)
+        single.include_changes_json = True
+        assert bulk_json == single.json
+    assert not FinancingStatement.find_all_by_registration_numbers([])
+
+
 def test_current_json(session):
     """Assert that financing statement JSON contains expected current view elements."""
     result = FinancingStatement.find_by_id(200000000)
@@ -81,6 +81,16 @@ INDIVIDUAL_DEBTOR_JSON = {
 TEST_DATA_HISTORICAL_ID = [
     ('Test get search historical id', '2022-09-26T06:59:59+00:00')
 ]
+# testdata pattern is ({desc}, {registration_id}, {registration_id_end}, {search_reg_id}, {valid})
+TEST_DATA_VALID_AS_OF = [
+    ('Current added before search', 1000, None, 2000, True),
+    ('Current added by search registration', 2000, None, 2000, True),
+    ('Current added after search', 2001, None, 2000, False),
+    ('Removed after search', 1000, 2001, 2000, True),
+    ('Removed by search registration', 1000, 2000, 2000, False),
+    ('Removed before search', 1000, 1500, 2000, False),
+    ('Added and removed after search', 2001, 2002, 2000, False)
+]
 # testdata pattern is ({desc}, {search_ts}, {search_reg_id}, {criteria})
 TEST_DATA_SEARCH_SERIAL_QUERY = [
     ('Test search historical serial number query', '2022-09-26T06:59:59+00:00', 2389990, '1G1YL2D73K5105174')
@@ -114,6 +124,12 @@ def test_get_search_historical_id(session, desc, search_ts):
     assert max_reg_id >= 0
 
 
+@pytest.mark.parametrize('desc,reg_id,reg_id_end,search_reg_id,valid', TEST_DATA_VALID_AS_OF)
+def test_is_valid_as_of(desc, reg_id, reg_id_end, search_reg_id, valid):
+    """Assert that checking if a party or collateral record exists as of the search registration works as expected."""
+    assert search_historical.is_valid_as_of(reg_id, reg_id_end, search_reg_id) == valid
+
+
 @pytest.mark.parametrize('desc,search_ts,reg_id,criteria', TEST_DATA_SEARCH_SERIAL_QUERY)
 def test_search_by_serial_type(session, desc, search_ts, reg_id, criteria):
     """Assert that serial number historical search step 1 works as expected."""
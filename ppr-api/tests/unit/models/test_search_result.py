@@ -530,3 +530,55 @@ def test_search_sort(session, client, jwt, desc, select_data, select_count, orig
         assert selection[1]['vehicleCollateral']['model'] == 'Sort 2'
         assert selection[2]['vehicleCollateral']['model'] == 'Sort 3'
         assert selection[3]['vehicleCollateral']['model'] == 'Sort 4'
+
+
+
+def build_select_match(reg_num: str, match_type: str, debtor_name: str, selected: bool = None):
+    """Build a business debtor search match for a base registration number."""
+    match = {
+        'baseRegistrationNumber': reg_num,
+        'matchType': match_type,
+        'createDateTime': '2021-06-23T13:33:56+00:00',
+        'registrationType': 'SA',
+        'debtor': {'businessName': debtor_name}
+    }
+    if selected is not None:
+        match['selected'] = selected
+    return match
+
+
+def test_selection_details_duplicates():
+    """Assert that the search selection and details remove duplicate registrations and keep the selection order."""
+    original_select = [
+        build_select_match('TEST0001', 'EXACT', 'DEBTOR 1'),
+        build_select_match('TEST0002', 'SIMILAR', 'DEBTOR 2'),
+        build_select_match('TEST0003', 'SIMILAR', 'DEBTOR 3'),
+        build_select_match('TEST0002', 'SIMILAR', 'DEBTOR 4'),
+        build_select_match('TEST0004', 'SIMILAR', 'DEBTOR 5')
+    ]
+    search_select = [
+        build_select_match('TEST0003', 'SIMILAR', 'DEBTOR 3'),
+        build_select_match('TEST0002', 'SIMILAR', 'DEBTOR 2'),
+        build_select_match('TEST0003', 'SIMILAR', 'DEBTOR 3'),
+        build_select_match('TEST0001', 'EXACT', 'DEBTOR 1')
+    ]
+    registrations = []
+    for reg_num in ('TEST0001', 'TEST0002', 'TEST0003', 'TEST0002', 'TEST0004'):
+        registrations.append({'financingStatement': {'baseRegistrationNumber': reg_num}})
+    search_request: SearchRequest = SearchRequest(search_response=original_select,
+                                                  search_type=SearchRequest.SearchTypes.REGISTRATION_NUM.value)
+    search_result: SearchResult = SearchResult(search_response=registrations)
+    search_result.search = search_request
+
+    search_result.search_select = search_result.set_search_selection(search_select)
+    assert [(match['baseRegistrationNumber'], match['debtor']['businessName'])
+            for match in search_result.search_select] == [('TEST0001', 'DEBTOR 1'),
+                                                          ('TEST0003', 'DEBTOR 3'),
+                                                          ('TEST0002', 'DEBTOR 2'),
+                                                          ('TEST0002', 'DEBTOR 4')]
+    search_result.search_select.append(build_select_match('TEST0004', 'SIMILAR', 'DEBTOR 5', False))
+    details = search_result.build_details()
+    assert [detail['financingStatement']['baseRegistrationNumber'] for detail in details] == \
+        ['TEST0001', 'TEST0003', 'TEST0002']
+    assert details[2] is registrations[1]
+    assert search_result.similar_match_count == 3
@@ -22,7 +22,7 @@ import copy
 import pytest
 from flask import current_app
 
-from ppr_api.models import search_utils, utils as model_utils
+from ppr_api.models import FinancingStatement, Registration, SearchRequest, search_utils, utils as model_utils
 from ppr_api.models.search_utils import AccountSearchParams
 from ppr_api.resources.utils import set_search_params_criteria
 from ppr_api.services.authz import is_staff_account
@@ -64,6 +64,51 @@ TEST_QUERY_CRITERIA_DATA = [
     ("INDIVIDUAL_DEBTOR", "FNAME TEST", search_utils.SEARCH_FILTER_CRITERIA_DEFAULT),
     ("MHR_OWNER_NAME", "FNAME TEST", search_utils.SEARCH_FILTER_CRITERIA_DEFAULT),
 ]
+# testdata pattern is ({search_type}, {row}, {base_reg_num}, {match_type})
+SERIAL_COLUMNS = ('registration_type', 'base_registration_ts', 'serial_type', 'serial_number', 'year', 'make', 'model',
+                  'base_registration_num', 'match_type', 'expire_date', 'state_type', 'vehicle_id', 'mhr_number')
+BUSINESS_COLUMNS = ('registration_type', 'base_registration_ts', 'business_name', 'base_registration_num', 'match_type',
+                    'expire_date', 'state_type', 'id')
+INDIVIDUAL_COLUMNS = ('registration_type', 'base_registration_ts', 'last_name', 'first_name', 'middle_initial', 'id',
+                      'base_registration_num', 'match_type', 'expire_date', 'state_type', 'birth_date')
+# testdata pattern is ({search_type}, {columns}, {row}, {base_reg_num}, {match_type})
+TEST_SEARCH_RESULT_ROW_DATA = [
+    ('SS', SERIAL_COLUMNS, ('SA', model_utils.now_ts(), 'MV', 'KM8J3CA46JU622994', 2018, 'HYUNDAI', 'TUCSON',
+                            'TEST0001', 'EXACT', None, 'ACT', 1, None), 'TEST0001', 'EXACT'),
+    ('MH', SERIAL_COLUMNS, ('SA', model_utils.now_ts(), 'MH', '999999', None, None, None, 'TEST0002', 'SIMILAR', None,
+                            'ACT', 2, '022911'), 'TEST0002', 'SIMILAR'),
+    ('BS', BUSINESS_COLUMNS, ('SA', model_utils.now_ts(), 'TEST BUS 2 DEBTOR', 'TEST0003', 'EXACT', None, 'ACT',
+                              200000002), 'TEST0003', 'EXACT'),
+    ('IS', INDIVIDUAL_COLUMNS, ('SA', model_utils.now_ts(), 'DEBTOR', 'TEST IND', '1', 200000001, 'TEST0004', 'SIMILAR',
+                                None, 'ACT', None), 'TEST0004', 'SIMILAR'),
+    ('SS', ('total_count',) + SERIAL_COLUMNS, (5000, 'SA', model_utils.now_ts(), 'MV', 'KM8J3CA46JU622994', 2018,
+                                              'HYUNDAI', 'TUCSON', 'TEST0001', 'EXACT', None, 'ACT', 1, None),
+     'TEST0001', 'EXACT')
+]
+# testdata pattern is ({description}, {search_type1}, {criteria1}, {search_type2}, {criteria2}, {same_key})
+TEST_DATA_CACHE_KEY = [
+    ('Same criteria', 'SS', {'value': 'KM8J3CA46JU622994'}, 'SS', {'value': 'KM8J3CA46JU622994'}, True),
+    ('Key order', 'IS', {'debtorName': {'last': 'DEBTOR', 'first': 'TEST IND'}}, 'IS',
+     {'debtorName': {'first': 'TEST IND', 'last': 'DEBTOR'}}, True),
+    ('Case and spaces', 'BS', {'debtorName': {'business': 'Test Bus 2 Debtor'}}, 'BS',
+     {'debtorName': {'business': ' TEST BUS 2 DEBTOR '}}, True),
+    ('Serial case', 'SS', {'value': 'km8j3ca46ju622994'}, 'SS', {'value': 'KM8J3CA46JU622994'}, True),
+    ('Registration number case', 'RG', {'value': 'test0001'}, 'RG', {'value': 'TEST0001'}, False),
+    ('Different criteria', 'SS', {'value': 'KM8J3CA46JU622994'}, 'SS', {'value': 'KM8J3CA46JU622995'}, False),
+    ('Different name', 'IS', {'debtorName': {'last': 'DEBTOR', 'first': 'TEST IND'}}, 'IS',
+     {'debtorName': {'last': 'DEBTOR', 'first': 'TEST'}}, False),
+    ('Serial and MH type', 'SS', {'value': '999999'}, 'MH', {'value': '999999'}, False),
+    ('Serial and aircraft type', 'SS', {'value': '999999'}, 'AC', {'value': '999999'}, False),
+    ('MH and registration number type', 'MH', {'value': '022911'}, 'RG', {'value': '022911'}, False),
+]
+# testdata pattern is ({description}, {model_class}, {rollback}, {cleared})
+TEST_DATA_CACHE_INVALIDATE = [
+    ('New registration', Registration, False, True),
+    ('New financing statement', FinancingStatement, False, True),
+    ('New registration rolled back', Registration, True, False),
+    ('New search request', SearchRequest, False, False),
+]
+
 
 @pytest.mark.parametrize('sort_criteria,sort_order,value', TEST_QUERY_ORDER_DATA)
 def test_account_search_order(session, sort_criteria, sort_order, value):
@@ -189,3 +234,119 @@ def test_account_criteria_params(session, search_type,criteria,filter_clause):
 def is_ci_testing() -> bool:
     """Check unit test environment: exclude most reports for CI testing."""
     return  current_app.config.get("DEPLOYMENT_ENV", "testing") == "testing"
+
+
+class StreamResultStub:
+    """Search query result stub returning rows in partitions."""
+
+    def __init__(self, columns, rows):
+        """Set the result column names and rows."""
+        self.columns = columns
+        self.rows = rows
+
+    def keys(self):
+        """Return the result column names."""
+        return self.columns
+
+    def partitions(self, size):
+        """Yield the rows in chunks of the requested size."""
+        for index in range(0, len(self.rows), size):
+            yield self.rows[index:index + size]
+
+
+@pytest.mark.parametrize('search_type,columns,row,base_reg_num,match_type', TEST_SEARCH_RESULT_ROW_DATA)
+def test_build_search_results(session, search_type, columns, row, base_reg_num, match_type):
+    """Assert that building search results json from streamed query rows works as expected."""
+    builders = {
+        'SS': search_utils.build_search_result_serial,
+        'MH': search_utils.build_search_result_mhr,
+        'BS': search_utils.build_search_result_business,
+        'IS': search_utils.build_search_result_individual
+    }
+    rows = [row] * (search_utils.SEARCH_RESULTS_CHUNK_SIZE + 1)
+    results, total_count = search_utils.build_search_results(StreamResultStub(columns, rows), builders[search_type])
+    values = dict(zip(columns, row))
+    assert len(results) == len(rows)
+    assert total_count == values.get('total_count', len(rows))
+    result = results[0]
+    assert result['baseRegistrationNumber'] == base_reg_num
+    assert result['matchType'] == match_type
+    assert result['registrationType'] == 'SA'
+    assert result['createDateTime']
+    if search_type in ('SS', 'MH'):
+        assert result['vehicleCollateral']['type'] == values['serial_type']
+        assert result['vehicleCollateral']['serialNumber'] == values['serial_number']
+        if search_type == 'MH':
+            assert result['vehicleCollateral']['manufacturedHomeRegistrationNumber'] == values['mhr_number']
+            assert 'year' not in result['vehicleCollateral']
+        else:
+            assert result['vehicleCollateral']['year'] == values['year']
+    elif search_type == 'BS':
+        assert result['debtor']['businessName'] == values['business_name']
+        assert result['debtor']['partyId'] == values['id']
+    else:
+        assert result['debtor']['personName']['last'] == values['last_name']
+        assert result['debtor']['personName']['middle'] == values['middle_initial']
+        assert result['debtor']['partyId'] == values['id']
+        assert 'birthDate' not in result['debtor']
+
+
+@pytest.mark.parametrize('query', [search_utils.SERIAL_NUM_QUERY, search_utils.MHR_NUM_QUERY,
+                                   search_utils.AIRCRAFT_DOT_QUERY, search_utils.BUSINESS_NAME_QUERY,
+                                   search_utils.INDIVIDUAL_NAME_QUERY, search_utils.INDIVIDUAL_NAME_MIDDLE_QUERY])
+def test_build_limit_query(session, query):
+    """Assert that adding the total count window aggregate and result limit to a search query works as expected."""
+    limit_query = search_utils.build_limit_query(query)
+    assert limit_query.count(search_utils.TOTAL_COUNT_SELECT) == 1
+    assert limit_query.index(search_utils.TOTAL_COUNT_SELECT) < limit_query.index(search_utils.SEARCH_QUERY_FROM)
+    assert limit_query.endswith(search_utils.RESULTS_SIZE_LIMIT_CLAUSE)
+
+
+class SessionStub:
+    """Database session stub with the instances changed by a flush."""
+
+    def __init__(self, new):
+        """Set the new instances."""
+        self.info = {}
+        self.new = new
+        self.dirty = []
+        self.deleted = []
+
+
+@pytest.mark.parametrize('desc,search_type1,criteria1,search_type2,criteria2,same_key', TEST_DATA_CACHE_KEY)
+def test_search_cache_key(session, monkeypatch, desc, search_type1, criteria1, search_type2, criteria2, same_key):
+    """Assert that search response cache keys are the same only for equivalent search criteria."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', True)
+    key1 = search_utils.search_cache_key(search_type1, {'type': search_type1, 'criteria': criteria1})
+    key2 = search_utils.search_cache_key(search_type2, {'type': search_type2, 'criteria': criteria2})
+    assert key1
+    assert key2
+    assert (key1 == key2) == same_key
+
+
+def test_search_cache_key_disabled(session, monkeypatch):
+    """Assert that there is no search response cache key when search caching is disabled."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', False)
+    assert search_utils.search_cache_key('SS', {'type': 'SS', 'criteria': {'value': 'KM8J3CA46JU622994'}}) is None
+
+
+@pytest.mark.parametrize('desc,model_class,rollback,cleared', TEST_DATA_CACHE_INVALIDATE)
+def test_search_cache_invalidate(session, monkeypatch, desc, model_class, rollback, cleared):
+    """Assert that a committed change to a search table clears the search response cache."""
+    monkeypatch.setitem(current_app.config, 'SEARCH_CACHE_ENABLED', True)
+    monkeypatch.setattr(search_utils, '_search_cache', None)
+    cache_key = search_utils.search_cache_key('SS', {'type': 'SS', 'criteria': {'value': 'KM8J3CA46JU622994'}})
+    search_response = [{'baseRegistrationNumber': 'TEST0001', 'matchType': 'EXACT'}]
+    search_utils.set_cached_search(cache_key, search_response, 1, 1)
+    db_session = SessionStub([model_class()])
+    # test
+    search_utils._search_cache_after_flush(db_session, None)
+    if rollback:
+        search_utils._search_cache_after_rollback(db_session)
+    search_utils._search_cache_after_commit(db_session)
+    # check
+    cached = search_utils.get_cached_search(cache_key)
+    if cleared:
+        assert cached is None
+    else:
+        assert cached == (search_response, 1, 1)
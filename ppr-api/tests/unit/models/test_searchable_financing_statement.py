@@ -0,0 +1,73 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Searchable Financing Statement Model.
+
+Test-Suite to ensure that the Searchable Financing Statement Model is working as expected.
+"""
+import copy
+
+import pytest
+from registry_schemas.example_data.ppr import FINANCING_STATEMENT
+from sqlalchemy.sql import text
+
+from ppr_api.models import FinancingStatement, SearchableFinancingStatement, db
+
+
+# testdata pattern is ({valid}, {financing_id})
+TEST_ID_DATA = [
+    (True, 200000000),
+    (False, 300000000)
+]
+
+
+@pytest.mark.parametrize('valid,financing_id', TEST_ID_DATA)
+def test_find_by_financing_id(session, valid, financing_id):
+    """Assert that find a searchable financing statement by financing ID contains all expected elements."""
+    searchable = SearchableFinancingStatement.find_by_financing_id(financing_id)
+    if valid:
+        assert searchable
+        assert searchable.financing_id == financing_id
+        assert searchable.search_until_ts
+    else:
+        assert not searchable
+
+
+def test_save_refresh(session):
+    """Assert that saving a financing statement creates the searchable financing statement."""
+    json_data = copy.deepcopy(FINANCING_STATEMENT)
+    del json_data['createDateTime']
+    del json_data['baseRegistrationNumber']
+    del json_data['payment']
+    del json_data['lifeInfinite']
+    del json_data['expiryDate']
+    del json_data['documentId']
+    del json_data['lienAmount']
+    del json_data['surrenderDate']
+    statement = FinancingStatement.create_from_json(json_data, 'PS12345', 'UNIT_TEST')
+    statement.save()
+    assert statement.id
+    searchable = SearchableFinancingStatement.find_by_financing_id(statement.id)
+    assert searchable
+    assert searchable.search_until_ts
+    assert searchable.search_until_ts > statement.expire_date
+
+
+def test_sql_update_refresh(session):
+    """Assert that a financing statement expiry date change not made by the API refreshes the search end time."""
+    db.session.execute(text("UPDATE financing_statements SET expire_date = TIMESTAMP '2030-01-01 12:00:00' "
+                            'WHERE id = 200000000'))
+    searchable = SearchableFinancingStatement.find_by_financing_id(200000000)
+    assert searchable
+    assert searchable.search_until_ts.strftime('%Y-%m-%d') == '2030-01-31'
@@ -13,6 +13,7 @@
 # limitations under the License.
 """Test Suite to ensure the datetime utility functions are working as expected."""
 import copy
+import json
 import os
 from datetime import timedelta as _timedelta
 
@@ -492,3 +493,22 @@ def test_rl_transition(session, today_offset, valid):
 def is_ci_testing() -> bool:
     """Check unit test environment: exclude most reports for CI testing."""
     return  current_app.config.get("DEPLOYMENT_ENV", "testing") == "testing"
+
+
+def test_json_size():
+    """Assert that measuring the serialized json size of data works as expected."""
+    data = {
+        'searchQuery': {'type': 'SERIAL_NUMBER', 'criteria': {'value': 'JU622994'}},
+        'details': [{'matchType': 'EXACT', 'baseRegistrationNumber': 'TEST0001', 'year': 2004, 'amount': 10.5,
+                     'names': ['ONE', 'TWO'], 'expired': False, 'note': None}] * 20,
+        'empty': [],
+        'totalResultsSize': 20
+    }
+    # test
+    assert model_utils.json_size(data) == len(json.dumps(data))
+    assert model_utils.json_size(data['details']) == len(json.dumps(data['details']))
+    assert model_utils.json_size([]) == len(json.dumps([]))
+    # Stops early once max size is exceeded.
+    size = model_utils.json_size(data, 500)
+    assert size > 500
+    assert size < len(json.dumps(data))
@@ -17,10 +17,15 @@
 Test-Suite to ensure that the report service search results report is working as expected.
 """
 from http import HTTPStatus
+import io
 import json
+import threading
 
+import PyPDF2
+import pytest
 from flask import current_app
 
+from ppr_api.reports.v2 import report_utils
 from ppr_api.reports.v2.report import Report
 from ppr_api.reports.v2.report_utils import ReportTypes, merge_pdfs
 
@@ -64,6 +69,7 @@ SEARCH_COVER_DATAFILE = 'tests/unit/reports/data/search-cover-example.json'
 SEARCH_COVER_PDFFILE = 'tests/unit/reports/data/search-cover-example.pdf'
 REPORT_VERSION_V2 = '2'
 MERGE_PDFFILE = 'tests/unit/reports/data/search-merge.pdf'
+TOC_MERGE_PDFFILE = 'tests/unit/reports/data/verification-mail-discharge-example.pdf'
 
 
 def test_merge(session, client, jwt):
@@ -275,6 +281,100 @@ def test_search_cover(session, client, jwt):
         check_response(content, status, SEARCH_COVER_PDFFILE)
 
 
+def test_toc_page_count(session, client, jwt):
+    """Assert that getting the search report TOC page count from the report data works as expected."""
+    json_data = get_json_from_file(SEARCH_RESULT_75_DATAFILE)
+    assert report_utils.get_toc_page_count(json_data) == 0
+    json_data['selected'][0]['pageNumber'] = 4
+    assert report_utils.get_toc_page_count(json_data) == 3
+    footer = 'Page <span class="pageNumber"></span> of <span class="totalPages"></span>'
+    assert report_utils.set_footer_total_pages(footer, 20) == 'Page <span class="pageNumber"></span> of <span>20</span>'
+    assert report_utils.set_footer_total_pages(footer, None) == footer
+
+
+def test_replace_toc_pages(session, client, jwt):
+    """Assert that replacing report TOC pages with TOC pdf pages works as expected."""
+    with open(TOC_MERGE_PDFFILE, 'rb') as pdf_file:
+        pdf_data = pdf_file.read()
+    page_count = len(PyPDF2.PdfReader(io.BytesIO(pdf_data)).pages)
+    content = report_utils.replace_toc_pages(pdf_data, pdf_data, 1)
+    assert content
+    assert len(PyPDF2.PdfReader(io.BytesIO(content)).pages) == page_count
+    assert not report_utils.replace_toc_pages(pdf_data, pdf_data, page_count)
+
+
+def test_template_cache(session, client, jwt):
+    """Assert that report templates are loaded once into the template cache."""
+    load_count = []
+
+    def load_template(template_path: str, file_name: str):
+        load_count.append(file_name)
+        return Report._load_template(template_path, file_name)
+
+    template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
+    report_utils.TemplateCache.templates.pop(f'{template_path}/searchCoverV2.html', None)
+    template1 = report_utils.TemplateCache.get_template(template_path, 'searchCoverV2.html', load_template)
+    template2 = report_utils.TemplateCache.get_template(template_path, 'searchCoverV2.html', load_template)
+    assert template1
+    assert template1 == template2
+    assert len(load_count) == 1
+
+
+def test_template_environment(session, client, jwt):
+    """Assert that a report template source is compiled once and rendered with autoescaping."""
+    template_path = current_app.config.get('REPORT_TEMPLATE_PATH')
+    source = report_utils.TemplateCache.get_template(template_path, 'searchCoverV2.html', Report._load_template)
+    template1 = report_utils.TemplateEnvironment.get_template(source)
+    template2 = report_utils.TemplateEnvironment.get_template(source)
+    assert template1 is template2
+    request_data = {'template': '<p>{{ name }}</p>', 'templateVars': {'name': '<b>TEST</b>'}}
+    assert report_utils.get_html_from_data(request_data) == '<p>&lt;b&gt;TEST&lt;/b&gt;</p>'
+
+
+def test_update_toc_page_numbers_destinations(session, client, jwt):
+    """Assert that search report TOC page numbers are set from the pdf named destinations."""
+    writer = PyPDF2.PdfWriter()
+    for _ in range(4):
+        writer.add_blank_page(612, 792)
+    writer.add_named_destination('123456B', 1)
+    writer.add_named_destination('123457B', 3)
+    pdf_buffer = io.BytesIO()
+    writer.write(pdf_buffer)
+    json_data = {
+        'totalResultsSize': 3,
+        'pageNumOffset': 10,
+        'selected': [
+            {'baseRegistrationNumber': '123456B'},
+            {'baseRegistrationNumber': '123456B'},
+            {'baseRegistrationNumber': '123457B'}
+        ]
+    }
+    json_data = report_utils.update_toc_page_numbers(json_data, pdf_buffer.getvalue())
+    assert json_data['totalPageCount'] == 4
+    assert json_data['selected'][0]['pageNumber'] == 12
+    assert not json_data['selected'][1].get('pageNumber')
+    assert json_data['selected'][2]['pageNumber'] == 14
+    assert json_data['pageNumOffset'] == 14
+
+
+def test_merge_pdfs_file(session, client, jwt):
+    """Assert that merging pdf's through temporary files releases the inputs and keeps the page order."""
+    report_files = {}
+    for index, key in enumerate(['cover.pdf', 'pdf1.pdf', 'pdf2.pdf']):
+        writer = PyPDF2.PdfWriter()
+        for _ in range(index + 1):
+            writer.add_blank_page(612, 792 + index)
+        pdf_buffer = io.BytesIO()
+        writer.write(pdf_buffer)
+        report_files[key] = pdf_buffer.getvalue()
+    with report_utils.merge_pdfs_file(report_files, 0) as merged_file:
+        assert not report_files
+        assert merged_file.tell() == 0
+        reader = PyPDF2.PdfReader(merged_file)
+        assert len(reader.pages) == 6
+        assert [int(page.mediabox.height) for page in reader.pages] == [792, 793, 793, 794, 794, 794]
+
+
 def get_json_from_file(data_file: str):
     """Get json data from report data file."""
     text_data = None
@@ -300,6 +400,52 @@ def check_response(content, status_code, filename: str = None):
     current_app.logger.debug('PDF report generation completed.')
 
 
+def test_run_subreports_order(session, client, jwt, monkeypatch):
+    """Assert that concurrent subreport steps finishing out of order return results in subreport order."""
+    monkeypatch.setitem(current_app.config, 'REPORT_SEARCH_PARALLEL', 4)
+    sub_reports = [Report({'subreport': f'{count} of 4'}, 'PS12345', ReportTypes.SEARCH_DETAIL_REPORT)
+                   for count in range(1, 5)]
+    finished = {id(sub_report): threading.Event() for sub_report in sub_reports}
+    finish_order = []
+
+    def run_step(sub_report):
+        # Each subreport waits for the next one to finish, so the last subreport finishes first.
+        index = sub_reports.index(sub_report)
+        if index < len(sub_reports) - 1:
+            assert finished[id(sub_reports[index + 1])].wait(10)
+        finish_order.append(index)
+        finished[id(sub_report)].set()
+        if index == 1:
+            return b'Report error', HTTPStatus.INTERNAL_SERVER_ERROR, None
+        return sub_report._report_data['subreport'].encode(), HTTPStatus.OK, None
+
+    responses = Report({}, 'PS12345')._run_subreports(sub_reports, 'test', run_step)
+    assert finish_order == [3, 2, 1, 0]
+    assert len(responses) == len(sub_reports)
+    assert responses[0] == (b'1 of 4', HTTPStatus.OK, None)
+    assert responses[1] == (b'Report error', HTTPStatus.INTERNAL_SERVER_ERROR, None)
+    assert responses[2] == (b'3 of 4', HTTPStatus.OK, None)
+    assert responses[3] == (b'4 of 4', HTTPStatus.OK, None)
+
+
+def test_run_subreports_error(session, client, jwt, monkeypatch):
+    """Assert that a concurrent subreport step that raises an exception is reported to the caller."""
+    monkeypatch.setitem(current_app.config, 'REPORT_SEARCH_PARALLEL', 4)
+    sub_reports = [Report({'subreport': f'{count} of 3'}, 'PS12345', ReportTypes.SEARCH_DETAIL_REPORT)
+                   for count in range(1, 4)]
+    completed = []
+
+    def run_step(sub_report):
+        if sub_report._report_data['subreport'] == '2 of 3':
+            raise ValueError('Subreport 2 failed.')
+        completed.append(sub_report._report_data['subreport'])
+        return b'pdf', HTTPStatus.OK, None
+
+    with pytest.raises(ValueError, match='Subreport 2 failed.'):
+        Report({}, 'PS12345')._run_subreports(sub_reports, 'test', run_step)
+    assert sorted(completed) == ['1 of 3', '3 of 3']
+
+
 def is_report_v2() -> bool:
     return  current_app.config.get('REPORT_VERSION', '') == REPORT_VERSION_V2
 
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Google queue service publish tests."""
+from concurrent import futures
+
 from flask import current_app
 
+from ppr_api.models import EventTracking
 from ppr_api.services.queue_service import GoogleQueueService
 
 
@@ -73,3 +76,18 @@ def test_publish_registration_report(session):
         if apikey:
             payload['apikey'] = apikey
         GoogleQueueService().publish_registration_report(payload)
+
+
+def test_publish_done_error(session):
+    """Assert that a failed async publish is recorded as an event tracking record."""
+    key_id = 99999998
+    event_type = EventTracking.EventTrackingTypes.SEARCH_REPORT.value
+    future = futures.Future()
+    future.set_exception(Exception('Publish timed out.'))
+    # test
+    GoogleQueueService.publish_done(future, 'test-topic', event_type, key_id)
+    # check
+    events = EventTracking.find_by_key_id_type(key_id, event_type)
+    assert events
+    assert events[-1].status == 500
+    assert events[-1].message.find('Publish timed out.') > 0
@@ -0,0 +1,56 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In memory TTL cache tests."""
+import time
+
+from ppr_api.utils.cache import TTLCache
+
+
+def test_cache_get_set():
+    """Assert that cached values are returned and hits and misses are counted."""
+    cache = TTLCache(max_size=2, ttl=60)
+    assert cache.get('key1') is None
+    cache.set('key1', 'value1')
+    assert cache.get('key1') == 'value1'
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
+    cache.delete('key1')
+    assert cache.get('key1', 'default') == 'default'
+
+
+def test_cache_lru_eviction():
+    """Assert that the least recently used entry is evicted when the maximum size is reached."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('key1', 'value1')
+    cache.set('key2', 'value2')
+    assert cache.get('key1') == 'value1'
+    cache.set('key3', 'value3')
+    assert len(cache) == 2
+    assert cache.get('key2') is None
+    assert cache.get('key1') == 'value1'
+    assert cache.get('key3') == 'value3'
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_expiry():
+    """Assert that expired entries are not returned."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set('key1', 'value1', ttl=0.01)
+    cache.set('key2', 'value2')
+    time.sleep(0.02)
+    assert cache.get('key1') is None
+    assert cache.get('key2') == 'value2'
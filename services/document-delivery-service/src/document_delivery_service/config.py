@@ -46,6 +46,9 @@ class Config(BaseConfig):
         GOOGLE_STORAGE_SERVICE_ACCOUNT = bytes(GOOGLE_STORAGE_SERVICE_ACCOUNT, 'utf-8')
     STORAGE_BUCKET_NAME = os.getenv('STORAGE_BUCKET_NAME')
     STORAGE_FILEPATH = os.getenv('STORAGE_FILEPATH')
+    # Merged document size in bytes above which it is spooled to disk, and the storage upload chunk size.
+    PDF_SPOOL_MAX_SIZE = int(os.getenv('PDF_SPOOL_MAX_SIZE', str(16 * 1024 * 1024)))
+    STORAGE_UPLOAD_CHUNK_SIZE = int(os.getenv('STORAGE_UPLOAD_CHUNK_SIZE', str(8 * 1024 * 1024)))
 
     # SFTP Config
     SFTP_STORAGE_DIRECTORY = os.getenv('SFTP_STORAGE_DIRECTORY', 'sftp/test')
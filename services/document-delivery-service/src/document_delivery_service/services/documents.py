@@ -17,12 +17,12 @@ from __future__ import annotations
 import datetime
 import json
 from http import HTTPStatus
-from io import BytesIO
+from tempfile import SpooledTemporaryFile, TemporaryFile
 from typing import Final, List, Tuple
 
 import pytz
 import requests
-from PyPDF2 import PdfFileMerger
+from PyPDF2 import PdfFileReader, PdfFileWriter
 
 from document_delivery_service.config import BaseConfig
 from document_delivery_service.services.iam import JWTService
@@ -39,6 +39,7 @@ DOCUMENT_DATA_KEYS = {
     'cover_letter': 'coverLetterData',
     'verification': 'verificationData',
 }
+PDF_SPOOL_MAX_SIZE: Final = 16 * 1024 * 1024
 
 
 def deliver_verification_document(data: dict,
@@ -67,17 +68,36 @@ def deliver_verification_document(data: dict,
        or not (document_data.get('coverLetterData') and document_data.get('verificationData')):
         return status
 
-    # get document pdf
-    cover_letter, status = _get_document_pdf(document_data, DOCUMENT_DATA_KEYS['cover_letter'], token, config)
-    if status not in (HTTPStatus.OK, HTTPStatus.CREATED):
-        return status
-    verification_document, status = _get_document_pdf(document_data, DOCUMENT_DATA_KEYS['verification'], token, config)
-    if status not in (HTTPStatus.OK, HTTPStatus.CREATED):
-        return status
+    # get document pdfs
+    pdf_list = []
+    for data_key in (DOCUMENT_DATA_KEYS['cover_letter'], DOCUMENT_DATA_KEYS['verification']):
+        document_pdf, status = _get_document_pdf(document_data, data_key, token, config)
+        if status not in (HTTPStatus.OK, HTTPStatus.CREATED):
+            return status
+        pdf_list.append(document_pdf)
 
     # merge pdfs
-    document_pdf = _append_pdfs([cover_letter, verification_document])
+    with _append_pdfs(pdf_list, getattr(config, 'PDF_SPOOL_MAX_SIZE', PDF_SPOOL_MAX_SIZE)) as document_pdf:
+        _save_document(data, config, sftp_service, storage_service, document_pdf)
+
+    return HTTPStatus.CREATED
+
 
+def _save_document(data: dict,
+                   config: BaseConfig,
+                   sftp_service: SftpConnection,
+                   storage_service: AbstractStorageService,
+                   document_pdf
+                   ) -> None:
+    """Save the merged document pdf file to storage and upload it to sftp.
+
+    Args:
+        data: The delivery request data.
+        config: The application config data.
+        sftp_service: The SFTP connection.
+        storage_service: The storage service.
+        document_pdf: The merged pdf file object.
+    """
     # create a filename
     file_name = get_filename(registration_id=data['registrationId'], party_id=data['partyId'])
 
@@ -97,8 +117,6 @@ def deliver_verification_document(data: dict,
     sftp_service.put_buffer(document_pdf, remote_path)
     sftp_service.close()
 
-    return HTTPStatus.CREATED
-
 
 def get_filename(registration_id, party_id) -> str:
     """Build a correctly formatted unique name."""
@@ -176,22 +194,36 @@ def _get_document_pdf(data: dict, data_key: str, token: str, config: BaseConfig)
     return None, HTTPStatus.BAD_REQUEST
 
 
-def _append_pdfs(pdf_list: List[bytes]) -> bytes:
+def _append_pdfs(pdf_list: List[bytes], max_memory: int = PDF_SPOOL_MAX_SIZE) -> SpooledTemporaryFile:
     """Append pdfs.
 
+    Each pdf is removed from the list as it is written to a temporary file, and the merged pdf is held in memory up to
+    max_memory bytes before it is written to disk.
+
     Args:
         pdf_list: The list of pdfs to append.
+        max_memory: The merged pdf size in bytes above which it is spooled to disk.
 
     Returns:
-        The merged pdf.
+        The merged pdf file, positioned at the start.
     """
-    merger = PdfFileMerger()
-
-    for pdf in pdf_list:
-        merger.append(BytesIO(pdf))
-
-    out_final = BytesIO()
-
-    merger.write(out_final)
-
-    return out_final.getvalue()
+    writer = PdfFileWriter()
+    pdf_files = []
+    try:
+        while pdf_list:
+            pdf_file = TemporaryFile()  # pylint: disable=consider-using-with
+            pdf_files.append(pdf_file)
+            pdf_file.write(pdf_list.pop(0))
+            reader = PdfFileReader(pdf_file)
+            for page_num in range(reader.getNumPages()):
+                writer.addPage(reader.getPage(page_num))
+
+        # The writer copies the page objects from the pdf files when the merged pdf is written.
+        out_final = SpooledTemporaryFile(max_size=max_memory)  # pylint: disable=consider-using-with
+        writer.write(out_final)
+    finally:
+        for pdf_file in pdf_files:
+            pdf_file.close()
+
+    out_final.seek(0)
+    return out_final
@@ -15,12 +15,15 @@
 from __future__ import annotations
 
 import io
-from typing import Callable
+import shutil
+from typing import IO, Callable, Union
 
 import paramiko
 
 from document_delivery_service.common.enum import BaseEnum, auto
 
+PUT_CHUNK_SIZE = 1024 * 1024
+
 
 class PublicKeyAlgorithms(BaseEnum):
     """Cipher types."""
@@ -118,15 +121,19 @@ class SftpConnection:
                     file.write(buffer)
                     file.close()
 
-    def put_buffer(self, buffer: bytes, remote_path: str, **kwargs) -> None:
-        """Upload a buffer of bytes to the SFTP server.
+    def put_buffer(self, buffer: Union[bytes, IO], remote_path: str, **kwargs) -> None:
+        """Upload a buffer of bytes or a file object to the SFTP server.
 
         Args:
-            buffer (bytes): The buffer of the file to upload.
+            buffer (bytes | IO): The buffer of the file to upload, or a file object copied from the start in chunks.
             remote_path (str): The remote path of the file to upload.
             **kwargs: Additional keyword arguments.
         """
         if self.sftp_handler:
             file = self.sftp_handler.open(remote_path, 'wb')
-            file.write(buffer)
+            if hasattr(buffer, 'read'):
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, file, PUT_CHUNK_SIZE)
+            else:
+                file.write(buffer)
             file.close()
@@ -14,7 +14,8 @@
 """This is the concrete implementation of the StorageService, using Google Cloud Storage."""
 import base64
 import json
-from typing import Callable, Optional, Union
+import shutil
+from typing import IO, Callable, Optional, Union
 
 from google.cloud import storage
 
@@ -36,6 +37,7 @@ class GoogleCloudStorage(AbstractStorageService):
         super().__init__()
         self.config = config
         self.client = None
+        self.upload_chunk_size = getattr(config, 'STORAGE_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
 
     def connect(self) -> Callable:
         """Connect to the storage service."""
@@ -62,21 +64,28 @@ class GoogleCloudStorage(AbstractStorageService):
     def save_document(self,
                       bucket_name: str,
                       filename: str,
-                      raw_data: Union[bytes, str],
+                      raw_data: Union[bytes, str, IO],
                       doc_type: str = StorageDocumentTypes.BINARY.value) -> None:
-        """Save or replace the named document in storage with the binary data as the file contents."""
+        """Save or replace the named document in storage with the binary data as the file contents.
+
+        A file object is copied from the start as a resumable upload, one chunk at a time.
+        """
         try:
             gcs = self.connect()
             bucket = gcs.bucket(bucket_name)
             blob = bucket.blob(filename)
             if doc_type == StorageDocumentTypes.BINARY:
-                gcs_file = blob.open(mode='wb')
+                gcs_file = blob.open(mode='wb', chunk_size=self.upload_chunk_size)
             elif doc_type == StorageDocumentTypes.TEXT:
-                gcs_file = blob.open(mode='w')
+                gcs_file = blob.open(mode='w', chunk_size=self.upload_chunk_size)
             else:
                 raise StorageServiceError('Unsupported document type: {}'.format(doc_type))
 
-            gcs_file.write(raw_data)
+            if hasattr(raw_data, 'read'):
+                raw_data.seek(0)
+                shutil.copyfileobj(raw_data, gcs_file, self.upload_chunk_size)
+            else:
+                gcs_file.write(raw_data)
             gcs_file.close()
         except Exception as err:  # noqa: B902
             logging.error('GoogleCloudStorage.save_document() failed: {}'.format(err))